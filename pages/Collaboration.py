@@ -1,13 +1,16 @@
 import streamlit as st
-import os
-import json
 from datetime import datetime, timedelta
+from functools import partial
+from utils.attachments import format_size
+from utils.changes import chat_topic, watch_changes
+from utils.data import (load_data, append_data, employee_directory, send_chat_message, get_chat_messages,
+                        store_attachment, release_attachment, read_attachment, attachment_rendition,
+                        attachment_preview_failed)
+from utils.thumbnails import is_image
 
 # --- Setup ---
-CHAT_FILE = "data/chat.json"
-MEETINGS_FILE = "data/scheduled_meetings.json"
-UPLOAD_DIR = "uploads"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+CHAT_HISTORY = 20
+MEETINGS_FILE = "scheduled_meetings.json"
 
 # --- Mock Login State ---
 employee = st.session_state.get("employee", {
@@ -18,77 +21,82 @@ employee = st.session_state.get("employee", {
 user_name = employee["name"]
 user_dept = employee["department"]
 
-# --- Helpers ---
-def load_json(file):
-    if os.path.exists(file):
-        with open(file, "r") as f:
-            try:
-                return json.load(f)
-            except json.JSONDecodeError:
-                return []
-    return []
-
-def save_json(data, file):
-    with open(file, "w") as f:
-        json.dump(data, f, indent=2)
-
-chat_data = load_json(CHAT_FILE)
-meetings = load_json(MEETINGS_FILE)
-
 # --- UI Setup ---
 st.set_page_config(page_title="Collaboration", layout="wide")
 st.title("🤝 Unified Collaboration Space")
 st.caption(f"Welcome **{user_name}** from `{user_dept}`")
 
+# Rerun when someone posts in this department's chat or schedules a meeting
+watch_changes("collaboration", [chat_topic(user_dept), MEETINGS_FILE])
+
 tab1, tab2, tab3 = st.tabs(["💬 Chat", "📅 Schedule", "⏳ Meetings"])
 
+# Each panel is a fragment that loads its own data, so typing in the chat,
+# moving a schedule slider or opening a meeting reruns only that panel
+
 # ------------------------ CHAT TAB ------------------------
-with tab1:
+@st.fragment
+def chat_panel():
     st.subheader("💬 Department Chat")
     msg = st.text_input("Message")
     file = st.file_uploader("Attach File", type=["pdf", "jpg", "png", "mp4", "zip", "docx"])
 
-    if st.button("Send Message", use_container_width=True):
-        file_path = None
+    if st.button("Send Message", use_container_width=True) and msg.strip():
+        attachment = None
         if file:
-            file_path = os.path.join(UPLOAD_DIR, file.name)
-            with open(file_path, "wb") as f:
-                f.write(file.read())
-        if msg.strip():
-            chat_data.append({
-                "room": user_dept,
-                "sender": user_name,
-                "message": msg,
-                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M"),
-                "file": file_path,
-                "replies": []
-            })
-            save_json(chat_data, CHAT_FILE)
+            # Streamed to disk in chunks; a file already shared anywhere is stored only once
+            file.seek(0)
+            attachment = store_attachment(file, file.name, file.type, room=user_dept)
+
+        if file and attachment is None:
+            st.error("Could not save the attachment. Please try again.")
+        elif send_chat_message(user_dept, user_name, msg, attachment):
             st.success("Message sent!")
-            st.experimental_rerun()
+        else:
+            if attachment:
+                release_attachment(attachment["sha256"])
+            st.error("Could not send the message. Please try again.")
 
+    # Read after a send so the new message is already in the list; only this room's tail is read
     st.markdown("---")
-    for i, entry in enumerate(reversed(chat_data[-20:])):
-        if entry["room"] != user_dept:
-            continue
+    for entry in reversed(get_chat_messages(user_dept, CHAT_HISTORY)):
         with st.container():
             st.markdown(f"**{entry['sender']}** _({entry['timestamp']})_")
             st.markdown(entry['message'])
-            if entry.get("file"):
+            attachment = entry.get("attachment")
+            if attachment and is_image(attachment):
+                # Only the downscaled renditions are sent to the browser, never the original
+                larger = st.toggle("Larger preview", key=f"chat_preview_{entry['seq']}")
+                # Never waits: the room's change watcher reruns the page once the image is rendered
+                rendition = attachment_rendition(attachment, "preview" if larger else "thumb", room=user_dept)
+                if rendition:
+                    st.image(rendition, caption=attachment["name"])
+                elif attachment_preview_failed(attachment):
+                    st.caption(f"🖼️ No preview available for {attachment['name']}")
+                else:
+                    st.caption(f"🖼️ Preparing preview of {attachment['name']}…")
+            if attachment:
+                # Read from the store only once the user asks for this file
+                label = f"📎 {attachment['name']} ({format_size(attachment['size'])})"
+                ready = f"chat_attachment_ready_{entry['seq']}"
+                if st.session_state.get(ready):
+                    st.download_button(label, data=read_attachment(attachment["sha256"]),
+                                       file_name=attachment["name"], mime=attachment.get("content_type"),
+                                       key=f"chat_attachment_{entry['seq']}")
+                else:
+                    st.button(label, key=f"chat_attachment_load_{entry['seq']}",
+                              on_click=partial(st.session_state.__setitem__, ready, True))
+            elif entry.get("file"):
+                # Messages sent before the attachment store linked a raw upload path
                 st.markdown(f"[📎 File]({entry['file']})")
-            for r in entry["replies"]:
+            for r in entry.get("replies", []):
                 st.markdown(f"↪️ {r['sender']} replied: {r['message']}")
 
 # ------------------------ SCHEDULE TAB ------------------------
-with tab2:
+@st.fragment
+def schedule_panel():
     st.subheader("📅 Schedule a New Meeting")
-    try:
-        with open("data/employees.json", "r") as f:
-            employees = json.load(f)
-    except:
-        employees = []
-
-    names = [e["name"] for e in employees if e["name"] != user_name]
+    names = [name for name in employee_directory().names() if name != user_name]
     participants = st.multiselect("👥 Select Participants", names)
     title = st.text_input("Meeting Title")
     description = st.text_area("Description")
@@ -108,12 +116,16 @@ with tab2:
                 "participants": participants,
                 "time": full_datetime.strftime("%Y-%m-%d %H:%M")
             }
-            meetings.append(new_meeting)
-            save_json(meetings, MEETINGS_FILE)
-            st.success("✅ Meeting Scheduled!")
+            if append_data(MEETINGS_FILE, new_meeting):
+                st.success("✅ Meeting Scheduled!")
+            else:
+                st.error("Could not schedule the meeting. Please try again.")
 
 # ------------------------ MEETINGS TAB ------------------------
-with tab3:
+@st.fragment
+def meetings_panel():
+    meetings = load_data(MEETINGS_FILE)
+
     st.subheader("⏳ Upcoming Meetings")
     if not meetings:
         st.info("No upcoming meetings.")
@@ -123,3 +135,12 @@ with tab3:
                 st.markdown(f"👤 Organizer: **{m['organizer']}**")
                 st.markdown(f"👥 Participants: {', '.join(m['participants'])}")
                 st.markdown(f"📝 {m['description']}")
+
+with tab1:
+    chat_panel()
+
+with tab2:
+    schedule_panel()
+
+with tab3:
+    meetings_panel()
@@ -1,17 +1,31 @@
 # pages/Dashboard.py - Perfect version with fixed layout and Plotly
 import streamlit as st
-import pandas as pd
+import importlib.util
 import json
-import os
 from datetime import datetime
-
-# Plotly import - suppress warnings
-try:
+from utils.auth import ADMIN_ROLES
+from utils.data import employee_directory
+from utils.cache import file_cache
+from utils.changes import watch_changes
+from utils.figure_cache import figure_cache
+from utils.metrics import metrics
+from utils.render_profile import request_capture
+
+# pandas and plotly are imported only where a chart or table is drawn;
+# this checks plotly is installed without importing it
+PLOTLY_AVAILABLE = importlib.util.find_spec("plotly") is not None
+
+
+def plotly_express():
+    """Import plotly.express once pandas is fully loaded.
+
+    plotly looks pandas up in sys.modules, where another session's import
+    still in progress shows up half initialized; importing pandas first
+    waits for that import to finish.
+    """
+    import pandas  # noqa: F401
     import plotly.express as px
-    import plotly.graph_objects as go
-    PLOTLY_AVAILABLE = True
-except ImportError:
-    PLOTLY_AVAILABLE = False
+    return px
 
 # Session state check
 try:
@@ -25,61 +39,7 @@ except KeyError:
     st.info("👈 Click 'Home Feed' in the sidebar to return to login.")
     st.stop()
 
-# Enhanced page styling
-st.markdown("""
-<style>
-.dashboard-header {
-    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-    color: white;
-    padding: 2rem;
-    border-radius: 15px;
-    text-align: center;
-    margin-bottom: 2rem;
-    box-shadow: 0 8px 32px rgba(0, 0, 0, 0.1);
-}
-
-.metric-card {
-    background: linear-gradient(135deg, rgba(255,255,255,0.95) 0%, rgba(255,255,255,0.85) 100%);
-    padding: 1.5rem;
-    border-radius: 15px;
-    box-shadow: 0 8px 32px rgba(0, 0, 0, 0.1);
-    border: 1px solid rgba(255, 255, 255, 0.3);
-    margin: 0.5rem;
-    text-align: center;
-    transition: all 0.3s ease;
-}
-
-.metric-card:hover {
-    transform: translateY(-5px);
-    box-shadow: 0 12px 40px rgba(0, 0, 0, 0.15);
-}
-
-.chart-container {
-    background: rgba(255, 255, 255, 0.95);
-    backdrop-filter: blur(10px);
-    border-radius: 15px;
-    padding: 1.5rem;
-    margin: 1rem 0;
-    border: 1px solid rgba(255, 255, 255, 0.3);
-    box-shadow: 0 4px 20px rgba(0, 0, 0, 0.1);
-}
-
-.progress-bar {
-    width: 100%;
-    height: 20px;
-    background-color: #e9ecef;
-    border-radius: 10px;
-    overflow: hidden;
-    margin: 0.5rem 0;
-}
-
-.progress-fill {
-    height: 100%;
-    background: linear-gradient(90deg, #667eea, #764ba2);
-    transition: width 0.3s ease;
-}
-</style>
-""", unsafe_allow_html=True)
+# Page styling comes with the theme bundle (static/css/dashboard.css)
 
 # Dashboard Header
 st.markdown(f"""
@@ -91,7 +51,7 @@ st.markdown(f"""
 """, unsafe_allow_html=True)
 
 # Admin Role Verification
-admin_roles = ["Admin", "Executive", "Chairman", "CEO", "President", "Vice President", "Group President"]
+admin_roles = ADMIN_ROLES
 
 if user_role not in admin_roles:
     st.error("🚫 Access Denied - Administrative Privileges Required")
@@ -99,52 +59,27 @@ if user_role not in admin_roles:
     st.info("Required roles: " + " • ".join(admin_roles))
     st.stop()
 
-# ---------- DATA LOADING ----------
-@st.cache_data(ttl=300)
-def load_dashboard_data():
-    """Load all dashboard data with caching"""
-    data = {}
-    
-    files = {
-        "tasks": "tasks.json",
-        "feedback": "feedback.json", 
-        "posts": "posts.json",
-        "meetings": "scheduled_meetings.json",
-        "employees": "employees.json"
-    }
-    
-    for key, filename in files.items():
-        try:
-            if os.path.exists(filename):
-                with open(filename, "r", encoding="utf-8") as f:
-                    data[key] = json.load(f)
-            else:
-                data[key] = []
-        except Exception:
-            data[key] = []
-    
-    return data
+# Imported past the role check: building the analytics loads numpy and pandas
+from utils.dashboard_analytics import ANALYTICS_FILES, dashboard_analytics
 
-# Load all data
-dashboard_data = load_dashboard_data()
+# Rerun when the data behind the KPIs and charts changes
+watch_changes("dashboard", ANALYTICS_FILES)
 
-tasks = dashboard_data["tasks"]
-feedback = dashboard_data["feedback"]
-posts = dashboard_data["posts"]
-meetings = dashboard_data["meetings"]
-employees = dashboard_data["employees"]
+# ---------- DATA LOADING ----------
+# Every KPI, breakdown and "latest" list comes from dashboard_analytics(), which is
+# built in vectorized passes and reused until tasks, posts or feedback change
 
 # ---------- KEY PERFORMANCE INDICATORS ----------
 st.subheader("📈 Key Performance Indicators")
 
-# Calculate metrics
-total_tasks = len(tasks)
-completed_tasks = len([t for t in tasks if t.get("status") == "Completed"])
-pending_tasks = len([t for t in tasks if t.get("status") == "Pending"])
-completion_rate = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
-total_posts = len(posts)
-unread_feedback = len([f for f in feedback if f.get("status") == "unread"])
-active_employees = len(set([t.get("assigned_to") for t in tasks if t.get("assigned_to")]))
+analytics = dashboard_analytics()
+kpis = analytics.kpis
+total_tasks = kpis["total_tasks"]
+pending_tasks = kpis["pending_tasks"]
+completion_rate = kpis["completion_rate"]
+total_posts = kpis["total_posts"]
+unread_feedback = kpis["unread_feedback"]
+active_employees = kpis["active_employees"]
 
 # Enhanced metrics display
 col1, col2, col3, col4, col5 = st.columns(5)
@@ -172,7 +107,7 @@ with col3:
     st.markdown(f"""
     <div class="metric-card">
         <h3 style="color: #ff4757; margin: 0;">🔔 Feedback</h3>
-        <h2 style="color: #2c3e50; margin: 0.5rem 0;">{len(feedback)}</h2>
+        <h2 style="color: #2c3e50; margin: 0.5rem 0;">{len(analytics.feedback)}</h2>
         <p style="color: #6c757d; margin: 0;">Unread: {unread_feedback}</p>
     </div>
     """, unsafe_allow_html=True)
@@ -203,29 +138,37 @@ st.subheader("📊 Analytics Dashboard")
 # Create tabs for different analytics views
 tab1, tab2, tab3, tab4 = st.tabs(["📈 Task Analytics", "🏢 Department Insights", "📬 Feedback Analysis", "📱 Activity Monitor"])
 
-with tab1:
+@st.fragment
+def task_analytics_tab():
+    """Task status and department charts"""
+    analytics = dashboard_analytics()
+    total_tasks = len(analytics.tasks)
+    
     st.markdown("### 📈 Task Performance Analytics")
     
-    if tasks:
+    if analytics.tasks:
         col1, col2 = st.columns(2)
         
         with col1:
             # Task Status Analysis
-            status_counts = {}
-            for task in tasks:
-                status = task.get("status", "Unknown")
-                status_counts[status] = status_counts.get(status, 0) + 1
+            status_counts = analytics.task_status_counts
             
             if PLOTLY_AVAILABLE and status_counts:
-                fig_pie = px.pie(
-                    values=list(status_counts.values()),
-                    names=list(status_counts.keys()),
-                    title="📊 Task Status Distribution",
-                    color_discrete_sequence=px.colors.qualitative.Set3,
-                    hole=0.4
-                )
-                fig_pie.update_traces(textposition='inside', textinfo='percent+label')
-                fig_pie.update_layout(height=400, font_size=14, title_font_size=18)
+                def build_fig_pie():
+                    px = plotly_express()
+                    fig_pie = px.pie(
+                        values=list(status_counts.values()),
+                        names=list(status_counts.keys()),
+                        title="📊 Task Status Distribution",
+                        color_discrete_sequence=px.colors.qualitative.Set3,
+                        hole=0.4
+                    )
+                    fig_pie.update_traces(textposition='inside', textinfo='percent+label')
+                    fig_pie.update_layout(height=400, font_size=14, title_font_size=18)
+                    return fig_pie
+
+                # Charts are keyed by the data version they were drawn from, plus their height
+                fig_pie = figure_cache.get(("task_status_pie", analytics.version, 400), build_fig_pie)
                 st.plotly_chart(fig_pie, use_container_width=True)
             else:
                 # HTML fallback
@@ -260,20 +203,22 @@ with tab1:
         
         with col2:
             # Department Distribution
-            dept_counts = {}
-            for task in tasks:
-                dept = task.get("department", "Unknown")
-                dept_counts[dept] = dept_counts.get(dept, 0) + 1
+            dept_counts = analytics.tasks_by_department
             
             if PLOTLY_AVAILABLE and dept_counts:
-                fig_bar = px.bar(
-                    x=list(dept_counts.keys()),
-                    y=list(dept_counts.values()),
-                    title="🏢 Tasks by Department",
-                    color=list(dept_counts.values()),
-                    color_continuous_scale="Blues"
-                )
-                fig_bar.update_layout(height=400, xaxis_title="Department", yaxis_title="Number of Tasks")
+                def build_fig_bar():
+                    px = plotly_express()
+                    fig_bar = px.bar(
+                        x=list(dept_counts.keys()),
+                        y=list(dept_counts.values()),
+                        title="🏢 Tasks by Department",
+                        color=list(dept_counts.values()),
+                        color_continuous_scale="Blues"
+                    )
+                    fig_bar.update_layout(height=400, xaxis_title="Department", yaxis_title="Number of Tasks")
+                    return fig_bar
+
+                fig_bar = figure_cache.get(("tasks_by_department_bar", analytics.version, 400), build_fig_bar)
                 st.plotly_chart(fig_bar, use_container_width=True)
             else:
                 # HTML fallback
@@ -284,80 +229,87 @@ with tab1:
     else:
         st.info("📝 No tasks available for analysis")
 
-with tab2:
+@st.fragment
+def department_insights_tab():
+    """Department performance chart and efficiency table"""
+    analytics = dashboard_analytics()
+    
     st.markdown("### 🏢 Department Performance Insights")
     
-    if tasks:
-        dept_stats = {}
-        for task in tasks:
-            dept = task.get("department", "Unknown")
-            if dept not in dept_stats:
-                dept_stats[dept] = {"total": 0, "completed": 0, "pending": 0}
-            
-            dept_stats[dept]["total"] += 1
-            if task.get("status") == "Completed":
-                dept_stats[dept]["completed"] += 1
-            elif task.get("status") == "Pending":
-                dept_stats[dept]["pending"] += 1
+    if analytics.tasks:
+        dept_stats = analytics.department_stats
         
         if PLOTLY_AVAILABLE:
             # Department performance chart
-            dept_names = list(dept_stats.keys())
-            completed_tasks_by_dept = [dept_stats[dept]["completed"] for dept in dept_names]
-            pending_tasks_by_dept = [dept_stats[dept]["pending"] for dept in dept_names]
-            
-            fig_dept = go.Figure()
-            fig_dept.add_trace(go.Bar(name='Completed', x=dept_names, y=completed_tasks_by_dept, marker_color='#2ed573'))
-            fig_dept.add_trace(go.Bar(name='Pending', x=dept_names, y=pending_tasks_by_dept, marker_color='#ffa502'))
+            dept_names = [stats["department"] for stats in dept_stats]
+            completed_tasks_by_dept = [stats["completed"] for stats in dept_stats]
+            pending_tasks_by_dept = [stats["pending"] for stats in dept_stats]
             
-            fig_dept.update_layout(
-                title='📊 Department Task Performance',
-                xaxis_title='Department',
-                yaxis_title='Number of Tasks',
-                barmode='stack',
-                height=400
-            )
+            def build_fig_dept():
+                import plotly.graph_objects as go
+                fig_dept = go.Figure()
+                fig_dept.add_trace(go.Bar(name='Completed', x=dept_names, y=completed_tasks_by_dept, marker_color='#2ed573'))
+                fig_dept.add_trace(go.Bar(name='Pending', x=dept_names, y=pending_tasks_by_dept, marker_color='#ffa502'))
+                
+                fig_dept.update_layout(
+                    title='📊 Department Task Performance',
+                    xaxis_title='Department',
+                    yaxis_title='Number of Tasks',
+                    barmode='stack',
+                    height=400
+                )
+                return fig_dept
+
+            fig_dept = figure_cache.get(("department_performance_bar", analytics.version, 400), build_fig_dept)
             st.plotly_chart(fig_dept, use_container_width=True)
         
         # Department efficiency table
         st.markdown("### 📈 Department Efficiency Metrics")
         efficiency_data = []
-        for dept, stats in dept_stats.items():
+        for stats in dept_stats:
             efficiency = (stats["completed"] / stats["total"] * 100) if stats["total"] > 0 else 0
             efficiency_data.append({
-                "Department": dept,
+                "Department": stats["department"],
                 "Total Tasks": stats["total"],
                 "Completed": stats["completed"],
                 "Pending": stats["pending"],
                 "Efficiency %": f"{efficiency:.1f}%"
             })
         
+        import pandas as pd
         efficiency_df = pd.DataFrame(efficiency_data)
         st.dataframe(efficiency_df, use_container_width=True, hide_index=True)
     else:
         st.info("📊 No department data available")
 
-with tab3:
+@st.fragment
+def feedback_analysis_tab():
+    """Feedback by route and by status"""
+    analytics = dashboard_analytics()
+    feedback = analytics.feedback
+    
     st.markdown("### 📬 Feedback Analysis Center")
     
     if feedback:
         col1, col2 = st.columns(2)
         
         with col1:
-            feedback_routes = {}
-            for fb in feedback:
-                route = fb.get("route_to", "Unknown")
-                feedback_routes[route] = feedback_routes.get(route, 0) + 1
+            feedback_routes = analytics.feedback_by_route
             
             if PLOTLY_AVAILABLE and feedback_routes:
-                fig_feedback = px.bar(
-                    x=list(feedback_routes.keys()),
-                    y=list(feedback_routes.values()),
-                    title="📥 Feedback Distribution by Route",
-                    color=list(feedback_routes.values()),
-                    color_continuous_scale="Reds"
-                )
-                fig_feedback.update_layout(height=400)
+                def build_fig_feedback():
+                    px = plotly_express()
+                    fig_feedback = px.bar(
+                        x=list(feedback_routes.keys()),
+                        y=list(feedback_routes.values()),
+                        title="📥 Feedback Distribution by Route",
+                        color=list(feedback_routes.values()),
+                        color_continuous_scale="Reds"
+                    )
+                    fig_feedback.update_layout(height=400)
+                    return fig_feedback
+
+                fig_feedback = figure_cache.get(("feedback_by_route_bar", analytics.version, 400), build_fig_feedback)
                 st.plotly_chart(fig_feedback, use_container_width=True)
             else:
                 st.markdown("**📥 Feedback Distribution**")
@@ -367,19 +319,21 @@ with tab3:
         
         with col2:
             # Feedback status analysis
-            status_counts = {}
-            for fb in feedback:
-                status = fb.get("status", "unread")
-                status_counts[status] = status_counts.get(status, 0) + 1
+            status_counts = analytics.feedback_by_status
             
             if PLOTLY_AVAILABLE and status_counts:
-                fig_status = px.pie(
-                    values=list(status_counts.values()),
-                    names=list(status_counts.keys()),
-                    title="📊 Feedback Status Overview",
-                    color_discrete_sequence=px.colors.qualitative.Pastel
-                )
-                fig_status.update_layout(height=400)
+                def build_fig_status():
+                    px = plotly_express()
+                    fig_status = px.pie(
+                        values=list(status_counts.values()),
+                        names=list(status_counts.keys()),
+                        title="📊 Feedback Status Overview",
+                        color_discrete_sequence=px.colors.qualitative.Pastel
+                    )
+                    fig_status.update_layout(height=400)
+                    return fig_status
+
+                fig_status = figure_cache.get(("feedback_status_pie", analytics.version, 400), build_fig_status)
                 st.plotly_chart(fig_status, use_container_width=True)
             else:
                 st.markdown("**📊 Feedback Status**")
@@ -389,14 +343,18 @@ with tab3:
     else:
         st.info("📬 No feedback data available yet")
 
-with tab4:
+@st.fragment
+def activity_monitor_tab():
+    """Latest posts and tasks"""
+    analytics = dashboard_analytics()
+    
     st.markdown("### 📱 Real-time Activity Monitor")
     
     # Combine all activity
     all_activity = []
     
     # Add recent posts
-    for post in sorted(posts, key=lambda x: x.get("timestamp", ""), reverse=True)[:10]:
+    for post in analytics.recent_posts(10):
         all_activity.append({
             "Type": "📝 Post",
             "Title": post.get("title", "Unknown")[:40] + "..." if len(post.get("title", "")) > 40 else post.get("title", "Unknown"),
@@ -406,7 +364,7 @@ with tab4:
         })
     
     # Add recent tasks
-    for task in sorted(tasks, key=lambda x: x.get("created_at", x.get("timestamp", "")), reverse=True)[:10]:
+    for task in analytics.recent_tasks(10):
         all_activity.append({
             "Type": "✅ Task",
             "Title": task.get("title", "Unknown")[:40] + "..." if len(task.get("title", "")) > 40 else task.get("title", "Unknown"),
@@ -419,63 +377,107 @@ with tab4:
     all_activity.sort(key=lambda x: x["Timestamp"], reverse=True)
     
     if all_activity:
+        import pandas as pd
         activity_df = pd.DataFrame(all_activity[:20])  # Show top 20
         st.dataframe(activity_df, use_container_width=True, hide_index=True)
     else:
         st.info("📱 No recent activity to display")
 
-# ---------- ADMIN ACTIONS (MOVED TO BOTTOM) ----------
-st.markdown("---")
-st.subheader("🛠️ Admin Controls")
-
-col1, col2, col3, col4 = st.columns(4)
+# Each tab is a fragment with its own data, so it can rerun without the others
+with tab1:
+    task_analytics_tab()
 
-with col1:
-    if st.button("🔄 Refresh Data", use_container_width=True):
-        st.cache_data.clear()
-        st.rerun()
+with tab2:
+    department_insights_tab()
 
-with col2:
-    if st.button("📊 Export Analytics", use_container_width=True):
-        export_data = {
-            "summary": {
-                "total_tasks": total_tasks,
-                "completion_rate": completion_rate,
-                "total_posts": total_posts,
-                "total_feedback": len(feedback),
-                "active_employees": active_employees
-            },
-            "generated_by": user_name,
-            "generated_at": datetime.now().isoformat()
-        }
-        
-        st.download_button(
-            label="📥 Download Analytics Report",
-            data=json.dumps(export_data, indent=2),
-            file_name=f"admin_analytics_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
-            mime="application/json"
-        )
+with tab3:
+    feedback_analysis_tab()
 
-with col3:
-    if st.button("🧹 Clear Cache", use_container_width=True):
-        st.cache_data.clear()
-        st.success("✅ Cache cleared successfully!")
+with tab4:
+    activity_monitor_tab()
 
-with col4:
-    if st.button("🔧 System Info", use_container_width=True):
-        with st.expander("🛠️ System Information"):
-            st.json({
-                "current_admin": user_name,
-                "admin_role": user_role,
-                "charts_engine": "Plotly" if PLOTLY_AVAILABLE else "HTML",
-                "data_files": {
-                    "tasks": len(tasks),
-                    "posts": len(posts),
-                    "feedback": len(feedback),
-                    "employees": len(employees)
+# ---------- ADMIN ACTIONS (MOVED TO BOTTOM) ----------
+@st.fragment
+def admin_controls():
+    """Admin buttons; a click reruns only this panel (Refresh Data reruns the page)"""
+    # Its own data, so a click here does not depend on (or redo) the rest of the page
+    analytics = dashboard_analytics()
+    tasks, posts, feedback = analytics.tasks, analytics.posts, analytics.feedback
+    employees = employee_directory()
+    kpis = analytics.kpis
+    
+    st.markdown("---")
+    st.subheader("🛠️ Admin Controls")
+
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        if st.button("🔄 Refresh Data", use_container_width=True):
+            # Cached data is keyed by collection version, so a rerun is all a refresh needs
+            st.rerun()
+
+    with col2:
+        if st.button("📊 Export Analytics", use_container_width=True):
+            export_data = {
+                "summary": {
+                    "total_tasks": kpis["total_tasks"],
+                    "completion_rate": kpis["completion_rate"],
+                    "total_posts": kpis["total_posts"],
+                    "total_feedback": len(feedback),
+                    "active_employees": kpis["active_employees"]
                 },
-                "last_refresh": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            })
+                "generated_by": user_name,
+                "generated_at": datetime.now().isoformat()
+            }
+            
+            st.download_button(
+                label="📥 Download Analytics Report",
+                data=json.dumps(export_data, indent=2),
+                file_name=f"admin_analytics_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+                mime="application/json"
+            )
+
+    with col3:
+        if st.button("🧹 Clear Cache", use_container_width=True):
+            file_cache.clear()
+            figure_cache.clear()
+            st.success("✅ Cache cleared successfully!")
+
+    with col4:
+        if st.button("🔧 System Info", use_container_width=True):
+            with st.expander("🛠️ System Information"):
+                st.json({
+                    "current_admin": user_name,
+                    "admin_role": user_role,
+                    "charts_engine": "Plotly" if PLOTLY_AVAILABLE else "HTML",
+                    "data_files": {
+                        "tasks": len(tasks),
+                        "posts": len(posts),
+                        "feedback": len(feedback),
+                        "employees": len(employees)
+                    },
+                    "figure_cache": figure_cache.stats(),
+                    "last_refresh": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                })
+
+                st.markdown("**Data operations**")
+                operations = metrics.summary()
+                if operations:
+                    st.dataframe(operations, use_container_width=True, hide_index=True)
+                else:
+                    st.caption("No data operations recorded yet.")
+                st.code(metrics.prometheus_text(), language="text")
+
+    # page_map comes from app.py, which execs this page
+    with st.expander("🔬 Profile a Page Render"):
+        st.caption("Wraps the next render of a page in cProfile and tracemalloc. "
+                   "Adding ?profile=1 to the URL profiles the page being opened.")
+        target = st.selectbox("Page to profile", list(page_map), key="profile_target")
+        if st.button("Profile Next Render", use_container_width=True):
+            request_capture(target)
+            st.info(f"Open **{target}** from the sidebar; the profile appears below the page.")
+
+admin_controls()
 
 # ---------- FOOTER ----------
 st.markdown("---")
@@ -1,5 +1,7 @@
 import streamlit as st
-from utils.data import load_data, add_post
+from functools import partial
+from utils.data import get_department_page, add_post
+from utils.feed_pager import paged_posts, load_more_button
 
 st.set_page_config(page_title="Engineering Department", layout="wide")
 st.title("🧩 Engineering Department Feed")
@@ -10,8 +12,8 @@ if "logged_in" not in st.session_state or not st.session_state.logged_in:
     st.stop()
 
 # Load department-specific posts
-posts = load_data("posts.json")
-dept_posts = [post for post in reversed(posts) if post["department"] == "Engineering"]
+fetch_posts = partial(get_department_page, "Engineering")
+dept_posts = paged_posts("Engineering_feed", fetch_posts)
 
 # Display existing posts
 if dept_posts:
@@ -20,6 +22,7 @@ if dept_posts:
         with st.expander(f"{post['title']} – by {post['author']}"):
             st.write(post["content"])
             st.caption(f"📅 {post['timestamp'][:10]}")
+    load_more_button("Engineering_feed", fetch_posts)
 else:
     st.info("🚧 No posts yet in Engineering.")
 
@@ -1,5 +1,7 @@
 import streamlit as st
-from utils.data import load_data, save_data, add_post
+from functools import partial
+from utils.data import get_department_page, save_data, add_post
+from utils.feed_pager import paged_posts, load_more_button
 
 st.title("🧩 HR Department Feed")
 
@@ -7,8 +9,8 @@ if "logged_in" not in st.session_state or not st.session_state.logged_in:
     st.error("Please log in to view the HR feed.")
     st.stop()
 
-posts = load_data("posts.json")
-dept_posts = [post for post in reversed(posts) if post["department"] == "HR"]
+fetch_posts = partial(get_department_page, "HR")
+dept_posts = paged_posts("HR_feed", fetch_posts)
 
 if dept_posts:
     st.subheader("HR Updates")
@@ -18,6 +20,7 @@ if dept_posts:
             if "timestamp" in post:
                 st.caption("Posted on " + post["timestamp"][:10])
             st.caption("Posted by " + post["author"])
+    load_more_button("HR_feed", fetch_posts)
 else:
     st.info("No posts in HR yet. Share your updates!")
 
@@ -1,6 +1,7 @@
 import streamlit as st
 import sys
 import os
+from functools import partial
 
 # Add project root to path
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -8,20 +9,9 @@ sys.path.insert(0, project_root)
 
 # Import with error handling
 try:
-    from utils.data import load_data, save_data, add_post, is_c_suite
-    
-    def get_posts_for_user(user_department, user_role, user_name):
-        posts = load_data("posts.json")
-        visible_posts = []
-        for post in posts:
-            if post.get("is_vip", False):
-                if (is_c_suite(user_role) or user_name in post.get("vip_recipients", []) or post["author"] == user_name):
-                    visible_posts.append(post)
-            elif post["department"] == "All":
-                visible_posts.append(post)
-            elif post["department"] == user_department:
-                visible_posts.append(post)
-        return visible_posts
+    from utils.data import load_data, save_data, add_post, is_c_suite, get_feed_page
+    from utils.feed_pager import paged_posts, load_more_button
+    from utils.changes import watch_changes
         
 except ImportError as e:
     st.error(f"Import error: {e}")
@@ -38,16 +28,16 @@ user_dept = st.session_state["employee"]["department"]
 user_role = st.session_state["employee"]["role"]
 user_name = st.session_state["employee"]["name"]
 
-# Display posts that user can see
-visible_posts = get_posts_for_user(user_dept, user_role, user_name)
+# Rerun when a post is added, so the feed picks it up without a manual refresh
+watch_changes("home", ["posts.json"])
+
+# Display posts that user can see, a page at a time (VIP posts are shown separately)
+fetch_feed = partial(get_feed_page, user_dept, user_role, user_name, vip=False)
+visible_posts = paged_posts("home_feed", fetch_feed)
 
 if visible_posts:
     st.subheader("Recent Updates")
-    for post in reversed(visible_posts):
-        # Skip VIP posts in main feed (they'll be shown separately)
-        if post.get("is_vip", False):
-            continue
-            
+    for post in visible_posts:
         # Handle both old and new post formats
         display_author = post.get("display_author", post["author"])
         
@@ -67,6 +57,7 @@ if visible_posts:
             
             if not post.get("is_anonymous", False):
                 st.caption("Posted by " + post["author"])
+    load_more_button("home_feed", fetch_feed)
 else:
     st.info("No posts yet. Be the first to share!")
 
@@ -80,7 +71,8 @@ if is_c_suite(user_role):
     else:
         st.subheader("👑 C-Suite Communications")
     
-    vip_posts = [post for post in reversed(visible_posts) if post.get("is_vip", False)]
+    fetch_vip = partial(get_feed_page, user_dept, user_role, user_name, vip=True)
+    vip_posts = paged_posts("home_vip_feed", fetch_vip)
     
     if vip_posts:
         # Separate anonymous and regular C-Suite messages
@@ -120,6 +112,8 @@ if is_c_suite(user_role):
                     if not post.get("is_anonymous", False):
                         st.caption("Posted by " + post["author"])
         
+        load_more_button("home_vip_feed", fetch_vip, "Load more C-Suite messages")
+        
         if not vip_posts:
             st.info("No C-Suite messages yet.")
     else:
@@ -1,5 +1,7 @@
 import streamlit as st
-from utils.data import load_data, add_post
+from functools import partial
+from utils.data import get_department_page, add_post
+from utils.feed_pager import paged_posts, load_more_button
 
 st.title("🧩 Marketing Department Feed")
 
@@ -7,8 +9,8 @@ if "logged_in" not in st.session_state or not st.session_state.logged_in:
     st.error("Please log in to view the Marketing feed.")
     st.stop()
 
-posts = load_data("posts.json")
-dept_posts = [post for post in reversed(posts) if post["department"] == "Marketing"]
+fetch_posts = partial(get_department_page, "Marketing")
+dept_posts = paged_posts("Marketing_feed", fetch_posts)
 
 if dept_posts:
     st.subheader("Marketing Updates")
@@ -16,6 +18,7 @@ if dept_posts:
         with st.expander(post["title"] + " - by " + post["author"]):
             st.write(post["content"])
             st.caption("Posted on " + post["timestamp"][:10])
+    load_more_button("Marketing_feed", fetch_posts)
 else:
     st.info("No posts in Marketing yet.")
 
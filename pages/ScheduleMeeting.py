@@ -1,24 +1,14 @@
 import streamlit as st
-import json
-import os
 from datetime import datetime
+from utils.data import load_data, append_data
 
-MEETINGS_FILE = "data/scheduled_meetings.json"
+MEETINGS_FILE = "scheduled_meetings.json"
 
 def load_meetings():
-    if os.path.exists(MEETINGS_FILE):
-        with open(MEETINGS_FILE, "r") as f:
-            try:
-                return json.load(f)
-            except:
-                return []
-    return []
+    return load_data(MEETINGS_FILE)
 
 def save_meeting(meeting):
-    meetings = load_meetings()
-    meetings.append(meeting)
-    with open(MEETINGS_FILE, "w") as f:
-        json.dump(meetings, f, indent=2)
+    return append_data(MEETINGS_FILE, meeting)
 
 # UI
 st.title("📅 Schedule a Meeting")
@@ -1,36 +1,27 @@
 import streamlit as st
-import json
-import os
 from datetime import date
+from utils.data import load_data, append_data, employee_directory
 
 # File path setup
-TASKS_FILE = "data/tasks.json"
-EMPLOYEES_FILE = "data/employees.json"
+TASKS_FILE = "tasks.json"
 
-# Load employee data
+# Employees by "Name (ID)" label, indexed once per version of the employee file
 def load_employees():
-    if os.path.exists(EMPLOYEES_FILE):
-        with open(EMPLOYEES_FILE, "r") as f:
-            return json.load(f)
-    return []
+    return employee_directory().labels()
 
 # Load tasks
 def load_tasks():
-    if os.path.exists(TASKS_FILE):
-        with open(TASKS_FILE, "r") as f:
-            return json.load(f)
-    return []
+    return load_data(TASKS_FILE)
 
-# Save tasks
-def save_tasks(tasks):
-    with open(TASKS_FILE, "w") as f:
-        json.dump(tasks, f, indent=2)
+# Save a new task
+def save_task(task):
+    return append_data(TASKS_FILE, task)
 
 st.title("✅ Task Execution Board")
 st.markdown("Assign detailed tasks with clear KRAs, deadlines, and outcomes.")
 
 # Load employees and tasks
-employees = load_employees()
+emp_map = load_employees()
 tasks = load_tasks()
 
 # Task creation UI
@@ -40,7 +31,6 @@ with st.expander("➕ Assign a New Task", expanded=True):
     expected_outcomes = st.text_area("Expected Outcomes")
     kras = st.text_area("Key Responsibility Areas (KRAs)")
 
-    emp_map = {f"{emp['name']} ({emp['id']})": emp for emp in employees}
     assignee_display = st.selectbox("Assign to", list(emp_map.keys()))
     deadline = st.date_input("Deadline", date.today())
 
@@ -57,6 +47,7 @@ with st.expander("➕ Assign a New Task", expanded=True):
             "deadline": str(deadline),
             "status": "Pending"
         }
-        tasks.append(task)
-        save_tasks(tasks)
-        st.success("✅ Task assigned.")
+        if save_task(task):
+            st.success("✅ Task assigned.")
+        else:
+            st.error("Could not save the task. Please try again.")
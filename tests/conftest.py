@@ -0,0 +1,33 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+# Settings are read when utils.config is imported: keep the global DataManager
+# away from the repo's data/ and skip the metrics export thread
+os.environ["SUPERAPP_DATA_DIR"] = tempfile.mkdtemp(prefix="superapp-tests-")
+os.environ["SUPERAPP_METRICS_INTERVAL"] = "0"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import config  # noqa: E402
+
+
+def sqlite_has_fts5() -> bool:
+    import sqlite3
+    try:
+        sqlite3.connect(":memory:").execute("CREATE VIRTUAL TABLE t USING fts5(x)")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+@pytest.fixture(params=["jsonl", "json", "sqlite"])
+def manager(request, tmp_path, monkeypatch):
+    """A DataManager over an empty data directory, once per storage engine"""
+    if request.param == "sqlite" and not sqlite_has_fts5():
+        pytest.skip("sqlite3 was built without FTS5")
+    monkeypatch.setattr(config, "DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(config, "STORAGE_ENGINE", request.param)
+    from utils.data import create_data_manager
+    return create_data_manager()
@@ -0,0 +1,34 @@
+import hashlib
+import io
+import os
+
+from utils.attachments import AttachmentStore, format_size
+
+
+def test_identical_uploads_are_stored_once_and_reference_counted(tmp_path):
+    store = AttachmentStore(str(tmp_path), chunk_size=4)
+    payload = b"quarterly report" * 10
+    first = store.store(io.BytesIO(payload), "report.pdf", "application/pdf")
+    second = store.store(io.BytesIO(payload), "copy of report.pdf", "application/pdf")
+
+    sha256 = hashlib.sha256(payload).hexdigest()
+    assert first == {"sha256": sha256, "name": "report.pdf", "size": len(payload),
+                     "content_type": "application/pdf"}
+    assert second["sha256"] == sha256
+    assert store.refs(sha256) == 2
+    assert store.read(sha256) == payload
+
+    assert store.release(sha256)
+    assert os.path.exists(store.object_path(sha256))
+    assert store.release(sha256)
+    assert not os.path.exists(store.object_path(sha256))
+    assert store.refs(sha256) == 0
+    assert not store.release(sha256)
+    # Staging leaves no temporary files
+    assert os.listdir(tmp_path / "tmp") == []
+
+
+def test_format_size():
+    assert format_size(512) == "512 B"
+    assert format_size(2048) == "2.0 KB"
+    assert format_size(5 * 1024 * 1024) == "5.0 MB"
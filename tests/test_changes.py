@@ -0,0 +1,48 @@
+from streamlit.testing.v1 import AppTest
+
+from utils.changes import ChangeBus, chat_topic
+
+
+def test_versions_move_only_for_published_topics(tmp_path):
+    bus = ChangeBus(str(tmp_path))
+    assert bus.versions(["posts.json", "tasks.json"]) == (0, 0)
+
+    bus.publish("posts.json")
+    bus.publish("posts.json", chat_topic("HR"))
+    # Another process's bus over the same file sees the same versions
+    other = ChangeBus(str(tmp_path))
+    assert other.versions(["posts.json", chat_topic("HR"), "tasks.json"]) == (2, 1, 0)
+
+
+def test_unreadable_versions_file_reads_as_unchanged(tmp_path):
+    (tmp_path / "versions.json").write_text("[1, 2", encoding="utf-8")
+    assert ChangeBus(str(tmp_path)).versions(["posts.json"]) == (0,)
+
+
+def test_writes_publish_their_collection_or_room(manager):
+    before = manager.changes.versions(["posts.json", "tasks.json", chat_topic("HR"), chat_topic("Ops")])
+    manager.add_post("Kickoff", "Hello", "Meera", "All")
+    manager.add_task("Plan", "Draft it", "Asha", "Meera", "HR")
+    manager.chat.send("HR", "Meera", "hi")
+
+    after = manager.changes.versions(["posts.json", "tasks.json", chat_topic("HR"), chat_topic("Ops")])
+    assert [b - a for a, b in zip(before, after)] == [1, 1, 1, 0]
+
+
+def test_watch_changes_tracks_the_versions_a_render_showed():
+    def page():
+        import streamlit as st
+        from utils.changes import watch_changes
+
+        watch_changes("test", ["posts.json"], interval=60)
+        st.write("rendered")
+
+    from utils.data import data_manager
+
+    app = AppTest.from_function(page).run()
+    assert not app.exception
+    (seen,) = app.session_state["_changes_test"]
+
+    data_manager.changes.publish("posts.json")
+    app.run()
+    assert app.session_state["_changes_test"] == (seen + 1,)
@@ -0,0 +1,86 @@
+from utils import chat_store
+from utils.chat_store import ChatStore
+
+
+def send_many(store, room, count, start=0):
+    for i in range(start, start + count):
+        assert store.send(room, "Meera", f"message {i}")
+
+
+def test_recent_keeps_the_newest_ring_size_messages(tmp_path):
+    store = ChatStore(str(tmp_path), ring_size=5)
+    send_many(store, "HR", 8)
+    assert [message["message"] for message in store.recent("HR")] == [f"message {i}" for i in range(3, 8)]
+    assert [message["seq"] for message in store.recent("HR", 2)] == [7, 8]
+    assert store.recent("Engineering") == []
+
+
+def test_since_across_the_ring_buffer_boundary(tmp_path):
+    store = ChatStore(str(tmp_path), ring_size=5)
+    send_many(store, "HR", 12)
+
+    # Inside the buffer
+    messages, cursor = store.since("HR", 9)
+    assert [message["seq"] for message in messages] == [10, 11, 12]
+    assert cursor == 12
+    # Older than the buffer reaches: read from the segment
+    messages, cursor = store.since("HR", 2)
+    assert [message["seq"] for message in messages] == list(range(3, 13))
+    messages, cursor = store.since("HR", 0, limit=4)
+    assert ([message["seq"] for message in messages], cursor) == ([1, 2, 3, 4], 4)
+    # Nothing new
+    assert store.since("HR", 12) == ([], 12)
+
+
+def test_since_sees_other_processes_messages(tmp_path):
+    reader = ChatStore(str(tmp_path), ring_size=5)
+    writer = ChatStore(str(tmp_path), ring_size=5)
+    send_many(writer, "HR", 3)
+    messages, cursor = reader.since("HR", 0)
+    assert cursor == 3
+
+    send_many(writer, "HR", 9, start=3)
+    messages, cursor = reader.since("HR", cursor)
+    assert [message["seq"] for message in messages] == list(range(4, 13))
+    # Sequence numbers continue from the other process's sends
+    assert reader.send("HR", "Ravi", "reply")
+    assert reader.recent("HR", 1)[0]["seq"] == 13
+
+
+def test_since_after_segments_are_replaced(tmp_path):
+    reader = ChatStore(str(tmp_path), ring_size=5)
+    send_many(reader, "HR", 10)
+    _, cursor = reader.since("HR", 0)
+    assert cursor == 10
+
+    # Another process rewrites every room (e.g. a data import): seqs restart at 1
+    ChatStore(str(tmp_path)).import_messages([
+        {"room": "HR", "sender": "Ravi", "message": "fresh 1"},
+        {"room": "HR", "sender": "Ravi", "message": "fresh 2"},
+    ])
+    messages, cursor = reader.since("HR", cursor)
+    assert [message["message"] for message in messages] == ["fresh 1", "fresh 2"]
+    assert cursor == 2
+
+
+def test_priming_reads_the_segment_tail_in_blocks(tmp_path, monkeypatch):
+    monkeypatch.setattr(chat_store, "TAIL_BLOCK", 256)
+    send_many(ChatStore(str(tmp_path)), "HR", 50)
+
+    # A new process primes its buffer from the end of the segment, several blocks back
+    store = ChatStore(str(tmp_path), ring_size=7)
+    assert [message["seq"] for message in store.recent("HR")] == list(range(44, 51))
+    messages, _ = store.since("HR", 40)
+    assert [message["seq"] for message in messages] == list(range(41, 51))
+
+
+def test_legacy_chat_is_split_into_rooms(tmp_path):
+    class Legacy:
+        def load(self, file_name):
+            return [{"room": "HR", "sender": "Ravi", "message": "a"},
+                    {"room": "Engineering", "sender": "Asha", "message": "b"},
+                    {"room": "HR", "sender": "Meera", "message": "c"}]
+
+    store = ChatStore(str(tmp_path), legacy=Legacy())
+    assert [(message["seq"], message["message"]) for message in store.recent("HR")] == [(1, "a"), (2, "c")]
+    assert store.rooms() == ["Engineering", "HR"]
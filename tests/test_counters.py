@@ -0,0 +1,30 @@
+from utils.counters import CounterStore
+from utils.storage import JsonlStorage
+
+
+def test_counters_follow_inserts_and_updates(tmp_path):
+    storage = JsonlStorage(str(tmp_path))
+    counters = CounterStore(str(tmp_path), storage)
+    storage.append_many("tasks.json", [{"id": 1, "status": "Pending"}, {"id": 2, "status": "Pending"}])
+    assert counters.summary("tasks.json") == {"count": 2, "by": {"Pending": 2},
+                                              "version": list(storage.version("tasks.json"))}
+
+    storage.append("tasks.json", {"id": 3, "status": "Completed"})
+    counters.record_insert("tasks.json", [{"id": 3, "status": "Completed"}])
+    storage.update("tasks.json", 1, {"status": "Completed"})
+    counters.record_update("tasks.json", {"id": 1, "status": "Pending"}, {"status": "Completed"})
+
+    summary = counters.summary("tasks.json")
+    assert (summary["count"], summary["by"]) == (3, {"Pending": 1, "Completed": 2})
+
+
+def test_counters_recount_after_a_write_they_missed(tmp_path):
+    storage = JsonlStorage(str(tmp_path))
+    counters = CounterStore(str(tmp_path), storage)
+    storage.append("feedback.json", {"id": 1, "route_to": "HR"})
+    assert counters.summary("feedback.json")["count"] == 1
+
+    # Written behind the counters' back: the storage version moves, so the next read recounts
+    storage.append("feedback.json", {"id": 2, "route_to": "CEO"})
+    summary = counters.summary("feedback.json")
+    assert (summary["count"], summary["by"]) == (2, {"HR": 1, "CEO": 1})
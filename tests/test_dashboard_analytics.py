@@ -0,0 +1,86 @@
+import os
+import random
+import subprocess
+import sys
+
+from utils.dashboard_analytics import DashboardAnalytics, _sort_keys, dashboard_analytics, top_indices
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_records_missing_or_null_sort_fields_sort_last():
+    posts = [{"id": 1, "timestamp": "2025-01-02T10:00:00"}, {"id": 2}, {"id": 3, "timestamp": None},
+             {"id": 4, "timestamp": "2025-01-03T09:00:00"}]
+    tasks = [{"id": 1, "created_at": None}, {"id": 2, "timestamp": "2025-01-01"}, {"id": 3},
+             {"id": 4, "created_at": "2025-02-01"}]
+    analytics = DashboardAnalytics(tasks, posts, [])
+
+    assert [post["id"] for post in analytics.recent_posts(2)] == [4, 1]
+    assert [post["id"] for post in analytics.recent_posts(10)] == [4, 1, 2, 3]
+    assert [task["id"] for task in analytics.recent_tasks(2)] == [4, 2]
+
+
+def test_top_indices_match_a_stable_sort():
+    rng = random.Random(11)
+    values = [rng.choice(["2025-01-01", "2025-01-02", "2025-01-03", "", "2025-02-01"]) for _ in range(200)]
+    keys = _sort_keys(values)
+    expected = sorted(range(len(values)), key=lambda i: values[i], reverse=True)
+    for n in (0, 1, 7, 40, 199, 200, 250):
+        assert top_indices(keys, n).tolist() == expected[:n]
+
+
+def test_breakdowns_match_counting_loops():
+    rng = random.Random(5)
+    tasks = [{"status": rng.choice(["Pending", "Completed", "In Progress"]),
+              "department": rng.choice(["HR", "Engineering"]),
+              "assigned_to": rng.choice(["Asha", "Ravi", "", None])} for _ in range(100)]
+    tasks.append({"title": "no fields"})
+    feedback = [{"route_to": rng.choice(["HR", "CEO"]), "status": rng.choice(["read", "unread"])} for _ in range(50)]
+    feedback.append({"content": "no status"})
+    analytics = DashboardAnalytics(tasks, [], feedback)
+
+    def count(records, field, default):
+        counts = {}
+        for record in records:
+            value = record.get(field, default)
+            counts[value] = counts.get(value, 0) + 1
+        return counts
+
+    # Same labels in the same order as the original dict-counting loops
+    assert list(analytics.task_status_counts.items()) == list(count(tasks, "status", "Unknown").items())
+    assert list(analytics.tasks_by_department.items()) == list(count(tasks, "department", "Unknown").items())
+    assert list(analytics.feedback_by_route.items()) == list(count(feedback, "route_to", "Unknown").items())
+    assert list(analytics.feedback_by_status.items()) == list(count(feedback, "status", "unread").items())
+    for row in analytics.department_stats:
+        in_department = [task for task in tasks if task.get("department", "Unknown") == row["department"]]
+        assert row["total"] == len(in_department)
+        assert row["completed"] == sum(task.get("status") == "Completed" for task in in_department)
+        assert row["pending"] == sum(task.get("status") == "Pending" for task in in_department)
+
+    kpis = analytics.kpis
+    assert kpis["total_tasks"] == 101
+    assert kpis["completed_tasks"] == sum(task.get("status") == "Completed" for task in tasks)
+    assert kpis["active_employees"] == len({task.get("assigned_to") for task in tasks if task.get("assigned_to")})
+    assert kpis["unread_feedback"] == sum(fb.get("status") == "unread" for fb in feedback)
+
+
+def test_analytics_are_rebuilt_only_when_the_data_changes(manager):
+    manager.add_task("Plan", "Draft it", "Asha", "Meera", "HR")
+    manager.add_post("Kickoff", "Hello", "Meera", "All")
+    manager.add_feedback("More coffee", "HR")
+    analytics = dashboard_analytics(manager)
+    assert dashboard_analytics(manager) is analytics
+    assert analytics.kpis["total_tasks"] == 1
+
+    manager.add_task("Review", "Read it", "Ravi", "Meera", "HR")
+    rebuilt = dashboard_analytics(manager)
+    assert rebuilt is not analytics
+    assert rebuilt.kpis["total_tasks"] == 2
+
+
+def test_importing_analytics_loads_neither_numpy_nor_pandas():
+    script = ("import sys, utils.dashboard_analytics; "
+              "print(','.join(m for m in ('numpy', 'pandas') if m in sys.modules))")
+    result = subprocess.run([sys.executable, "-c", script], cwd=PROJECT_ROOT,
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == ""
@@ -0,0 +1,83 @@
+import json
+import os
+
+import pytest
+
+from utils.auth import DEFAULT_USERS, authenticate_user
+from utils.directory import EmployeeDirectory
+
+EMPLOYEES = [
+    {"id": "EMP001", "name": "Guruprasad", "department": "Engineering", "role": "CEO"},
+    {"id": "EMP002", "name": "Meera", "department": "Marketing", "role": "Manager"},
+    {"id": "EMP010", "name": "Asha Rao", "department": "Engineering", "role": "Employee", "password": "asha-pw"},
+    {"id": "EMP011", "name": "Asha Rao", "department": "HR", "role": "Employee", "password": "other-pw"},
+    {"id": "emp002", "name": "Shadow", "department": "Ops", "role": "Employee"},
+]
+
+
+def write_employees(path, employees, mtime_ns):
+    path.write_text(json.dumps(employees), encoding="utf-8")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+@pytest.fixture
+def directory(tmp_path, monkeypatch):
+    """The app's directory, pointed at a test employees.json"""
+    from utils.data import data_manager
+
+    write_employees(tmp_path / "employees.json", EMPLOYEES, 1_000_000_000)
+    directory = EmployeeDirectory(str(tmp_path / "employees.json"))
+    monkeypatch.setattr(data_manager, "directory", directory)
+    return directory
+
+
+def test_lookups_by_id_name_department_and_role(directory):
+    assert directory.get("emp001")["name"] == "Guruprasad"
+    # Ids are unique after casefolding; the first record wins
+    assert directory.get("EMP002")["name"] == "Meera"
+    assert [e["id"] for e in directory.named("asha rao")] == ["EMP010", "EMP011"]
+    assert [e["id"] for e in directory.lookup("EMP010")] == ["EMP010"]
+    assert [e["id"] for e in directory.lookup("ASHA RAO")] == ["EMP010", "EMP011"]
+    assert directory.lookup("nobody") == []
+
+    assert [e["id"] for e in directory.in_department("Engineering")] == ["EMP001", "EMP010"]
+    assert [e["id"] for e in directory.with_role("Employee")] == ["EMP010", "EMP011", "emp002"]
+    assert directory.departments() == ["Engineering", "Marketing", "HR", "Ops"]
+    assert directory.names() == [e["name"] for e in EMPLOYEES]
+    assert directory.labels()["Asha Rao (EMP011)"]["department"] == "HR"
+    assert len(directory) == len(EMPLOYEES)
+
+
+def test_index_follows_the_file(tmp_path):
+    path = tmp_path / "employees.json"
+    directory = EmployeeDirectory(str(path))
+    assert directory.all() == []
+
+    write_employees(path, EMPLOYEES[:1], 1_000_000_000)
+    index = directory.index()
+    assert directory.index() is index
+    write_employees(path, EMPLOYEES[:2], 2_000_000_000)
+    assert [e["id"] for e in directory.all()] == ["EMP001", "EMP002"]
+
+    path.write_text("[{", encoding="utf-8")
+    assert directory.all() == []
+
+
+def test_login_by_id_or_case_folded_name(directory):
+    assert authenticate_user("emp001", "admin123") is directory.get("EMP001")
+    assert authenticate_user("MEERA", "user123") is directory.get("EMP002")
+    # Among employees sharing a name, the one whose password matches
+    assert authenticate_user("asha rao", "other-pw")["id"] == "EMP011"
+
+
+def test_login_with_a_demo_account_missing_from_the_directory(directory):
+    ravi = next(user for user in DEFAULT_USERS if user["id"] == "EMP003")
+    assert directory.get("EMP003") is None
+    assert authenticate_user("ravi", "hr123") == ravi
+    assert authenticate_user("EMP003", "hr123") == ravi
+
+
+def test_login_with_a_wrong_password_or_unknown_user(directory):
+    assert authenticate_user("EMP001", "user123") is None
+    assert authenticate_user("Guruprasad", "") is None
+    assert authenticate_user("nobody", "admin123") is None
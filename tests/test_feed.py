@@ -0,0 +1,159 @@
+import random
+import sys
+import threading
+
+import pytest
+
+from utils.search_index import SearchIndex, tokenize
+
+DEPARTMENTS = ["Engineering", "HR", "Marketing", "All"]
+NAMES = ["Guruprasad", "Meera", "Ravi", "Asha", "Karan"]
+WORDS = ["team", "quarterly", "customer", "release", "hiring", "budget", "relations"]
+
+USERS = [
+    ("Engineering", "Employee", "Asha"),
+    ("HR", "Recruiter", "Ravi"),
+    ("Marketing", "Manager", "Meera"),
+    ("Engineering", "CEO", "Guruprasad"),
+    ("Sales", "Employee", "Nobody"),
+]
+
+
+def baseline_visible(posts, user_department, user_role, user_name):
+    """The visibility rules and ordering of the original get_posts_for_user"""
+    c_suite = user_role in ["Chairman", "CEO", "President", "Vice President", "Group President"]
+    visible = []
+    for post in posts:
+        if post.get("is_vip", False):
+            if c_suite or user_name in post.get("vip_recipients", []) or post["author"] == user_name:
+                visible.append(post)
+        elif post["department"] in ("All", user_department):
+            visible.append(post)
+    visible.sort(key=lambda post: post.get("timestamp", ""), reverse=True)
+    return visible
+
+
+def make_posts(count, seed=7, unique_timestamps=True):
+    rng = random.Random(seed)
+    posts = []
+    for i in range(1, count + 1):
+        is_vip = rng.random() < 0.25
+        minute = i if unique_timestamps else rng.randint(0, 5)
+        posts.append({
+            "id": i,
+            "title": " ".join(rng.sample(WORDS, 2)),
+            "content": " ".join(rng.choices(WORDS, k=6)),
+            "author": rng.choice(NAMES),
+            "department": rng.choice(DEPARTMENTS),
+            "tags": [rng.choice(WORDS)],
+            "timestamp": f"2025-01-{1 + minute // 1440:02d}T{minute // 60 % 24:02d}:{minute % 60:02d}:00",
+            "is_vip": is_vip,
+            "vip_recipients": rng.sample(NAMES, 2) if is_vip else [],
+        })
+    rng.shuffle(posts)
+    return posts
+
+
+def all_pages(fetch, limit):
+    """Follow next-page cursors until the last page"""
+    posts, cursor = fetch(limit, None)
+    while cursor is not None:
+        page, cursor = fetch(limit, cursor)
+        posts.extend(page)
+    return posts
+
+
+@pytest.mark.parametrize("user", USERS)
+def test_feed_matches_baseline_visibility_and_order(manager, user):
+    manager.save_data("posts.json", make_posts(150))
+    # Inserts after the first read exercise the incremental index update
+    manager.get_posts_for_user(*user)
+    manager.add_post("hiring update", "team news", "Meera", "HR", is_vip=True, vip_recipients=["Asha"])
+    manager.add_post("release notes", "customer relations", "Ravi", "All")
+
+    expected = baseline_visible(manager.load_data("posts.json"), *user)
+    assert manager.get_posts_for_user(*user) == expected
+
+    paged = all_pages(lambda limit, cursor: manager.get_feed_page(*user, limit, cursor), 7)
+    assert paged == expected
+
+    assert manager.get_posts_for_user(*user, vip=True) == [post for post in expected if post["is_vip"]]
+    assert manager.get_posts_for_user(*user, vip=False) == [post for post in expected if not post["is_vip"]]
+
+
+def test_department_pages_hold_every_post_addressed_to_the_department(manager):
+    posts = make_posts(120)
+    manager.save_data("posts.json", posts)
+    # As the original department pages filtered on department alone, VIP posts are included
+    expected = sorted((post for post in posts if post["department"] == "HR"),
+                      key=lambda post: post["timestamp"], reverse=True)
+    assert any(post["is_vip"] for post in expected)
+    assert all_pages(lambda limit, cursor: manager.get_department_page("HR", limit, cursor), 5) == expected
+
+
+def test_paging_with_equal_timestamps_neither_repeats_nor_drops(manager):
+    manager.save_data("posts.json", make_posts(80, unique_timestamps=False))
+    user = ("Engineering", "CEO", "Guruprasad")
+    expected = baseline_visible(manager.load_data("posts.json"), *user)
+
+    paged = all_pages(lambda limit, cursor: manager.get_feed_page(*user, limit, cursor), 6)
+    assert sorted(post["id"] for post in paged) == sorted(post["id"] for post in expected)
+    assert [post["timestamp"] for post in paged] == [post["timestamp"] for post in expected]
+
+
+@pytest.mark.parametrize("user", USERS)
+def test_search_returns_only_visible_matches(manager, user):
+    manager.save_data("posts.json", make_posts(150))
+    visible = {post["id"] for post in baseline_visible(manager.load_data("posts.json"), *user)}
+
+    def matches(post):
+        terms = tokenize(f"{post['title']} {post['content']} {' '.join(post['tags'])}")
+        return all(any(term.startswith(prefix) for term in terms) for prefix in ("cust", "rel"))
+
+    expected = {post["id"] for post in manager.load_data("posts.json") if post["id"] in visible and matches(post)}
+    results = manager.search_posts("cust rel", *user)
+    assert expected
+    assert sorted(post["id"] for post in results) == sorted(expected)
+
+
+def test_search_index_prefixes_include_terms_added_later():
+    index = SearchIndex()
+    index.add({"title": "budget review", "content": "", "tags": []})
+    assert [doc for doc, _ in index.search("bud")] == [0]
+
+    index.add({"title": "budgeting", "content": "buddy", "tags": ["zeta"]})
+    assert sorted(doc for doc, _ in index.search("bud")) == [0, 1]
+    assert [doc for doc, _ in index.search("ze")] == [1]
+    assert index.sorted_terms() == sorted(index.postings)
+
+
+def test_queries_run_while_other_sessions_add_posts(manager):
+    manager.save_data("posts.json", make_posts(300))
+    user = ("Engineering", "CEO", "Guruprasad")
+    failures = []
+
+    def write():
+        for i in range(150):
+            manager.add_post(f"release {i}", "customer relations budget", "Ravi", "All")
+
+    def read():
+        # Each read also folds new posts into the index, so reads race with index updates
+        for _ in range(150):
+            if not manager.search_posts("rel", *user) or not manager.get_posts_for_user(*user, limit=20):
+                failures.append("empty result")
+
+    threads = [threading.Thread(target=write)] + [threading.Thread(target=read) for _ in range(3)]
+    # Switch threads as often as possible so queries and index updates interleave
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+
+    assert failures == []
+    found = {post["title"] for post in manager.search_posts("customer relations", *user)}
+    assert {f"release {i}" for i in range(150)} <= found
@@ -0,0 +1,56 @@
+import sys
+
+import plotly.graph_objects as go
+
+from utils.figure_cache import FigureCache
+
+
+def bar_figure(values):
+    return go.Figure(go.Bar(x=list(range(len(values))), y=values))
+
+
+def test_hits_rebuild_the_same_figure_without_calling_build():
+    cache = FigureCache(max_bytes=10 * 1024 * 1024)
+    builds = []
+
+    def build():
+        builds.append(1)
+        return bar_figure([3, 1, 2])
+
+    first = cache.get(("status", (1, 2)), build)
+    second = cache.get(("status", (1, 2)), build)
+    assert len(builds) == 1
+    assert second is not first
+    assert second.to_json() == first.to_json()
+    # A new data version is a new key
+    cache.get(("status", (1, 3)), build)
+    assert len(builds) == 2
+    assert cache.stats() == {"entries": 2, "bytes": cache.bytes, "max_bytes": 10 * 1024 * 1024,
+                             "hits": 1, "misses": 2, "evictions": 0}
+
+
+def test_least_recently_used_figures_are_evicted_first():
+    size = sys.getsizeof(bar_figure([1]).to_json())
+    cache = FigureCache(max_bytes=int(size * 2.5))
+    for key in ("a", "b"):
+        cache.get(key, lambda: bar_figure([1]))
+    cache.get("a", lambda: bar_figure([1]))
+    cache.get("c", lambda: bar_figure([1]))
+
+    builds = []
+    cache.get("a", lambda: builds.append("a") or bar_figure([1]))
+    cache.get("b", lambda: builds.append("b") or bar_figure([1]))
+    assert builds == ["b"]
+    assert cache.stats()["evictions"] == 2
+    assert cache.bytes <= cache.max_bytes
+
+
+def test_figures_larger_than_the_cache_are_not_kept():
+    cache = FigureCache(max_bytes=100)
+    cache.get("big", lambda: bar_figure(list(range(100))))
+    assert cache.stats()["entries"] == 0
+
+    cache = FigureCache(max_bytes=10 * 1024 * 1024)
+    cache.get("kept", lambda: bar_figure([1]))
+    cache.clear()
+    assert (cache.stats()["entries"], cache.bytes) == (0, 0)
@@ -0,0 +1,41 @@
+from utils.chat_store import ChatStore
+from utils.loadtest import find_lost_writes, percentile, run_load_test, summarize
+from utils.storage import create_storage
+
+
+def test_percentile_and_summary():
+    values = [float(ms) for ms in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 95) == 95.0
+    assert percentile(values, 100) == 100.0
+    assert percentile([], 50) is None
+
+    summary = summarize([{"action": "home", "ms": ms} for ms in (3.0, 1.0, 2.0)])
+    assert summary == {"count": 3, "p50_ms": 2.0, "p95_ms": 3.0, "p99_ms": 3.0, "max_ms": 3.0}
+    assert summarize([])["max_ms"] is None
+
+
+def test_find_lost_writes_checks_every_target(tmp_path):
+    storage = create_storage(str(tmp_path), "jsonl")
+    storage.append("posts.json", {"id": 1, "title": "loadtest s0 post 1"})
+    storage.append("tasks.json", {"id": 1, "title": "loadtest s0 task 2"})
+    ChatStore(str(tmp_path)).send("HR", "Meera", "loadtest s0 chat 3")
+
+    writes = [
+        {"action": "post", "marker": "loadtest s0 post 1"},
+        {"action": "task", "marker": "loadtest s0 task 2"},
+        {"action": "chat", "marker": "loadtest s0 chat 3"},
+        {"action": "chat", "marker": "loadtest s0 chat 4"},
+        {"action": "post", "marker": "loadtest s0 task 2"},
+    ]
+    assert find_lost_writes(str(tmp_path), "jsonl", writes) == writes[3:]
+
+
+def test_load_test_run_loses_no_writes(tmp_path):
+    report = run_load_test(sessions=2, steps=4, duration=120, scale=200, seed=5, timeout=60,
+                           out_dir=str(tmp_path))
+    assert report["errors"] == []
+    assert report["lost_writes"] == []
+    # Two logins plus one rerun or more per step for each session
+    assert report["reruns"] >= 2 * (2 + 4)
+    assert (tmp_path / "loadtest-jsonl.md").exists()
@@ -0,0 +1,59 @@
+from utils.metrics import LATENCY_BUCKETS, Metrics, OperationStats, metrics, timed
+
+
+def test_operation_stats_histogram_and_quantiles():
+    stats = OperationStats()
+    for seconds in (0.0002, 0.0008, 0.003, 0.003, 10.0):
+        stats.observe(seconds, records=2)
+    assert (stats.calls, stats.records) == (5, 10)
+    assert stats.buckets[:4] == [1, 1, 0, 2]
+    assert stats.buckets[-1] == 1
+    assert stats.quantile(0.5) == 0.005
+    assert stats.quantile(0.99) == float("inf")
+    assert OperationStats().quantile(0.95) == 0.0
+
+
+def test_prometheus_text_has_cumulative_buckets(tmp_path):
+    registry = Metrics()
+    registry.observe("load_data", "posts.json", 0.002, records=3)
+    registry.observe("load_data", "posts.json", 0.2, error=True)
+    registry.add_bytes("posts.json", read=100, written=40)
+
+    text = registry.prometheus_text()
+    labels = 'operation="load_data",collection="posts.json"'
+    assert f"superapp_operation_calls_total{{{labels}}} 2" in text
+    assert f"superapp_operation_errors_total{{{labels}}} 1" in text
+    assert f'superapp_operation_latency_seconds_bucket{{{labels},le="0.0025"}} 1' in text
+    assert f'superapp_operation_latency_seconds_bucket{{{labels},le="0.25"}} 2' in text
+    assert f'superapp_operation_latency_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+    assert 'superapp_storage_bytes_total{collection="posts.json",direction="read"} 100' in text
+    assert text.count("superapp_operation_latency_seconds_bucket{") == len(LATENCY_BUCKETS) + 1
+
+    path = tmp_path / "metrics.prom"
+    registry.write_prometheus(str(path))
+    assert path.read_text(encoding="utf-8") == registry.prometheus_text()
+
+    assert registry.summary()[0]["calls"] == 2
+    registry.reset()
+    assert registry.summary() == []
+
+
+def test_timed_records_calls_records_and_failed_writes():
+    class Store:
+        @timed("test_list")
+        def load(self, file_name):
+            return [1, 2, 3]
+
+        @timed("test_save", "fixed.json")
+        def save(self, file_name, records):
+            return False
+
+    store = Store()
+    store.load("timed.json")
+    store.save("ignored.json", [1, 2])
+
+    listed = metrics.operations[("test_list", "timed.json")]
+    assert (listed.calls, listed.records, listed.errors) == (1, 3, 0)
+    # A write returning False counts as an error; its records are the list being saved
+    saved = metrics.operations[("test_save", "fixed.json")]
+    assert (saved.calls, saved.records, saved.errors) == (1, 2, 1)
@@ -0,0 +1,65 @@
+import os
+
+from streamlit.testing.v1 import AppTest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ADMIN = {"id": "EMP001", "name": "Guruprasad", "department": "Engineering", "role": "Executive"}
+EMPLOYEE = {"id": "EMP002", "name": "Meera", "department": "HR", "role": "Manager"}
+
+
+def open_page(page, employee):
+    """Log in through session state and pick a page in app.py's sidebar"""
+    app = AppTest.from_file(os.path.join(PROJECT_ROOT, "app.py"), default_timeout=60)
+    app.session_state["logged_in"] = True
+    app.session_state["employee"] = employee
+    app.run()
+    app.sidebar.radio[0].set_value(page).run()
+    return app
+
+
+def errors(app):
+    return [element.value for element in app.error]
+
+
+def button(app, label):
+    return next(element for element in app.button if element.label == label)
+
+
+def test_chat_panel_sends_and_lists_a_message(monkeypatch):
+    monkeypatch.chdir(PROJECT_ROOT)
+    app = open_page("🤝 Collaboration", EMPLOYEE)
+    assert not app.exception and not errors(app)
+    assert [tab.label for tab in app.tabs] == ["💬 Chat", "📅 Schedule", "⏳ Meetings"]
+
+    app.text_input[0].input("panel test message")
+    button(app, "Send Message").click().run()
+    assert not app.exception and not errors(app)
+    assert "Message sent!" in [element.value for element in app.success]
+    assert "panel test message" in [element.value for element in app.markdown]
+
+
+def test_dashboard_renders_every_panel_for_admins(monkeypatch):
+    from utils.data import data_manager
+
+    monkeypatch.chdir(PROJECT_ROOT)
+    data_manager.add_task("Quarterly plan", "Draft it", "Meera", "Guruprasad", "HR")
+    data_manager.add_post("Panel post", "Hello", "Guruprasad", "All")
+    data_manager.add_feedback("More coffee", "HR")
+
+    app = open_page("📊 Dashboard", ADMIN)
+    assert not app.exception and not errors(app)
+    assert [tab.label for tab in app.tabs] == [
+        "📈 Task Analytics", "🏢 Department Insights", "📬 Feedback Analysis", "📱 Activity Monitor"]
+
+    # A control inside the admin panel reruns without breaking the charts
+    button(app, "🔧 System Info").click().run()
+    assert not app.exception and not errors(app)
+
+
+def test_dashboard_denies_other_roles(monkeypatch):
+    monkeypatch.chdir(PROJECT_ROOT)
+    app = open_page("📊 Dashboard", EMPLOYEE)
+    assert not app.exception
+    assert errors(app) == ["Access Denied - Administrative Privileges Required"]
+    assert not app.tabs
@@ -0,0 +1,45 @@
+import os
+
+import pytest
+
+from utils.pages import PAGES_DIR, PageRegistry
+
+
+def write_page(path, source, mtime_ns):
+    path.write_text(source, encoding="utf-8")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_pages_are_compiled_once_per_version_of_the_file(tmp_path):
+    page = tmp_path / "Home.py"
+    write_page(page, "result = 1\n", 1_000_000_000)
+    registry = PageRegistry(str(tmp_path))
+
+    code = registry.get(str(page))
+    assert registry.get(str(page)) is code
+    namespace = {}
+    exec(code, namespace)
+    assert namespace["result"] == 1
+    # Tracebacks point at the page file
+    assert code.co_filename == str(page)
+
+    write_page(page, "result = 2\n", 2_000_000_000)
+    namespace = {}
+    exec(registry.get(str(page)), namespace)
+    assert namespace["result"] == 2
+
+
+def test_missing_page_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        PageRegistry(str(tmp_path)).get(str(tmp_path / "Missing.py"))
+
+
+def test_preload_skips_pages_that_do_not_compile(tmp_path):
+    (tmp_path / "Good.py").write_text("x = 1\n", encoding="utf-8")
+    (tmp_path / "Broken.py").write_text("def (:\n", encoding="utf-8")
+    assert PageRegistry(str(tmp_path)).preload() == [str(tmp_path / "Good.py")]
+
+
+def test_every_app_page_compiles():
+    pages = sorted(name for name in os.listdir(PAGES_DIR) if name.endswith(".py"))
+    assert [os.path.basename(path) for path in PageRegistry().preload()] == pages
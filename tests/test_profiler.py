@@ -0,0 +1,53 @@
+import json
+import os
+import subprocess
+import sys
+
+from utils.profiler import StartupProfiler
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_profiler_records_inclusive_and_self_import_times(tmp_path, monkeypatch):
+    (tmp_path / "profiled_outer.py").write_text("import profiled_inner\n", encoding="utf-8")
+    (tmp_path / "profiled_inner.py").write_text("import time\ntime.sleep(0.02)\n", encoding="utf-8")
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    profiler = StartupProfiler(str(tmp_path / "profile.json"))
+    profiler.install()
+    try:
+        import profiled_outer  # noqa: F401
+    finally:
+        profiler.uninstall()
+        sys.modules.pop("profiled_outer", None)
+        sys.modules.pop("profiled_inner", None)
+
+    outer, inner = profiler.imports["profiled_outer"], profiler.imports["profiled_inner"]
+    assert inner["inclusive_ms"] >= 20
+    assert outer["inclusive_ms"] >= inner["inclusive_ms"]
+    # The nested import is taken out of the outer module's own time
+    assert outer["self_ms"] < inner["inclusive_ms"]
+    assert outer["modules_loaded"] == 2
+
+
+def test_profiler_times_only_the_first_render_of_a_page(tmp_path):
+    report_path = tmp_path / "profile.json"
+    profiler = StartupProfiler(str(report_path))
+    with profiler.page_render("Home"):
+        pass
+    first = profiler.pages["Home"]
+    with profiler.page_render("Home"):
+        pass
+    assert profiler.pages["Home"] == first
+
+    report = json.loads(report_path.read_text(encoding="utf-8"))
+    assert list(report["first_render_ms"]) == ["Home"]
+
+
+def test_data_layer_does_not_import_streamlit_or_pandas(tmp_path):
+    script = ("import sys, utils.data; "
+              "print(','.join(m for m in ('streamlit', 'pandas', 'numpy', 'plotly') if m in sys.modules))")
+    env = {**os.environ, "SUPERAPP_DATA_DIR": str(tmp_path), "SUPERAPP_METRICS_INTERVAL": "0"}
+    result = subprocess.run([sys.executable, "-c", script], cwd=PROJECT_ROOT, env=env,
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == ""
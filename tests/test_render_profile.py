@@ -0,0 +1,51 @@
+import marshal
+import os
+import tracemalloc
+
+from streamlit.testing.v1 import AppTest
+
+from utils.render_profile import RESULT_KEY, RenderCapture
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def busy_render():
+    return [str(i) * 10 for i in range(20000)]
+
+
+def test_capture_reports_functions_allocations_and_prof():
+    capture = RenderCapture("Home")
+    capture.start()
+    busy_render()
+    result = capture.stop()
+
+    assert result["page"] == "Home"
+    assert result["wall_ms"] > 0 and result["peak_kb"] > 0
+    assert any(row["function"].startswith("busy_render (") for row in result["functions"])
+    cumulative = [row["cumtime_ms"] for row in result["functions"]]
+    assert cumulative == sorted(cumulative, reverse=True)
+    assert any("test_render_profile.py" in row["site"] for row in result["allocations"])
+    # The .prof payload is the pstats marshal format
+    assert isinstance(marshal.loads(result["prof"]), dict)
+    # tracemalloc is only left running if something else started it
+    assert not tracemalloc.is_tracing()
+
+
+def open_with_profile(employee):
+    app = AppTest.from_file(os.path.join(PROJECT_ROOT, "app.py"), default_timeout=60)
+    app.session_state["logged_in"] = True
+    app.session_state["employee"] = employee
+    app.query_params["profile"] = "1"
+    return app.run()
+
+
+def test_profile_query_param_captures_for_admins_only(monkeypatch):
+    monkeypatch.chdir(PROJECT_ROOT)
+    admin = open_with_profile({"id": "EMP001", "name": "Guruprasad", "department": "Engineering", "role": "CEO"})
+    assert not admin.exception
+    assert admin.session_state[RESULT_KEY]["page"] == "🏠 Home Feed"
+    assert any(element.label.startswith("🔬 Render profile: 🏠 Home Feed") for element in admin.expander)
+
+    employee = open_with_profile({"id": "EMP002", "name": "Meera", "department": "HR", "role": "Manager"})
+    assert not employee.exception
+    assert RESULT_KEY not in employee.session_state
@@ -0,0 +1,99 @@
+import multiprocessing
+import threading
+from concurrent.futures import Future
+
+from utils.group_commit import GroupCommitter
+from utils.sequences import SequenceStore
+from utils.storage import JsonlStorage
+
+
+def test_sequence_seeds_from_existing_ids_and_reserves_blocks(tmp_path):
+    sequences = SequenceStore(str(tmp_path), seed=lambda collection: 41, block_size=10)
+    assert sequences.next_id("posts.json") == 42
+    assert sequences.next_id("posts.json") == 43
+    # The whole block is taken from the file at once
+    assert sequences.current("posts.json") == 51
+    assert list(sequences.reserve("posts.json", 3)) == [44, 45, 46]
+    # A bulk reservation larger than what is left starts a new block
+    assert list(sequences.reserve("posts.json", 12)) == list(range(52, 64))
+
+    # A second store, as in another process, never reuses this one's block
+    assert SequenceStore(str(tmp_path), block_size=10).next_id("posts.json") == 64
+
+
+def _reserve_ids(data_dir, count, queue):
+    sequences = SequenceStore(data_dir, block_size=7)
+    queue.put([sequences.next_id("tasks.json") for _ in range(count)])
+
+
+def test_sequence_ids_unique_across_threads_and_processes(tmp_path):
+    queue = multiprocessing.Queue()
+    processes = [multiprocessing.Process(target=_reserve_ids, args=(str(tmp_path), 50, queue)) for _ in range(3)]
+    for process in processes:
+        process.start()
+
+    sequences = SequenceStore(str(tmp_path), block_size=7)
+    local = []
+    threads = [threading.Thread(target=lambda: local.extend(sequences.next_id("tasks.json") for _ in range(50)))
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    ids = local + [i for _ in processes for i in queue.get(timeout=30)]
+    for process in processes:
+        process.join()
+    assert len(ids) == 350
+    assert len(set(ids)) == len(ids)
+
+
+def test_group_commit_assigns_unique_ids_once_per_batch(tmp_path):
+    storage = JsonlStorage(str(tmp_path))
+    sequences = SequenceStore(str(tmp_path), block_size=1)
+    batches = []
+    committer = GroupCommitter(storage, window_ms=20, sequences=sequences, on_commit=batches.append)
+
+    results = []
+    threads = [threading.Thread(target=lambda i=i: results.append(committer.append("feedback.json", {"n": i})))
+               for i in range(100)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [True] * 100
+    records = storage.load("feedback.json")
+    assert sorted(record["n"] for record in records) == list(range(100))
+    assert len({record["id"] for record in records}) == 100
+    # One hook call per batch covering every committed record
+    assert sum(len(batch["feedback.json"]) for batch in batches) == 100
+    assert len(batches) < 100
+
+
+def test_concurrent_inserts_get_unique_ids(manager):
+    threads = [threading.Thread(target=manager.add_feedback, args=(f"feedback {i}", "HR")) for i in range(60)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    records = manager.load_data("feedback.json")
+    assert len(records) == 60
+    assert len({record["id"] for record in records}) == 60
+    assert manager.get_analytics_data()["total_feedback"] == 60
+
+
+def test_failed_appends_return_false(manager, monkeypatch):
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+
+    # A storage error reaches append_record directly or through the group commit future
+    monkeypatch.setattr(manager.storage, "append", fail)
+    monkeypatch.setattr(manager.storage, "append_many", fail)
+    assert manager.append_record("feedback.json", {"content": "lost"}) is False
+
+    if manager.committer is not None:
+        # A batch that never commits times out instead of hanging the page
+        monkeypatch.setattr(manager.committer, "append", lambda file_name, record: Future().result(timeout=0.01))
+        assert manager.append_record("feedback.json", {"content": "stuck"}) is False
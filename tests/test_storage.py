@@ -0,0 +1,122 @@
+import json
+import os
+import stat
+
+import pytest
+
+from conftest import sqlite_has_fts5
+from utils.cache import file_cache
+from utils.storage import JsonStorage, JsonlStorage, atomic_write
+
+
+def test_jsonl_append_reload_round_trip(tmp_path):
+    storage = JsonlStorage(str(tmp_path))
+    assert storage.append("posts.json", {"id": 1, "title": "first"})
+    assert storage.append_many("posts.json", [{"id": 2, "title": "second"}, {"id": 3, "title": "third"}])
+
+    # A fresh engine replays the log from disk
+    assert JsonlStorage(str(tmp_path)).load("posts.json") == [
+        {"id": 1, "title": "first"}, {"id": 2, "title": "second"}, {"id": 3, "title": "third"},
+    ]
+
+
+def test_jsonl_updates_replay_and_compact(tmp_path):
+    storage = JsonlStorage(str(tmp_path), compact_threshold=3)
+    storage.append_many("tasks.json", [{"id": i, "status": "Pending"} for i in range(1, 4)])
+    log_path = storage.log_path("tasks.json")
+    inode = os.stat(log_path).st_ino
+
+    assert storage.update("tasks.json", 2, {"status": "Completed"})
+    assert storage.update("tasks.json", 3, {"status": "In Progress"})
+    assert os.stat(log_path).st_ino == inode
+    expected = [{"id": 1, "status": "Pending"}, {"id": 2, "status": "Completed"},
+                {"id": 3, "status": "In Progress"}]
+    assert JsonlStorage(str(tmp_path)).load("tasks.json") == expected
+
+    # The third update reaches the threshold and swaps in a compacted segment
+    assert storage.update("tasks.json", 1, {"status": "Completed"})
+    assert os.stat(log_path).st_ino != inode
+    with open(log_path, encoding="utf-8") as f:
+        entries = [json.loads(line) for line in f]
+    assert [entry["op"] for entry in entries] == ["insert"] * 3
+    expected[0]["status"] = "Completed"
+    assert JsonlStorage(str(tmp_path)).load("tasks.json") == expected
+
+
+def test_jsonl_update_of_unknown_id_is_ignored(tmp_path):
+    storage = JsonlStorage(str(tmp_path))
+    storage.append("tasks.json", {"id": 1, "status": "Pending"})
+    storage.update("tasks.json", 99, {"status": "Completed"})
+    assert storage.load("tasks.json") == [{"id": 1, "status": "Pending"}]
+
+
+def test_jsonl_skips_torn_last_line(tmp_path):
+    storage = JsonlStorage(str(tmp_path))
+    storage.append("posts.json", {"id": 1})
+    with open(storage.log_path("posts.json"), "ab") as f:
+        f.write(b'{"op": "insert", "rec')
+    file_cache.invalidate(storage.log_path("posts.json"))
+    assert JsonlStorage(str(tmp_path)).load("posts.json") == [{"id": 1}]
+
+
+def test_jsonl_imports_legacy_json_array(tmp_path):
+    JsonStorage(str(tmp_path)).save("feedback.json", [{"id": 1, "content": "hi"}])
+    storage = JsonlStorage(str(tmp_path))
+    assert storage.load("feedback.json") == [{"id": 1, "content": "hi"}]
+    assert os.path.exists(storage.log_path("feedback.json"))
+
+
+def test_jsonl_tail_reads_only_new_entries(tmp_path):
+    storage = JsonlStorage(str(tmp_path))
+    storage.append("posts.json", {"id": 1})
+    records, cursor = storage.snapshot("posts.json")
+    assert records == [{"id": 1}]
+    assert storage.tail("posts.json", cursor) == ([], cursor)
+
+    storage.append("posts.json", {"id": 2})
+    entries, cursor = storage.tail("posts.json", cursor)
+    assert entries == [{"op": "insert", "record": {"id": 2}}]
+
+    storage.compact("posts.json")
+    assert storage.tail("posts.json", cursor) == (None, None)
+
+
+def test_json_storage_round_trip(tmp_path):
+    storage = JsonStorage(str(tmp_path))
+    assert storage.save("posts.json", [{"id": 1}])
+    assert storage.append("posts.json", {"id": 2})
+    assert storage.update("posts.json", 1, {"likes": 3})
+    assert JsonStorage(str(tmp_path)).load("posts.json") == [{"id": 1, "likes": 3}, {"id": 2}]
+
+
+def test_atomic_write_keeps_backup_and_mode(tmp_path):
+    path = str(tmp_path / "data.json")
+    atomic_write(path, b"one")
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o644
+    os.chmod(path, 0o600)
+
+    atomic_write(path, b"two", backup=True)
+    with open(path, "rb") as f:
+        assert f.read() == b"two"
+    with open(f"{path}.bak", "rb") as f:
+        assert f.read() == b"one"
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    # No temp files left behind
+    assert sorted(os.listdir(tmp_path)) == ["data.json", "data.json.bak"]
+
+
+@pytest.mark.skipif(not sqlite_has_fts5(), reason="sqlite3 was built without FTS5")
+def test_sqlite_tail_follows_the_database_version(tmp_path):
+    from utils.sqlite_store import SqliteStorage
+
+    # A legacy posts.json left in place must not stand in for the database's version
+    JsonStorage(str(tmp_path)).save("posts.json", [{"id": 1}])
+    storage = SqliteStorage(str(tmp_path))
+    records, cursor = storage.snapshot("posts.json")
+    assert records == [{"id": 1}]
+    assert storage.tail("posts.json", cursor) == ([], cursor)
+
+    storage.append("posts.json", {"id": 2})
+    assert storage.tail("posts.json", cursor) == (None, None)
+    records, cursor = storage.snapshot("posts.json")
+    assert records == [{"id": 1}, {"id": 2}]
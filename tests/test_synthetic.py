@@ -0,0 +1,44 @@
+from utils.benchmark import run_benchmark
+from utils.chat_store import ChatStore
+from utils.storage import create_storage
+from utils.synthetic import RATIOS, SyntheticData, write_dataset
+
+
+def test_generation_is_seeded_per_collection():
+    data = SyntheticData(300, seed=7)
+    list(data.tasks())
+    posts = list(data.posts())
+    # The posts for a seed do not depend on what was generated before them
+    assert posts == list(SyntheticData(300, seed=7).posts())
+    assert posts != list(SyntheticData(300, seed=8).posts())
+
+    assert len(posts) == data.count("posts.json") == 300
+    assert [post["id"] for post in posts] == list(range(1, 301))
+    timestamps = [post["timestamp"] for post in posts]
+    assert timestamps == sorted(timestamps)
+
+    assert data.employees[0]["role"] == "CEO" and data.employees[0]["department"] == "Engineering"
+    names = [employee["name"] for employee in data.employees]
+    assert len(set(names)) == len(names)
+
+
+def test_write_dataset_stores_every_collection(tmp_path):
+    counts = write_dataset(str(tmp_path), 200, seed=3, engine="jsonl")
+    assert counts == {"employees.json": 50, **{name: max(1, int(200 * ratio)) for name, ratio in RATIOS.items()}}
+
+    storage = create_storage(str(tmp_path), "jsonl")
+    assert storage.load("posts.json") == list(SyntheticData(200, seed=3).posts())
+    chat = ChatStore(str(tmp_path))
+    assert sum(len(chat.history(room)) for room in chat.rooms()) == counts["chat.json"]
+
+
+def test_benchmark_reports_every_operation(tmp_path):
+    report = run_benchmark([200], seed=3, repeat=1, pages=False, out_dir=str(tmp_path))
+    result = report["scales"]["200"]
+    assert "error" not in result
+    assert result["records"]["posts.json"] == 200
+    assert all(timing["median_ms"] is not None for timing in result["operations"].values())
+
+    markdown = (tmp_path / "benchmark-jsonl.md").read_text(encoding="utf-8")
+    assert "| get_feed_page(member, 20) |" in markdown
+    assert (tmp_path / "benchmark-jsonl.json").exists()
@@ -0,0 +1,65 @@
+import base64
+import json
+import os
+
+from utils import theme
+from utils.theme import CSS_SOURCES, ThemeBundle, minify_css
+
+
+def make_static(tmp_path):
+    for source in CSS_SOURCES:
+        path = tmp_path / source
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(f"/* {source} */\n.{path.stem} a :hover {{\n    color : red ;\n}}\n", encoding="utf-8")
+    return tmp_path
+
+
+def test_minify_keeps_selector_spaces():
+    assert minify_css("/* note */\n.card a :hover {\n  color : red ;\n  margin: 0 auto;\n}\n") == \
+        ".card a :hover{color:red;margin:0 auto}"
+
+
+def test_bundle_merges_sources_in_order_and_rebuilds_on_change(tmp_path):
+    static = make_static(tmp_path)
+    bundle = ThemeBundle(str(static))
+    digest, css = bundle.css()
+    assert css == ".app a :hover{color:red}.login a :hover{color:red}.dashboard a :hover{color:red}"
+    assert bundle.css() == (digest, css)
+
+    (static / "css" / "login.css").write_text(".login{color:blue}", encoding="utf-8")
+    changed, css = bundle.css()
+    assert changed != digest
+    assert ".login{color:blue}" in css
+
+
+def test_fonts_are_embedded_as_data_uris(tmp_path):
+    static = make_static(tmp_path)
+    (static / "fonts").mkdir()
+    (static / "fonts" / "inter-400.woff2").write_bytes(b"wOF2 font")
+
+    _, css = ThemeBundle(str(static)).css()
+    assert css.startswith("@font-face{font-family:'Inter'")
+    assert f"url(data:font/woff2;base64,{base64.b64encode(b'wOF2 font').decode()})" in css
+    assert "fonts/" not in css
+    # Nothing is written next to the sources
+    assert sorted(os.listdir(static)) == ["css", "fonts"]
+
+
+def test_theme_is_injected_inline_once_per_session(tmp_path, monkeypatch):
+    from streamlit.testing.v1 import AppTest
+
+    monkeypatch.setattr(theme, "theme_bundle", ThemeBundle(str(make_static(tmp_path))))
+    sent = []
+    monkeypatch.setattr("streamlit.components.v1.html", lambda html, **kwargs: sent.append(html))
+
+    def page():
+        from utils.theme import inject_theme
+        inject_theme()
+
+    app = AppTest.from_function(page).run()
+    app.run()
+    assert not app.exception
+    assert len(sent) == 1
+    digest, css = theme.theme_bundle.css()
+    assert f"style.textContent = {json.dumps(css)};" in sent[0]
+    assert app.session_state["_theme_digest"] == digest
@@ -0,0 +1,60 @@
+import io
+import os
+import time
+
+import pytest
+
+from utils.attachments import AttachmentStore
+from utils.changes import ChangeBus
+from utils.thumbnails import SIZES, ThumbnailPipeline
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def png_bytes(width, height):
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), (200, 40, 90)).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_images_get_every_rendition_and_publish_their_topic(tmp_path):
+    attachments = AttachmentStore(str(tmp_path))
+    changes = ChangeBus(str(tmp_path))
+    pipeline = ThumbnailPipeline(attachments, workers=1, image_format="webp", changes=changes)
+    attachment = attachments.store(io.BytesIO(png_bytes(2000, 1000)), "chart.png", "image/png")
+
+    assert pipeline.rendition(attachment, "thumb") is None
+    thumb = pipeline.rendition(attachment, "thumb", wait=10, topic="chat.json:HR")
+    assert thumb == pipeline.path(attachment["sha256"], "thumb") and thumb.endswith(".webp")
+    for size, edge in SIZES.items():
+        with Image.open(pipeline.path(attachment["sha256"], size)) as image:
+            assert max(image.size) == edge
+            assert image.size[0] == 2 * image.size[1]
+    assert wait_for(lambda: changes.versions(["chat.json:HR"]) == (1,))
+    assert not pipeline.failed(attachment)
+
+
+def test_undecodable_images_fail_once_and_are_not_retried(tmp_path):
+    attachments = AttachmentStore(str(tmp_path))
+    pipeline = ThumbnailPipeline(attachments, workers=1)
+    attachment = attachments.store(io.BytesIO(b"not really a png"), "broken.png", "image/png")
+
+    assert pipeline.rendition(attachment, "preview", wait=10) is None
+    assert wait_for(lambda: pipeline.failed(attachment))
+    assert pipeline.submit(attachment) is None
+    assert not os.path.exists(pipeline.path(attachment["sha256"], "preview"))
+
+
+def test_other_attachments_are_ignored(tmp_path):
+    attachments = AttachmentStore(str(tmp_path))
+    pipeline = ThumbnailPipeline(attachments, workers=1)
+    attachment = attachments.store(io.BytesIO(b"%PDF-1.4"), "report.pdf", "application/pdf")
+    assert pipeline.submit(attachment) is None
+    assert pipeline.rendition(attachment, "thumb", wait=1) is None
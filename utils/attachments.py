@@ -0,0 +1,127 @@
+# utils/attachments.py - Content-addressed attachment store with reference counts
+import hashlib
+import json
+import os
+import tempfile
+import logging
+from typing import BinaryIO, Dict, Optional
+
+from utils import config
+from utils.metrics import metrics
+from utils.storage import atomic_write, collection_lock, read_json_file
+
+logger = logging.getLogger(__name__)
+
+
+def format_size(size: int) -> str:
+    """Human-readable file size"""
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+class AttachmentStore:
+    """Uploaded files stored once per distinct content, named by SHA-256.
+
+    An upload is copied to a temporary file in fixed-size chunks while it
+    is hashed, so the whole file is never held in memory twice. Under the
+    index lock it is then either moved into ``objects/<ab>/<sha256>`` or,
+    when the same bytes are already stored, dropped; either way the
+    object's reference count goes up by one. ``release`` undoes one
+    reference and deletes the object when none are left.
+    """
+
+    def __init__(self, root: str = config.UPLOAD_DIR, chunk_size: int = config.ATTACHMENT_CHUNK_BYTES):
+        self.root = root
+        self.chunk_size = chunk_size
+        self.index_path = os.path.join(root, "attachments.json")
+
+    def object_path(self, sha256: str) -> str:
+        """Path of the stored bytes for a content hash"""
+        return os.path.join(self.root, "objects", sha256[:2], sha256)
+
+    def store(self, stream: BinaryIO, name: str, content_type: Optional[str] = None) -> Optional[Dict]:
+        """Stream a file into the store and take a reference; returns its metadata, or None on failure"""
+        tmp_path = None
+        try:
+            staging = os.path.join(self.root, "tmp")
+            os.makedirs(staging, exist_ok=True)
+            digest = hashlib.sha256()
+            size = 0
+            fd, tmp_path = tempfile.mkstemp(prefix=".upload.", suffix=".part", dir=staging)
+            with os.fdopen(fd, "wb") as f:
+                for chunk in iter(lambda: stream.read(self.chunk_size), b""):
+                    digest.update(chunk)
+                    f.write(chunk)
+                    size += len(chunk)
+                f.flush()
+                os.fsync(f.fileno())
+            sha256 = digest.hexdigest()
+
+            with collection_lock(self.index_path):
+                index = self._read_index()
+                entry = index.get(sha256)
+                object_path = self.object_path(sha256)
+                if entry is None or not os.path.exists(object_path):
+                    os.makedirs(os.path.dirname(object_path), exist_ok=True)
+                    os.chmod(tmp_path, 0o644)
+                    os.replace(tmp_path, object_path)
+                    entry = {"refs": 0, "size": size, "content_type": content_type}
+                    metrics.add_bytes("attachments", written=size)
+                else:
+                    logger.info(f"Attachment {name} already stored as {sha256[:12]}")
+                index[sha256] = {**entry, "refs": entry["refs"] + 1}
+                self._write_index(index)
+
+            return {"sha256": sha256, "name": os.path.basename(name), "size": size, "content_type": content_type}
+
+        except Exception as e:
+            logger.error(f"Error storing attachment {name}: {e}")
+            return None
+
+        finally:
+            if tmp_path and os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+    def release(self, sha256: str) -> bool:
+        """Drop one reference, deleting the stored bytes with the last one"""
+        try:
+            with collection_lock(self.index_path):
+                index = self._read_index()
+                entry = index.get(sha256)
+                if entry is None:
+                    return False
+                if entry["refs"] > 1:
+                    index[sha256] = {**entry, "refs": entry["refs"] - 1}
+                else:
+                    del index[sha256]
+                    if os.path.exists(self.object_path(sha256)):
+                        os.unlink(self.object_path(sha256))
+                self._write_index(index)
+            return True
+
+        except Exception as e:
+            logger.error(f"Error releasing attachment {sha256}: {e}")
+            return False
+
+    def read(self, sha256: str) -> bytes:
+        """The stored bytes of an attachment"""
+        with open(self.object_path(sha256), "rb") as f:
+            data = f.read()
+        metrics.add_bytes("attachments", read=len(data))
+        return data
+
+    def refs(self, sha256: str) -> int:
+        """Messages currently referencing an attachment"""
+        return self._read_index().get(sha256, {}).get("refs", 0)
+
+    def _read_index(self) -> Dict[str, Dict]:
+        if not os.path.exists(self.index_path):
+            return {}
+        index = read_json_file(self.index_path)
+        return index if isinstance(index, dict) else {}
+
+    def _write_index(self, index: Dict[str, Dict]):
+        """Rewrite the index; the caller holds its lock"""
+        atomic_write(self.index_path, json.dumps(index, indent=4).encode("utf-8"))
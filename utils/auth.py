@@ -1,119 +1,46 @@
 # utils/auth.py - Enhanced authentication with modern UI
 import streamlit as st
 import hashlib
-import json
-import os
 from datetime import datetime, timedelta
+from utils.data import employee_directory
+
+# Roles allowed into the admin dashboard and its tools
+ADMIN_ROLES = ["Admin", "Executive", "Chairman", "CEO", "President", "Vice President", "Group President"]
 
 def hash_password(password: str) -> str:
     """Hash password with salt"""
     salt = "corporate_superapp_salt_2025"
     return hashlib.sha256((password + salt).encode()).hexdigest()
 
-def load_users():
-    """Load users from employees.json with password support"""
-    if os.path.exists("employees.json"):
-        with open("employees.json", "r") as f:
-            employees = json.load(f)
-    else:
-        employees = []
-    
-    # Add default passwords for existing users
-    default_users = [
-        {"id": "EMP001", "name": "Guruprasad", "department": "Engineering", "role": "Executive", "password": "admin123"},
-        {"id": "EMP002", "name": "Meera", "department": "Marketing", "role": "Manager", "password": "user123"},
-        {"id": "EMP003", "name": "Ravi", "department": "HR", "role": "Recruiter", "password": "hr123"}
-    ]
-    
-    # Merge with existing employees
-    for default_user in default_users:
-        existing = next((emp for emp in employees if emp["id"] == default_user["id"]), None)
-        if existing:
-            existing["password"] = default_user["password"]
-        else:
-            employees.append(default_user)
-    
-    return employees
+# Demo accounts; their passwords also apply to directory employees with the same ID
+DEFAULT_USERS = [
+    {"id": "EMP001", "name": "Guruprasad", "department": "Engineering", "role": "Executive", "password": "admin123"},
+    {"id": "EMP002", "name": "Meera", "department": "Marketing", "role": "Manager", "password": "user123"},
+    {"id": "EMP003", "name": "Ravi", "department": "HR", "role": "Recruiter", "password": "hr123"}
+]
+DEFAULT_PASSWORDS = {user["id"].casefold(): user["password"] for user in DEFAULT_USERS}
 
 def authenticate_user(username: str, password: str):
     """Authenticate user with username/password"""
-    users = load_users()
+    # Index lookups by ID or case-folded name instead of scanning every employee
+    directory = employee_directory()
+    candidates = directory.lookup(username)
+    key = username.casefold()
+    # Demo accounts missing from the directory can still log in
+    candidates += [user for user in DEFAULT_USERS
+                   if key in (user["id"].casefold(), user["name"].casefold()) and not directory.get(user["id"])]
     
-    for user in users:
-        if (user["name"].lower() == username.lower() or 
-            user["id"].lower() == username.lower()):
-            # For demo purposes, using simple password check
-            # In production, use hashed passwords
-            if user.get("password") == password:
-                return user
+    for user in candidates:
+        # For demo purposes, using simple password check
+        # In production, use hashed passwords
+        if DEFAULT_PASSWORDS.get(user["id"].casefold(), user.get("password")) == password:
+            return user
     
     return None
 
 def login_user():
     """Enhanced login interface"""
-    # Custom CSS for login page
-    st.markdown("""
-    <style>
-    .login-container {
-        max-width: 400px;
-        margin: 2rem auto;
-        padding: 2rem;
-        background: white;
-        border-radius: 15px;
-        box-shadow: 0 8px 32px rgba(0, 0, 0, 0.1);
-        border: 1px solid #e9ecef;
-    }
-    
-    .login-header {
-        text-align: center;
-        margin-bottom: 2rem;
-    }
-    
-    .login-title {
-        color: #667eea;
-        font-size: 2.5rem;
-        margin: 0;
-    }
-    
-    .login-subtitle {
-        color: #2c3e50;
-        font-size: 1.8rem;
-        margin: 0.5rem 0;
-        font-weight: 600;
-    }
-    
-    .login-description {
-        color: #6c757d;
-        margin: 0;
-    }
-    
-    .demo-credentials {
-        background: linear-gradient(135deg, #f8f9fa 0%, #ffffff 100%);
-        padding: 1rem;
-        border-radius: 10px;
-        border: 1px solid #dee2e6;
-        margin: 1rem 0;
-    }
-    
-    .credential-item {
-        display: flex;
-        justify-content: space-between;
-        margin: 0.5rem 0;
-        font-size: 0.9rem;
-    }
-    
-    .credential-label {
-        font-weight: 600;
-        color: #495057;
-    }
-    
-    .credential-value {
-        color: #667eea;
-        font-family: monospace;
-    }
-    </style>
-    """, unsafe_allow_html=True)
-    
+    # Login styles are part of the theme bundle (static/css/login.css)
     # Main login container
     col1, col2, col3 = st.columns([1, 2, 1])
     
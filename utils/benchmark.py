@@ -0,0 +1,243 @@
+# utils/benchmark.py - Times DataManager operations and page renders on synthetic data
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import logging
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Linked into each scratch workspace so the app runs unchanged against generated data
+APP_FILES = ["app.py", "pages", "utils", "static", ".streamlit"]
+
+DEFAULT_SCALES = [1_000, 10_000, 100_000]
+DEFAULT_OUT_DIR = "benchmark-results"
+
+
+def _timings(func: Callable, repeat: int) -> Dict:
+    """Time a cold call, then `repeat` warm calls"""
+    start = time.perf_counter()
+    result = func()
+    cold = (time.perf_counter() - start) * 1000
+
+    warm = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        warm.append((time.perf_counter() - start) * 1000)
+
+    return {
+        "cold_ms": round(cold, 3),
+        "median_ms": round(statistics.median(warm), 3) if warm else None,
+        "min_ms": round(min(warm), 3) if warm else None,
+        "max_ms": round(max(warm), 3) if warm else None,
+        "records": len(result) if isinstance(result, (list, tuple)) else None,
+    }
+
+
+def benchmark_operations(repeat: int) -> Dict[str, Dict]:
+    """Time each DataManager query as a C-suite admin and as a regular employee.
+
+    Must run in a process whose SUPERAPP_DATA_DIR points at generated data.
+    """
+    from utils.data import data_manager
+
+    employees = data_manager.directory.all()
+    admin = employees[0]
+    member = next(e for e in employees[1:] if not data_manager.is_c_suite(e["role"]))
+
+    operations = {
+        "load_data(posts)": lambda: data_manager.load_data("posts.json"),
+        "load_data(tasks)": lambda: data_manager.load_data("tasks.json"),
+        "get_posts_for_user(member)": lambda: data_manager.get_posts_for_user(
+            member["department"], member["role"], member["name"]),
+        "get_posts_for_user(c_suite)": lambda: data_manager.get_posts_for_user(
+            admin["department"], admin["role"], admin["name"]),
+        "get_feed_page(member, 20)": lambda: data_manager.get_feed_page(
+            member["department"], member["role"], member["name"], 20),
+        "get_department_page(20)": lambda: data_manager.get_department_page(member["department"], 20),
+        "search_posts(common word)": lambda: data_manager.search_posts(
+            "team", member["department"], member["role"], member["name"]),
+        "search_posts(two prefixes)": lambda: data_manager.search_posts(
+            "cust rel", member["department"], member["role"], member["name"]),
+        "get_user_tasks": lambda: data_manager.get_user_tasks(member["name"]),
+        "chat.recent(room, 20)": lambda: data_manager.chat.recent(member["department"], 20),
+        "directory.lookup(name)": lambda: data_manager.directory.lookup(member["name"]),
+        "get_analytics_data": data_manager.get_analytics_data,
+    }
+    results = {}
+    for name, func in operations.items():
+        results[name] = _timings(func, repeat)
+        logger.info(f"{name}: {results[name]['median_ms']} ms")
+    return results
+
+
+def benchmark_pages(repeat: int, timeout: float) -> Dict[str, Dict]:
+    """Render every page headlessly through AppTest, logged in as the generated CEO"""
+    from streamlit.testing.v1 import AppTest
+    from utils.data import data_manager
+
+    admin = data_manager.directory.all()[0]
+    at = AppTest.from_file(os.path.abspath("app.py"), default_timeout=timeout)
+    at.session_state["logged_in"] = True
+    at.session_state["employee"] = admin
+    at.run()
+
+    results = {}
+    for page in at.sidebar.radio[0].options:
+        def render():
+            at.sidebar.radio[0].set_value(page).run()
+            return None
+
+        timing = _timings(render, repeat)
+        timing["errors"] = [str(e.value) for e in at.exception] + [str(e.value) for e in at.error]
+        results[page] = timing
+        logger.info(f"{page}: {timing['cold_ms']} ms cold, {timing['median_ms']} ms warm")
+    return results
+
+
+def link_app(root: str):
+    """Symlink the app's code into a scratch workspace directory"""
+    for name in APP_FILES:
+        source = os.path.join(PROJECT_ROOT, name)
+        if os.path.exists(source):
+            os.symlink(source, os.path.join(root, name))
+
+
+def prepare_workspace(root: str, scale: int, seed: int, engine: str) -> Dict:
+    """Link the app into root and generate its data/ directory"""
+    from utils.synthetic import write_dataset
+
+    link_app(root)
+    data_dir = os.path.join(root, "data")
+
+    start = time.perf_counter()
+    counts = write_dataset(data_dir, scale, seed, engine)
+    return {"records": counts, "generate_s": round(time.perf_counter() - start, 2)}
+
+
+def run_scale(scale: int, seed: int, engine: str, repeat: int, pages: bool, timeout: float) -> Dict:
+    """Benchmark one scale in a fresh interpreter, so caches and indexes start cold"""
+    with tempfile.TemporaryDirectory(prefix=f"superapp-bench-{scale}-") as root:
+        result = prepare_workspace(root, scale, seed, engine)
+        env = dict(os.environ,
+                   SUPERAPP_DATA_DIR=os.path.join(root, "data"),
+                   SUPERAPP_STORAGE=engine,
+                   SUPERAPP_METRICS_INTERVAL="0")
+        command = [sys.executable, "-m", "utils.benchmark", "--worker", "--repeat", str(repeat),
+                   "--timeout", str(timeout)]
+        if not pages:
+            command.append("--no-pages")
+        completed = subprocess.run(command, cwd=root, env=env, capture_output=True, text=True)
+        if completed.returncode != 0:
+            logger.error(f"Benchmark worker for scale {scale} failed:\n{completed.stderr[-4000:]}")
+            result["error"] = completed.stderr.strip().splitlines()[-1:] or ["worker failed"]
+            return result
+        result.update(json.loads(completed.stdout.strip().splitlines()[-1]))
+        return result
+
+
+def render_markdown(report: Dict) -> str:
+    """Median warm times per scale, one table for operations and one for pages"""
+    scales = list(report["scales"])
+    lines = [
+        f"# Benchmark ({report['engine']} engine, seed {report['seed']})",
+        "",
+        f"Generated {report['generated_at']} on Python {report['python']} ({report['platform']}).",
+        f"Times are the median of {report['repeat']} warm runs in milliseconds; cold (first call) in brackets.",
+    ]
+    for section, title in (("operations", "DataManager operations"), ("pages", "Pages")):
+        names = []
+        for scale in scales:
+            for name in report["scales"][scale].get(section, {}):
+                if name not in names:
+                    names.append(name)
+        if not names:
+            continue
+        lines += ["", f"## {title}", "",
+                  "| " + " | ".join([title.split()[-1].capitalize()] + [f"{int(s):,}" for s in scales]) + " |",
+                  "|" + "---|" * (len(scales) + 1)]
+        for name in names:
+            cells = []
+            for scale in scales:
+                timing = report["scales"][scale].get(section, {}).get(name)
+                if timing is None:
+                    cells.append("–")
+                    continue
+                cell = f"{timing['median_ms']:.1f} ({timing['cold_ms']:.1f})"
+                if timing.get("errors"):
+                    cell += " ⚠"
+                cells.append(cell)
+            lines.append(f"| {name} | " + " | ".join(cells) + " |")
+
+    failed = {scale: result["error"] for scale, result in report["scales"].items() if result.get("error")}
+    if failed:
+        lines += ["", "## Failures", ""] + [f"- {scale}: {error}" for scale, error in failed.items()]
+    return "\n".join(lines) + "\n"
+
+
+def run_benchmark(scales: List[int], seed: int = 42, engine: str = "jsonl", repeat: int = 5,
+                  pages: bool = True, timeout: float = 600, out_dir: Optional[str] = DEFAULT_OUT_DIR) -> Dict:
+    """Benchmark every scale and write <out_dir>/benchmark-<engine>.json and .md"""
+    report = {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "engine": engine,
+        "seed": seed,
+        "repeat": repeat,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scales": {},
+    }
+    for scale in scales:
+        logger.info(f"Benchmarking {scale} records on {engine}")
+        report["scales"][str(scale)] = run_scale(scale, seed, engine, repeat, pages, timeout)
+
+    if out_dir:
+        from utils.storage import atomic_write
+
+        os.makedirs(out_dir, exist_ok=True)
+        base = os.path.join(out_dir, f"benchmark-{engine}")
+        atomic_write(base + ".json", json.dumps(report, indent=4, ensure_ascii=False).encode("utf-8"), durable=False)
+        atomic_write(base + ".md", render_markdown(report).encode("utf-8"), durable=False)
+        logger.info(f"Wrote {base}.json and {base}.md")
+    return report
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Benchmark DataManager and pages on synthetic data")
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES,
+                        help="posts per run; other collections scale with it (see utils.synthetic.RATIOS)")
+    parser.add_argument("--engine", default="jsonl", choices=["jsonl", "json", "sqlite"])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=5, help="warm runs per measurement")
+    parser.add_argument("--no-pages", dest="pages", action="store_false", help="skip AppTest page renders")
+    parser.add_argument("--timeout", type=float, default=600, help="seconds allowed per page render")
+    parser.add_argument("--out", default=DEFAULT_OUT_DIR, help="directory for the JSON and Markdown report")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        # Child process: measure against SUPERAPP_DATA_DIR and print one JSON line
+        result = {"operations": benchmark_operations(args.repeat)}
+        if args.pages:
+            result["pages"] = benchmark_pages(args.repeat, args.timeout)
+        print(json.dumps(result))
+        return
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    report = run_benchmark(args.scales, args.seed, args.engine, args.repeat, args.pages, args.timeout, args.out)
+    print(render_markdown(report))
+
+
+if __name__ == "__main__":
+    # python -m utils.benchmark --scales 1000 10000 100000 --engine jsonl
+    main()
@@ -0,0 +1,69 @@
+# utils/cache.py - Process-wide cache of parsed data files
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+def file_stamp(file_path: str) -> Optional[Tuple[int, int, int]]:
+    """Version of a file as (mtime_ns, size, inode), or None if it does not exist"""
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return None
+    # The inode changes when a file is swapped in with os.replace
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+class FileCache:
+    """Parsed file contents keyed by path and file stamp.
+
+    A lookup costs one ``os.stat``: if the stamp still matches, the cached
+    value is returned, otherwise the loader runs again. Writers call
+    ``invalidate`` for the one file they changed so every other cached file
+    stays warm. Cached values are shared between sessions and must be
+    treated as read-only.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[Tuple[int, int, int], Any]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        # Per-path [hits, misses], exported by utils.metrics
+        self.stats: Dict[str, List[int]] = {}
+
+    def get(self, file_path: str, loader: Callable[[str], Any]) -> Any:
+        """Return the cached value for file_path, reloading it if the file changed"""
+        stamp = file_stamp(file_path)
+        entry = self._entries.get(file_path)
+        counts = self.stats.get(file_path)
+        if counts is None:
+            counts = self.stats.setdefault(file_path, [0, 0])
+        if entry is not None and stamp is not None and entry[0] == stamp:
+            self.hits += 1
+            counts[0] += 1
+            return entry[1]
+
+        self.misses += 1
+        counts[1] += 1
+        # The stamp is taken before reading, so a write that lands mid-read
+        # makes the next lookup miss instead of serving the stale value
+        value = loader(file_path)
+        if stamp is not None:
+            with self._lock:
+                self._entries[file_path] = (stamp, value)
+        return value
+
+    def invalidate(self, file_path: str):
+        """Drop one file from the cache"""
+        with self._lock:
+            self._entries.pop(file_path, None)
+
+    def clear(self):
+        """Drop every cached file"""
+        with self._lock:
+            self._entries.clear()
+
+
+# Shared by every session in the process
+file_cache = FileCache()
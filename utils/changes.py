@@ -0,0 +1,85 @@
+# utils/changes.py - Per-collection change notifications shared by every process
+import json
+import os
+import logging
+from typing import Dict, Sequence, Tuple
+
+from utils import config
+from utils.cache import file_cache
+from utils.storage import atomic_write, collection_lock, read_json_file
+
+logger = logging.getLogger(__name__)
+
+
+def chat_topic(room: str) -> str:
+    """Topic bumped by every message sent to a chat room"""
+    return f"chat.json:{room}"
+
+
+class ChangeBus:
+    """One version counter per topic (a collection, or a chat room), kept in a small JSON file.
+
+    Writers call ``publish`` once a change has committed. Readers call
+    ``versions`` with the topics they show and compare the result with what
+    they rendered; while nothing is published that costs one ``os.stat``
+    through the shared file cache, whichever process the writer ran in.
+    The file is derived state: losing it only means one extra refresh.
+    """
+
+    def __init__(self, data_dir: str, file_name: str = "versions.json"):
+        self.path = os.path.join(data_dir, file_name)
+
+    def publish(self, *topics: str):
+        """Bump the version of each topic"""
+        try:
+            with collection_lock(self.path):
+                versions = self._read_file(self.path)
+                for topic in topics:
+                    versions[topic] = versions.get(topic, 0) + 1
+                atomic_write(self.path, json.dumps(versions, indent=4).encode("utf-8"), durable=False)
+                file_cache.invalidate(self.path)
+        except Exception as e:
+            logger.error(f"Error publishing changes to {', '.join(topics)}: {e}")
+
+    def versions(self, topics: Sequence[str]) -> Tuple[int, ...]:
+        """Current version of each topic (0 if it never changed)"""
+        try:
+            current = file_cache.get(self.path, self._read_file)
+        except Exception as e:
+            logger.error(f"Error reading change versions: {e}")
+            current = {}
+        return tuple(current.get(topic, 0) for topic in topics)
+
+    @staticmethod
+    def _read_file(file_path: str) -> Dict[str, int]:
+        if not os.path.exists(file_path):
+            return {}
+        versions = read_json_file(file_path)
+        return versions if isinstance(versions, dict) else {}
+
+
+def watch_changes(key: str, topics: Sequence[str], interval: float = None):
+    """Rerun the page when any of topics changes, checking every `interval` seconds.
+
+    Call it near the top of a page, before the data is read: the versions
+    seen then are what the render shows. A small fragment polls the bus
+    and reruns the whole page only when a version moved.
+    """
+    import streamlit as st
+    from utils.data import data_manager
+
+    interval = config.CHANGE_POLL_SECONDS if interval is None else interval
+    if interval <= 0:
+        return
+    topics = tuple(topics)
+    state_key = f"_changes_{key}"
+    st.session_state[state_key] = data_manager.changes.versions(topics)
+
+    @st.fragment(run_every=interval)
+    def poll_changes():
+        current = data_manager.changes.versions(topics)
+        if current != st.session_state.get(state_key):
+            st.session_state[state_key] = current
+            st.rerun()
+
+    poll_changes()
@@ -0,0 +1,294 @@
+# utils/chat_store.py - Per-room chat segments with an in-memory ring buffer of recent messages
+import json
+import os
+import shutil
+import tempfile
+import threading
+import logging
+from collections import deque
+from datetime import datetime
+from typing import Deque, Dict, List, Optional, Tuple
+from urllib.parse import quote, unquote
+
+from utils import config
+from utils.changes import chat_topic
+from utils.metrics import log_sampled, metrics, timed
+from utils.storage import _fsync_directory, collection_lock
+
+logger = logging.getLogger(__name__)
+
+# The pre-split chat collection (imported once), also the label on chat metrics
+CHAT_COLLECTION = "chat.json"
+
+# Bytes read per step when priming a room buffer from the end of its segment
+TAIL_BLOCK = 64 * 1024
+
+
+class RoomBuffer:
+    """The newest messages of one room and how far into its segment they reach"""
+
+    def __init__(self, size: int):
+        self.messages: Deque[Dict] = deque(maxlen=size)
+        self.last_seq = 0
+        # (inode, offset) of the segment bytes already folded in; None until primed
+        self.cursor: Optional[Tuple[int, int]] = None
+        self.lock = threading.Lock()
+
+
+class ChatStore:
+    """Chat messages stored per room as append-only JSON Lines segments.
+
+    Every message carries a per-room sequence number (``seq``), which is also
+    the cursor ``since`` takes. Sending appends one line to the room's own
+    segment, so it costs the same however long the room's history is, and
+    rooms never contend with each other.
+
+    Each process keeps the newest ``ring_size`` messages of every room it has
+    served in a ring buffer. Before answering, a buffer reads only the bytes
+    appended to its segment since it last looked, which also picks up
+    messages sent by other processes. A room seen for the first time is
+    primed from the end of its segment rather than read whole.
+    """
+
+    def __init__(self, data_dir: str, ring_size: int = config.CHAT_RING_SIZE, legacy=None, changes=None):
+        self.data_dir = data_dir
+        self.directory = os.path.join(data_dir, "chat")
+        self.ring_size = ring_size
+        # Storage engine holding the single pre-split chat collection, imported once
+        self.legacy = legacy
+        # ChangeBus told about every message, so open chats refresh
+        self.changes = changes
+        self._rooms: Dict[str, RoomBuffer] = {}
+        self._rooms_lock = threading.Lock()
+
+    def segment_path(self, room: str) -> str:
+        """Path of the segment backing a room"""
+        return os.path.join(self.directory, quote(room, safe=" ") + ".jsonl")
+
+    def rooms(self) -> List[str]:
+        """Every room with a segment"""
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(unquote(name[:-len(".jsonl")]) for name in os.listdir(self.directory)
+                      if name.endswith(".jsonl"))
+
+    @timed("chat_send", CHAT_COLLECTION)
+    def send(self, room: str, sender: str, message: str, attachment: Optional[Dict] = None,
+             timestamp: Optional[str] = None) -> bool:
+        """Append one message to a room; attachment is the metadata from AttachmentStore.store"""
+        try:
+            self._ensure_directory()
+            buffer = self._buffer(room)
+            path = self.segment_path(room)
+            with buffer.lock, collection_lock(path):
+                # Catch up first so the sequence number follows other processes' sends
+                self._catch_up(room, buffer)
+                record = {
+                    "seq": buffer.last_seq + 1,
+                    "room": room,
+                    "sender": sender,
+                    "message": message,
+                    "timestamp": timestamp or datetime.now().strftime("%Y-%m-%d %H:%M"),
+                    "attachment": attachment,
+                    "replies": [],
+                }
+                payload = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+
+                with open(path, "a+b") as f:
+                    # Never glue a new message onto a torn last line
+                    if f.seek(0, os.SEEK_END):
+                        f.seek(-1, os.SEEK_END)
+                        if f.read(1) != b"\n":
+                            payload = b"\n" + payload
+                    f.write(payload)
+                    f.flush()
+                    os.fsync(f.fileno())
+                    buffer.cursor = (os.fstat(f.fileno()).st_ino, f.tell())
+
+                buffer.messages.append(record)
+                buffer.last_seq = record["seq"]
+            metrics.add_bytes(CHAT_COLLECTION, written=len(payload))
+            if self.changes is not None:
+                self.changes.publish(chat_topic(room))
+            return True
+
+        except Exception as e:
+            logger.error(f"Error sending chat message to {room}: {e}")
+            return False
+
+    @timed("chat_recent", CHAT_COLLECTION)
+    def recent(self, room: str, limit: Optional[int] = None) -> List[Dict]:
+        """The newest messages of a room (at most ring_size), oldest first"""
+        try:
+            self._ensure_directory()
+            buffer = self._buffer(room)
+            with buffer.lock:
+                self._catch_up(room, buffer)
+                messages = list(buffer.messages)
+            return messages[-limit:] if limit else messages
+        except Exception as e:
+            logger.error(f"Error loading chat for {room}: {e}")
+            return []
+
+    @timed("chat_since", CHAT_COLLECTION)
+    def since(self, room: str, cursor: int, limit: Optional[int] = None) -> Tuple[List[Dict], int]:
+        """Messages after cursor (a seq), oldest first, plus the cursor to pass next time.
+
+        Served from the ring buffer; only a cursor older than the buffer
+        reads the room's segment. A cursor ahead of the room (its segment
+        was replaced) starts over from the beginning.
+        """
+        try:
+            self._ensure_directory()
+            buffer = self._buffer(room)
+            with buffer.lock:
+                self._catch_up(room, buffer)
+                last_seq = buffer.last_seq
+                messages = list(buffer.messages)
+            if cursor > last_seq:
+                cursor = 0
+            if messages and messages[0]["seq"] > cursor + 1:
+                # The cursor is older than the buffer reaches
+                messages = self.history(room)
+            messages = [message for message in messages if message["seq"] > cursor]
+            if limit is not None:
+                messages = messages[:limit]
+            return messages, messages[-1]["seq"] if messages else cursor
+        except Exception as e:
+            logger.error(f"Error loading chat for {room} since {cursor}: {e}")
+            return [], cursor
+
+    def history(self, room: str) -> List[Dict]:
+        """Every message of a room, read from its segment"""
+        path = self.segment_path(room)
+        if not os.path.exists(path):
+            return []
+        with open(path, "rb") as f:
+            chunk = f.read()
+        metrics.add_bytes(CHAT_COLLECTION, read=len(chunk))
+        return list(self._parse(chunk, room))
+
+    def import_messages(self, messages: List[Dict]):
+        """Replace every room with these messages, split by room in their current order"""
+        with collection_lock(self.directory):
+            self._write_rooms(messages)
+
+    def _ensure_directory(self):
+        """Create the chat directory, importing the single legacy collection if there is one"""
+        if os.path.isdir(self.directory):
+            return
+        with collection_lock(self.directory):
+            if os.path.isdir(self.directory):
+                return
+            messages = self.legacy.load(CHAT_COLLECTION) if self.legacy is not None else []
+            self._write_rooms(messages)
+            logger.info(f"Imported {len(messages)} chat messages into per-room segments")
+
+    def _write_rooms(self, messages: List[Dict]):
+        """Build every segment in a scratch directory and swap it in; the caller holds the lock"""
+        os.makedirs(self.data_dir, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix=".chat.", dir=self.data_dir)
+        try:
+            segments: Dict[str, List[bytes]] = {}
+            for message in messages:
+                room = str(message.get("room") or "General")
+                lines = segments.setdefault(room, [])
+                record = {**message, "seq": len(lines) + 1, "room": room}
+                lines.append((json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8"))
+            for room, lines in segments.items():
+                with open(os.path.join(staging, os.path.basename(self.segment_path(room))), "wb") as f:
+                    f.write(b"".join(lines))
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.chmod(staging, 0o755)
+
+            previous = None
+            if os.path.isdir(self.directory):
+                previous = f"{staging}.old"
+                os.rename(self.directory, previous)
+            os.rename(staging, self.directory)
+            _fsync_directory(self.data_dir)
+            if previous:
+                shutil.rmtree(previous, ignore_errors=True)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        with self._rooms_lock:
+            self._rooms.clear()
+
+    def _buffer(self, room: str) -> RoomBuffer:
+        buffer = self._rooms.get(room)
+        if buffer is None:
+            with self._rooms_lock:
+                buffer = self._rooms.setdefault(room, RoomBuffer(self.ring_size))
+        return buffer
+
+    def _catch_up(self, room: str, buffer: RoomBuffer):
+        """Fold in whatever was appended to the room's segment; the caller holds buffer.lock"""
+        try:
+            stat = os.stat(self.segment_path(room))
+        except FileNotFoundError:
+            if buffer.cursor is not None:
+                buffer.messages.clear()
+                buffer.last_seq = 0
+                buffer.cursor = None
+            return
+
+        if buffer.cursor is None or buffer.cursor[0] != stat.st_ino or stat.st_size < buffer.cursor[1]:
+            self._prime(room, buffer)
+            return
+        inode, offset = buffer.cursor
+        if stat.st_size == offset:
+            return
+
+        with open(self.segment_path(room), "rb") as f:
+            if os.fstat(f.fileno()).st_ino != inode:
+                self._prime(room, buffer)
+                return
+            f.seek(offset)
+            chunk = f.read()
+        metrics.add_bytes(CHAT_COLLECTION, read=len(chunk))
+
+        # Leave an unfinished last line for the next call
+        end = chunk.rfind(b"\n") + 1
+        for message in self._parse(chunk[:end], room):
+            buffer.messages.append(message)
+            buffer.last_seq = max(buffer.last_seq, message.get("seq", 0))
+        buffer.cursor = (inode, offset + end)
+
+    def _prime(self, room: str, buffer: RoomBuffer):
+        """Fill a buffer from the last ring_size messages of the segment, reading backwards"""
+        with open(self.segment_path(room), "rb") as f:
+            inode = os.fstat(f.fileno()).st_ino
+            size = f.seek(0, os.SEEK_END)
+            start, chunk = size, b""
+            while start > 0 and chunk.count(b"\n") <= self.ring_size:
+                step = min(TAIL_BLOCK, start)
+                start -= step
+                f.seek(start)
+                chunk = f.read(step) + chunk
+        metrics.add_bytes(CHAT_COLLECTION, read=len(chunk))
+
+        end = chunk.rfind(b"\n") + 1
+        # Unless the read reached the start of the file, its first line is partial
+        begin = chunk.find(b"\n") + 1 if start > 0 else 0
+        messages = list(self._parse(chunk[begin:end], room))
+
+        buffer.messages.clear()
+        buffer.messages.extend(messages[-self.ring_size:])
+        buffer.last_seq = max((message.get("seq", 0) for message in messages), default=0)
+        buffer.cursor = (inode, start + end)
+        log_sampled(logger, f"Primed chat buffer for {room} with {len(buffer.messages)} messages")
+
+    def _parse(self, chunk: bytes, room: str):
+        """Decode complete segment lines, skipping any that cannot be parsed"""
+        for line in chunk.split(b"\n"):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                # A crash mid-append leaves a torn line; everything around it is intact
+                logger.warning(f"Skipping unreadable chat line in room {room}")
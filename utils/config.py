@@ -0,0 +1,58 @@
+# utils/config.py - Runtime settings read from the environment
+import os
+
+# Directory holding every data collection
+DATA_DIR = os.environ.get("SUPERAPP_DATA_DIR", "data")
+
+# Storage engine behind DataManager: "jsonl" (append-only log), "sqlite" (indexed database)
+# or "json" (legacy whole-file arrays)
+STORAGE_ENGINE = os.environ.get("SUPERAPP_STORAGE", "jsonl").strip().lower()
+
+# Update entries a JSONL log may accumulate before it is compacted into a fresh segment
+JSONL_COMPACT_THRESHOLD = int(os.environ.get("SUPERAPP_JSONL_COMPACT_THRESHOLD", "500"))
+
+# Window (milliseconds) concurrent inserts are given to join one commit (a lone insert commits at once); 0 disables batching
+GROUP_COMMIT_WINDOW_MS = float(os.environ.get("SUPERAPP_GROUP_COMMIT_MS", "5"))
+
+# Ids each process reserves from a collection's sequence at a time (one durable write per block)
+SEQUENCE_BLOCK_SIZE = int(os.environ.get("SUPERAPP_SEQUENCE_BLOCK", "100"))
+
+# Database file (inside DATA_DIR) used by the sqlite engine
+SQLITE_DB = os.environ.get("SUPERAPP_SQLITE_DB", "superapp.db")
+
+# Posts shown per page on the Home and department feeds before "Load more"
+FEED_PAGE_SIZE = int(os.environ.get("SUPERAPP_FEED_PAGE_SIZE", "20"))
+
+# Compile every page when the server starts instead of on first visit
+PRELOAD_PAGES = os.environ.get("SUPERAPP_PRELOAD_PAGES", "0").strip().lower() in ("1", "true", "yes")
+
+# Prometheus text file the data operation metrics are exported to; empty disables the export
+METRICS_FILE = os.environ.get("SUPERAPP_METRICS_FILE", os.path.join(DATA_DIR, "metrics.prom"))
+
+# Seconds between metrics exports; 0 disables the export thread
+METRICS_EXPORT_INTERVAL = float(os.environ.get("SUPERAPP_METRICS_INTERVAL", "15"))
+
+# Hot-path debug logs (record loads and saves) are emitted for one call in this many
+LOG_SAMPLE_RATE = int(os.environ.get("SUPERAPP_LOG_SAMPLE_RATE", "100"))
+
+# Memory (MB of serialized JSON) the Dashboard's Plotly figure cache may hold; 0 disables it
+FIGURE_CACHE_MB = float(os.environ.get("SUPERAPP_FIGURE_CACHE_MB", "16"))
+
+# Newest messages per chat room each process keeps in memory
+CHAT_RING_SIZE = int(os.environ.get("SUPERAPP_CHAT_RING_SIZE", "200"))
+
+# Seconds between an open page's checks for changes to the data it shows; 0 disables live refresh
+CHANGE_POLL_SECONDS = float(os.environ.get("SUPERAPP_CHANGE_POLL_SECONDS", "5"))
+
+# Directory holding chat attachments, stored once per distinct content
+UPLOAD_DIR = os.environ.get("SUPERAPP_UPLOAD_DIR", "uploads")
+
+# Chunk size (bytes) uploads are streamed to disk and hashed in
+ATTACHMENT_CHUNK_BYTES = int(os.environ.get("SUPERAPP_ATTACHMENT_CHUNK_BYTES", str(1024 * 1024)))
+
+# Worker threads rendering image attachment thumbnails and previews
+THUMBNAIL_WORKERS = int(os.environ.get("SUPERAPP_THUMBNAIL_WORKERS", "2"))
+
+# Format ("webp" or "jpeg") and quality (1-100) of rendered thumbnails and previews
+THUMBNAIL_FORMAT = os.environ.get("SUPERAPP_THUMBNAIL_FORMAT", "webp").strip().lower()
+THUMBNAIL_QUALITY = int(os.environ.get("SUPERAPP_THUMBNAIL_QUALITY", "80"))
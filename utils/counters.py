@@ -0,0 +1,122 @@
+# utils/counters.py - Materialized analytics counters kept next to the data
+import json
+import os
+import logging
+from typing import Dict, List, Optional
+
+from utils.cache import file_cache
+from utils.storage import atomic_write, collection_lock, read_json_file
+
+logger = logging.getLogger(__name__)
+
+# Collections with counters and the field each one is grouped by (None: count only)
+COUNTED_FIELDS = {
+    "posts.json": "department",
+    "tasks.json": "status",
+    "feedback.json": "route_to",
+    "scheduled_meetings.json": None,
+}
+
+
+class CounterStore:
+    """Per-collection record counts and group-by counts, updated on every write.
+
+    Each collection's counters carry the storage version (file stamp) they
+    were last brought up to. A read whose version no longer matches, because
+    something wrote the collection without going through DataManager or a
+    counter update was lost, recounts that one collection from scratch.
+    Counters are derived data, so the file is written without fsync.
+    """
+
+    def __init__(self, data_dir: str, storage, file_name: str = "analytics.json"):
+        self.path = os.path.join(data_dir, file_name)
+        self.storage = storage
+
+    def record_insert(self, collection: str, records: List[Dict]):
+        """Count newly inserted records"""
+        if collection not in COUNTED_FIELDS:
+            return
+        field = COUNTED_FIELDS[collection]
+        with collection_lock(self.path):
+            counters = self._read()
+            entry = counters.get(collection)
+            if entry is None:
+                # Never counted yet: the first read will rebuild it
+                return
+            entry["count"] += len(records)
+            if field:
+                for record in records:
+                    value = str(record.get(field, "Unknown"))
+                    entry["by"][value] = entry["by"].get(value, 0) + 1
+            self._write(counters, collection)
+
+    def record_update(self, collection: str, record: Dict, changes: Dict):
+        """Move a record between groups when its grouped field changes"""
+        if collection not in COUNTED_FIELDS:
+            return
+        field = COUNTED_FIELDS[collection]
+        with collection_lock(self.path):
+            counters = self._read()
+            entry = counters.get(collection)
+            if entry is None:
+                return
+            if field and field in changes:
+                old = str(record.get(field, "Unknown"))
+                new = str(changes[field])
+                if old != new:
+                    entry["by"][old] = entry["by"].get(old, 0) - 1
+                    if entry["by"][old] <= 0:
+                        del entry["by"][old]
+                    entry["by"][new] = entry["by"].get(new, 0) + 1
+            self._write(counters, collection)
+
+    def summary(self, collection: str) -> Dict:
+        """{"count": n, "by": {value: n}} for a collection, rebuilt only on drift"""
+        entry = self._read().get(collection)
+        if entry is not None and entry.get("version") == self._version(collection):
+            return entry
+        return self.rebuild(collection)
+
+    def rebuild(self, collection: str) -> Dict:
+        """Recount one collection from its records"""
+        field = COUNTED_FIELDS.get(collection)
+        with collection_lock(self.path):
+            # The version is taken first, so a write landing mid-count shows up as drift next time
+            version = self._version(collection)
+            records = self.storage.load(collection)
+            if version is None:
+                # Loading may have created the backing file (e.g. a legacy import)
+                version = self._version(collection)
+            by: Dict[str, int] = {}
+            if field:
+                for record in records:
+                    value = str(record.get(field, "Unknown"))
+                    by[value] = by.get(value, 0) + 1
+
+            counters = self._read()
+            counters[collection] = {"count": len(records), "by": by, "version": version}
+            self._write(counters)
+
+        logger.info(f"Rebuilt analytics counters for {collection}")
+        return counters[collection]
+
+    def _version(self, collection: str) -> Optional[list]:
+        stamp = self.storage.version(collection)
+        return list(stamp) if stamp is not None else None
+
+    def _read(self) -> Dict[str, Dict]:
+        try:
+            # Copied so callers can modify it; cached entries are shared
+            return json.loads(json.dumps(file_cache.get(self.path, read_json_file)))
+        except FileNotFoundError:
+            return {}
+        except (ValueError, OSError) as e:
+            logger.warning(f"Discarding unreadable analytics counters: {e}")
+            return {}
+
+    def _write(self, counters: Dict[str, Dict], collection: str = None):
+        """Persist counters; with collection given, mark it current with its storage"""
+        if collection is not None:
+            counters[collection]["version"] = self._version(collection)
+        atomic_write(self.path, json.dumps(counters, indent=4).encode("utf-8"), durable=False)
+        file_cache.invalidate(self.path)
@@ -0,0 +1,175 @@
+# utils/dashboard_analytics.py - Dashboard KPIs and breakdowns from columnar, vectorized passes
+import threading
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# numpy and pandas are imported inside the functions that use them, so
+# importing this module does not load them
+
+logger = logging.getLogger(__name__)
+
+# Collections the Dashboard analytics are computed from
+ANALYTICS_FILES = ("tasks.json", "posts.json", "feedback.json")
+
+
+def _factorize(values: Sequence) -> Tuple["np.ndarray", List]:
+    """Integer codes plus labels in order of first appearance (as a counting dict would list them)"""
+    import pandas as pd
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object), sort=False, use_na_sentinel=False)
+    return codes, list(uniques)
+
+
+def _counts(codes: "np.ndarray", labels: List) -> Dict:
+    import numpy as np
+    return dict(zip(labels, np.bincount(codes, minlength=len(labels)).tolist()))
+
+
+def _sort_keys(values: Sequence) -> "np.ndarray":
+    """Sort keys as a fixed-width string array (fast to partition).
+
+    A null key sorts as "" (like a missing one) and any other value as its
+    string, so a stray record never turns the array into objects that
+    cannot be compared.
+    """
+    import numpy as np
+    return np.array(["" if value is None else str(value) for value in values], dtype=str)
+
+
+def top_indices(keys: "np.ndarray", n: int) -> "np.ndarray":
+    """Indices of the n largest keys, largest first, without sorting the rest.
+
+    argpartition finds the n-th largest key in linear time; only the n
+    candidates are sorted. Equal keys keep their original order, as a
+    stable ``sorted(..., reverse=True)`` would, including keys tied with
+    the n-th largest: the earliest of those are taken.
+    """
+    import numpy as np
+    if n <= 0 or not len(keys):
+        return np.empty(0, dtype=np.intp)
+    if n < len(keys):
+        threshold = keys[np.argpartition(keys, len(keys) - n)[len(keys) - n]]
+        above = np.flatnonzero(keys > threshold)
+        tied = np.flatnonzero(keys == threshold)[:n - len(above)]
+        candidates = np.concatenate((above, tied))
+    else:
+        candidates = np.arange(len(keys))
+    # Ascending by (key, -index), then reversed: key descending, index ascending
+    order = np.lexsort((-candidates, keys[candidates]))[::-1]
+    return candidates[order]
+
+
+class DashboardAnalytics:
+    """Every number the Dashboard shows, for one version of the data.
+
+    Each collection is read once into typed columns: categorical codes for
+    status, department, route and assignee, and string arrays for the sort
+    keys. Every count and groupby is then a ``bincount`` over those codes,
+    and "latest N" lists come from a partial selection.
+    """
+
+    def __init__(self, tasks: List[Dict], posts: List[Dict], feedback: List[Dict], version: tuple = ()):
+        self.tasks = tasks
+        self.posts = posts
+        self.feedback = feedback
+        # Storage versions of the collections this was built from; keys derived caches
+        self.version = version
+        self._build_tasks()
+        self._build_feedback()
+        self.post_keys = _sort_keys([post.get("timestamp", "") for post in posts])
+
+    def _build_tasks(self):
+        import numpy as np
+        import pandas as pd
+
+        # One list per column; building tuples per record and transposing is slower
+        tasks = self.tasks
+        status = [task.get("status", "Unknown") for task in tasks]
+        department = [task.get("department", "Unknown") for task in tasks]
+        assignee = [task.get("assigned_to") or None for task in tasks]
+        created = [task.get("created_at", task.get("timestamp", "")) for task in tasks]
+
+        status_codes, status_labels = _factorize(status)
+        dept_codes, dept_labels = _factorize(department)
+        self.task_status_counts = _counts(status_codes, status_labels)
+        self.tasks_by_department = _counts(dept_codes, dept_labels)
+
+        # Department x status in one bincount over the combined code
+        grid = np.bincount(dept_codes * len(status_labels) + status_codes,
+                           minlength=len(dept_labels) * len(status_labels))
+        grid = grid.reshape(len(dept_labels), len(status_labels))
+        empty = np.zeros(len(dept_labels), dtype=np.int64)
+        completed = grid[:, status_labels.index("Completed")] if "Completed" in status_labels else empty
+        pending = grid[:, status_labels.index("Pending")] if "Pending" in status_labels else empty
+        self.department_stats = [
+            {"department": dept, "total": int(total), "completed": int(done), "pending": int(waiting)}
+            for dept, total, done, waiting in zip(dept_labels, grid.sum(axis=1), completed, pending)
+        ]
+
+        self.active_employees = int(pd.Series(assignee, dtype=object).nunique(dropna=True))
+        self.task_keys = _sort_keys(created)
+
+    def _build_feedback(self):
+        import numpy as np
+
+        feedback = self.feedback
+        route = [fb.get("route_to", "Unknown") for fb in feedback]
+        status = [fb.get("status", "unread") for fb in feedback]
+        has_status = ["status" in fb for fb in feedback]
+
+        route_codes, route_labels = _factorize(route)
+        status_codes, status_labels = _factorize(status)
+        self.feedback_by_route = _counts(route_codes, route_labels)
+        self.feedback_by_status = _counts(status_codes, status_labels)
+
+        # The KPI counts only feedback explicitly marked unread; the chart treats a missing status as unread
+        explicit = np.array(has_status, dtype=bool)
+        self.unread_feedback = int(np.count_nonzero((np.array(status, dtype=object) == "unread") & explicit))
+
+    @property
+    def kpis(self) -> Dict:
+        """Headline metrics, shared by the KPI cards and the analytics export"""
+        total_tasks = len(self.tasks)
+        completed_tasks = self.task_status_counts.get("Completed", 0)
+        return {
+            "total_tasks": total_tasks,
+            "completed_tasks": completed_tasks,
+            "pending_tasks": self.task_status_counts.get("Pending", 0),
+            "completion_rate": (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0,
+            "total_posts": len(self.posts),
+            "unread_feedback": self.unread_feedback,
+            "active_employees": self.active_employees,
+        }
+
+    def recent_posts(self, n: int = 10) -> List[Dict]:
+        """Newest n posts by timestamp"""
+        return [self.posts[i] for i in top_indices(self.post_keys, n)]
+
+    def recent_tasks(self, n: int = 10) -> List[Dict]:
+        """Newest n tasks by creation time"""
+        return [self.tasks[i] for i in top_indices(self.task_keys, n)]
+
+
+_built: Optional[Tuple[tuple, DashboardAnalytics]] = None
+_lock = threading.Lock()
+
+
+def dashboard_analytics(manager=None) -> DashboardAnalytics:
+    """Analytics for the current data, rebuilt only when a collection's version changes"""
+    global _built
+    if manager is None:
+        from utils.data import data_manager as manager
+
+    # Versions are read before the data, so a write landing mid-build forces a rebuild next time
+    versions = tuple(manager.storage.version(file_name) for file_name in ANALYTICS_FILES)
+    built = _built
+    if built is not None and built[0] == versions:
+        return built[1]
+
+    with _lock:
+        if _built is not None and _built[0] == versions:
+            return _built[1]
+        tasks, posts, feedback = (manager.load_data(file_name) for file_name in ANALYTICS_FILES)
+        analytics = DashboardAnalytics(tasks, posts, feedback, versions)
+        _built = (versions, analytics)
+        logger.info(f"Built dashboard analytics over {len(tasks)} tasks, {len(posts)} posts, {len(feedback)} feedback")
+        return analytics
@@ -1,11 +1,23 @@
 # utils/data.py - Fixed caching issue
-import json
 import os
-import streamlit as st
+import threading
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import BinaryIO, List, Dict, Optional, Tuple
 import logging
 
+from utils import config
+from utils.attachments import AttachmentStore
+from utils.changes import ChangeBus, chat_topic
+from utils.chat_store import ChatStore
+from utils.counters import CounterStore
+from utils.directory import EmployeeDirectory
+from utils.feed_index import FeedCursor, FeedIndex, feed_key
+from utils.group_commit import GroupCommitter
+from utils.metrics import timed
+from utils.sequences import SequenceStore
+from utils.storage import create_storage
+from utils.thumbnails import ThumbnailPipeline
+
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -14,8 +26,27 @@ class DataManager:
     """Enhanced data manager with fixed caching"""
     
     def __init__(self):
-        self.data_dir = "data"
+        self.data_dir = config.DATA_DIR
         self.ensure_data_directory()
+        self.storage = create_storage(self.data_dir)
+        self.sequences = SequenceStore(self.data_dir, seed=self._max_id)
+        self.committer = None
+        if config.GROUP_COMMIT_WINDOW_MS > 0:
+            self.committer = GroupCommitter(self.storage, config.GROUP_COMMIT_WINDOW_MS,
+                                            sequences=self.sequences, on_commit=self._inserted)
+        self.counters = CounterStore(self.data_dir, self.storage)
+        # Every committed write is published here so open pages know to refresh
+        self.changes = ChangeBus(self.data_dir)
+        # Chat is kept per room outside the storage engine
+        self.chat = ChatStore(self.data_dir, legacy=self.storage, changes=self.changes)
+        self.attachments = AttachmentStore()
+        # Indexed once per version of employees.json, shared by login and the pickers
+        self.directory = EmployeeDirectory(os.path.join(self.data_dir, "employees.json"))
+        self.thumbnails = ThumbnailPipeline(self.attachments, changes=self.changes)
+        self._feed_index = None
+        # Held while the index is refreshed and while it is queried: add() mutates the
+        # buckets and postings that a query of another session would be iterating
+        self._feed_lock = threading.RLock()
         
     def ensure_data_directory(self):
         """Ensure data directory exists"""
@@ -23,79 +54,63 @@ class DataManager:
             os.makedirs(self.data_dir)
             logger.info(f"Created data directory: {self.data_dir}")
 
+    @timed("load_data")
     def load_data(self, file_name: str) -> List[Dict]:
-        """Load data with error handling (no caching to avoid hash issues)"""
-        file_path = os.path.join(self.data_dir, file_name)
-        
-        try:
-            if not os.path.exists(file_path):
-                logger.info(f"File {file_name} not found, creating empty file")
-                with open(file_path, "w", encoding="utf-8") as f:
-                    json.dump([], f)
-                return []
-            
-            with open(file_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                logger.info(f"Loaded {len(data)} records from {file_name}")
-                return data
-                
-        except json.JSONDecodeError as e:
-            logger.error(f"JSON decode error in {file_name}: {e}")
-            # Backup corrupted file
-            backup_path = f"{file_path}.backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            try:
-                os.rename(file_path, backup_path)
-                logger.info(f"Corrupted file backed up to {backup_path}")
-            except:
-                pass
-            return []
-            
-        except Exception as e:
-            logger.error(f"Error loading {file_name}: {e}")
-            return []
+        """Load a collection from the storage engine (records are shared, treat them as read-only)"""
+        return self.storage.load(file_name)
 
+    @timed("save_data")
     def save_data(self, file_name: str, data: List[Dict]) -> bool:
-        """Save data with error handling and backup"""
-        file_path = os.path.join(self.data_dir, file_name)
-        
+        """Replace a whole collection"""
+        saved = self.storage.save(file_name, data)
+        if saved:
+            self.changes.publish(file_name)
+        return saved
+
+    def append_record(self, file_name: str, record: Dict) -> bool:
+        """Append a single record, assigning an id if it has none.
+
+        With group commit enabled the record is batched with concurrent
+        inserts (ids, counters and change notices are then handled once per
+        batch); this still returns only after the batch is durable.
+        """
         try:
-            # Create backup of existing file
-            if os.path.exists(file_path):
-                backup_path = f"{file_path}.bak"
-                try:
-                    with open(file_path, "r") as src, open(backup_path, "w") as dst:
-                        dst.write(src.read())
-                except:
-                    pass  # Continue even if backup fails
-            
-            # Save new data
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=4, ensure_ascii=False)
-            
-            logger.info(f"Saved {len(data)} records to {file_name}")
-            return True
-            
+            if self.committer is not None:
+                return self.committer.append(file_name, record)
+            if "id" not in record:
+                record = {"id": self.sequences.next_id(file_name), **record}
+            saved = self.storage.append(file_name, record)
+            if saved:
+                self._inserted({file_name: [record]})
+            return saved
+
         except Exception as e:
-            logger.error(f"Error saving {file_name}: {e}")
-            # Restore from backup if save failed
-            backup_path = f"{file_path}.bak"
-            if os.path.exists(backup_path):
-                try:
-                    os.rename(backup_path, file_path)
-                    logger.info("Restored from backup after save failure")
-                except:
-                    pass
+            # Includes a batch that did not commit within the group commit timeout
+            logger.error(f"Error appending to {file_name}: {e}")
             return False
 
+    def _inserted(self, committed: Dict[str, List[Dict]]):
+        """Count committed inserts and notify open pages, once per commit"""
+        if self.counters is not None:
+            for file_name, records in committed.items():
+                self.counters.record_insert(file_name, records)
+        self.changes.publish(*committed)
+
+    def reserve_ids(self, file_name: str, count: int) -> range:
+        """Reserve a block of ids for a bulk insert"""
+        return self.sequences.reserve(file_name, count)
+
+    def _max_id(self, file_name: str) -> int:
+        """Highest integer id in a collection (seeds its sequence once)"""
+        ids = [record["id"] for record in self.load_data(file_name) if isinstance(record.get("id"), int)]
+        return max(ids, default=0)
+
     def add_post(self, title: str, content: str, author: str, department: str, 
                  tags: List[str] = None, is_anonymous: bool = False, 
                  is_vip: bool = False, vip_recipients: List[str] = None) -> bool:
         """Add new post with enhanced features"""
         try:
-            posts = self.load_data("posts.json")
-            
             new_post = {
-                "id": len(posts) + 1,
                 "title": title.strip(),
                 "content": content.strip(),
                 "author": author,
@@ -111,9 +126,7 @@ class DataManager:
                 "views": 0
             }
             
-            posts.append(new_post)
-            
-            if self.save_data("posts.json", posts):
+            if self.append_record("posts.json", new_post):
                 logger.info(f"Added new post: {title} by {author}")
                 return True
             else:
@@ -123,42 +136,82 @@ class DataManager:
             logger.error(f"Error adding post: {e}")
             return False
 
-    def get_posts_for_user(self, user_department: str, user_role: str, user_name: str) -> List[Dict]:
-        """Get posts visible to user with enhanced filtering"""
+    def feed_index(self) -> FeedIndex:
+        """The posts visibility index, brought up to date with posts.json.
+
+        New log entries are folded in one post at a time; an update, a
+        rewrite of the collection, or an engine without a readable log
+        rebuilds the index from a fresh snapshot. Query the returned index
+        while holding ``_feed_lock``.
+        """
+        with self._feed_lock:
+            index = self._feed_index
+            entries, cursor = (None, None) if index is None else self.storage.tail("posts.json", index.cursor)
+
+            if entries is not None and all(entry.get("op") == "insert" for entry in entries):
+                for entry in entries:
+                    index.add(entry["record"])
+                index.cursor = cursor
+                return index
+
+            posts, cursor = self.storage.snapshot("posts.json")
+            self._feed_index = FeedIndex(posts, cursor)
+            logger.info(f"Built feed index over {len(posts)} posts")
+            return self._feed_index
+
+    @timed("get_posts_for_user", "posts.json")
+    def get_posts_for_user(self, user_department: str, user_role: str, user_name: str,
+                           limit: Optional[int] = None, cursor: Optional[FeedCursor] = None,
+                           vip: Optional[bool] = None) -> List[Dict]:
+        """Get posts visible to user, newest first, optionally one page after cursor"""
         try:
-            posts = self.load_data("posts.json")
-            visible_posts = []
-            
-            for post in posts:
-                # Check visibility rules
-                if post.get("is_vip", False):
-                    if (self.is_c_suite(user_role) or 
-                        user_name in post.get("vip_recipients", []) or 
-                        post["author"] == user_name):
-                        visible_posts.append(post)
-                elif post["department"] == "All":
-                    visible_posts.append(post)
-                elif post["department"] == user_department:
-                    visible_posts.append(post)
-            
-            # Sort by timestamp (newest first)
-            visible_posts.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
-            
-            return visible_posts
+            with self._feed_lock:
+                return self.feed_index().visible(user_department, self.is_c_suite(user_role), user_name,
+                                                 vip=vip, cursor=cursor, limit=limit)
             
         except Exception as e:
             logger.error(f"Error getting posts for user: {e}")
             return []
 
+    def get_feed_page(self, user_department: str, user_role: str, user_name: str, limit: int,
+                      cursor: Optional[FeedCursor] = None,
+                      vip: Optional[bool] = None) -> Tuple[List[Dict], Optional[FeedCursor]]:
+        """One page of the user's feed plus the cursor of the next page (None on the last page)"""
+        posts = self.get_posts_for_user(user_department, user_role, user_name,
+                                        limit=limit + 1, cursor=cursor, vip=vip)
+        return self._split_page(posts, limit)
+
+    def get_department_posts(self, department: str, limit: Optional[int] = None,
+                             cursor: Optional[FeedCursor] = None) -> List[Dict]:
+        """Get every post addressed to a department, VIP ones included, newest first"""
+        try:
+            with self._feed_lock:
+                return self.feed_index().department(department, cursor=cursor, limit=limit)
+            
+        except Exception as e:
+            logger.error(f"Error getting posts for {department}: {e}")
+            return []
+
+    def get_department_page(self, department: str, limit: int,
+                            cursor: Optional[FeedCursor] = None) -> Tuple[List[Dict], Optional[FeedCursor]]:
+        """One page of a department feed plus the cursor of the next page"""
+        posts = self.get_department_posts(department, limit=limit + 1, cursor=cursor)
+        return self._split_page(posts, limit)
+
+    @staticmethod
+    def _split_page(posts: List[Dict], limit: int) -> Tuple[List[Dict], Optional[FeedCursor]]:
+        """Cut a limit + 1 fetch into the page and, if there is more, the next cursor"""
+        if len(posts) <= limit:
+            return posts, None
+        page = posts[:limit]
+        return page, feed_key(page[-1])
+
     def add_task(self, title: str, description: str, assigned_to: str, 
                  assigned_by: str, department: str, deadline: str = None,
                  priority: str = "Medium") -> bool:
         """Add new task with enhanced features"""
         try:
-            tasks = self.load_data("tasks.json")
-            
             new_task = {
-                "id": len(tasks) + 1,
                 "title": title.strip(),
                 "description": description.strip(),
                 "assigned_to": assigned_to,
@@ -172,9 +225,7 @@ class DataManager:
                 "comments": []
             }
             
-            tasks.append(new_task)
-            
-            if self.save_data("tasks.json", tasks):
+            if self.append_record("tasks.json", new_task):
                 logger.info(f"Added new task: {title} assigned to {assigned_to}")
                 return True
             else:
@@ -191,10 +242,12 @@ class DataManager:
             
             for task in tasks:
                 if task.get("id") == task_id:
-                    task["status"] = status
-                    task["updated_at"] = datetime.now().isoformat()
+                    changes = {"status": status, "updated_at": datetime.now().isoformat()}
                     
-                    if self.save_data("tasks.json", tasks):
+                    if self.storage.update("tasks.json", task_id, changes):
+                        if self.counters is not None:
+                            self.counters.record_update("tasks.json", task, changes)
+                        self.changes.publish("tasks.json")
                         logger.info(f"Updated task {task_id} status to {status}")
                         return True
                     break
@@ -208,10 +261,7 @@ class DataManager:
     def add_feedback(self, content: str, route_to: str) -> bool:
         """Add anonymous feedback"""
         try:
-            feedback = self.load_data("feedback.json")
-            
             new_feedback = {
-                "id": len(feedback) + 1,
                 "content": content.strip(),
                 "route_to": route_to,
                 "status": "unread",
@@ -219,9 +269,7 @@ class DataManager:
                 "priority": "normal"
             }
             
-            feedback.append(new_feedback)
-            
-            if self.save_data("feedback.json", feedback):
+            if self.append_record("feedback.json", new_feedback):
                 logger.info(f"Added anonymous feedback routed to {route_to}")
                 return True
             else:
@@ -235,10 +283,7 @@ class DataManager:
                    datetime_str: str, agenda: str = "", link: str = "") -> bool:
         """Add new meeting"""
         try:
-            meetings = self.load_data("scheduled_meetings.json")
-            
             new_meeting = {
-                "id": len(meetings) + 1,
                 "title": title.strip(),
                 "organizer": organizer,
                 "participants": participants,
@@ -249,9 +294,7 @@ class DataManager:
                 "created_at": datetime.now().isoformat()
             }
             
-            meetings.append(new_meeting)
-            
-            if self.save_data("scheduled_meetings.json", meetings):
+            if self.append_record("scheduled_meetings.json", new_meeting):
                 logger.info(f"Added new meeting: {title} organized by {organizer}")
                 return True
             else:
@@ -261,42 +304,26 @@ class DataManager:
             logger.error(f"Error adding meeting: {e}")
             return False
 
+    @timed("get_analytics_data", "analytics")
     def get_analytics_data(self) -> Dict:
-        """Get analytics data for dashboard"""
+        """Get analytics data for dashboard from the materialized counters"""
         try:
-            posts = self.load_data("posts.json")
-            tasks = self.load_data("tasks.json")
-            feedback = self.load_data("feedback.json")
-            meetings = self.load_data("scheduled_meetings.json")
-            
-            analytics = {
-                "total_posts": len(posts),
-                "total_tasks": len(tasks),
-                "total_feedback": len(feedback),
-                "total_meetings": len(meetings),
-                "posts_by_department": {},
-                "tasks_by_status": {},
-                "feedback_by_route": {},
+            posts = self.counters.summary("posts.json")
+            tasks = self.counters.summary("tasks.json")
+            feedback = self.counters.summary("feedback.json")
+            meetings = self.counters.summary("scheduled_meetings.json")
+            
+            return {
+                "total_posts": posts["count"],
+                "total_tasks": tasks["count"],
+                "total_feedback": feedback["count"],
+                "total_meetings": meetings["count"],
+                "posts_by_department": dict(posts["by"]),
+                "tasks_by_status": dict(tasks["by"]),
+                "feedback_by_route": dict(feedback["by"]),
                 "recent_activity": []
             }
             
-            # Posts by department
-            for post in posts:
-                dept = post.get("department", "Unknown")
-                analytics["posts_by_department"][dept] = analytics["posts_by_department"].get(dept, 0) + 1
-            
-            # Tasks by status
-            for task in tasks:
-                status = task.get("status", "Unknown")
-                analytics["tasks_by_status"][status] = analytics["tasks_by_status"].get(status, 0) + 1
-            
-            # Feedback by route
-            for fb in feedback:
-                route = fb.get("route_to", "Unknown")
-                analytics["feedback_by_route"][route] = analytics["feedback_by_route"].get(route, 0) + 1
-            
-            return analytics
-            
         except Exception as e:
             logger.error(f"Error getting analytics data: {e}")
             return {}
@@ -327,56 +354,90 @@ class DataManager:
             logger.error(f"Error getting user tasks: {e}")
             return []
 
+    @timed("search_posts", "posts.json")
     def search_posts(self, query: str, user_department: str, user_role: str, user_name: str) -> List[Dict]:
-        """Search posts with user visibility rules"""
+        """Search posts with user visibility rules, best match first"""
         try:
-            visible_posts = self.get_posts_for_user(user_department, user_role, user_name)
-            
-            if not query:
-                return visible_posts
-            
-            query = query.lower()
-            matching_posts = []
-            
-            for post in visible_posts:
-                if (query in post["title"].lower() or 
-                    query in post["content"].lower() or
-                    any(query in tag.lower() for tag in post.get("tags", []))):
-                    matching_posts.append(post)
-            
-            return matching_posts
+            if not query or not query.strip():
+                return self.get_posts_for_user(user_department, user_role, user_name)
+
+            with self._feed_lock:
+                return self.feed_index().search(query, user_department, self.is_c_suite(user_role), user_name)
             
         except Exception as e:
             logger.error(f"Error searching posts: {e}")
             return []
 
-# Global instance
-data_manager = DataManager()
+def create_data_manager() -> DataManager:
+    """Create the DataManager for the configured storage engine"""
+    if config.STORAGE_ENGINE == "sqlite":
+        from utils.sqlite_store import SqliteDataManager
+        return SqliteDataManager()
+    return DataManager()
 
-# Cached functions (outside the class to avoid self parameter)
-@st.cache_data(ttl=300)
-def cached_load_data(file_name: str) -> List[Dict]:
-    """Cached load function"""
-    return data_manager.load_data(file_name)
+# Global instance
+data_manager = create_data_manager()
 
 # Backward compatibility functions
 def load_data(file_name: str) -> List[Dict]:
-    """Load data - backward compatibility"""
-    try:
-        return cached_load_data(file_name)
-    except:
-        # Fallback to non-cached version if caching fails
-        return data_manager.load_data(file_name)
+    """Load data - served from the shared file cache until the collection changes"""
+    return data_manager.load_data(file_name)
 
 def save_data(file_name: str, data: List[Dict]) -> bool:
-    """Save data - backward compatibility"""
-    result = data_manager.save_data(file_name, data)
-    # Clear cache after save
-    try:
-        cached_load_data.clear()
-    except:
-        pass
-    return result
+    """Save data - only this collection's cache entry is invalidated"""
+    return data_manager.save_data(file_name, data)
+
+def append_data(file_name: str, record: Dict) -> bool:
+    """Append one record without rewriting the collection"""
+    return data_manager.append_record(file_name, record)
+
+def send_chat_message(room: str, sender: str, message: str, attachment: Optional[Dict] = None) -> bool:
+    """Append one message to a chat room"""
+    return data_manager.chat.send(room, sender, message, attachment)
+
+def get_chat_messages(room: str, limit: Optional[int] = None) -> List[Dict]:
+    """The newest messages of a chat room, oldest first"""
+    return data_manager.chat.recent(room, limit)
+
+def get_chat_messages_since(room: str, cursor: int, limit: Optional[int] = None) -> Tuple[List[Dict], int]:
+    """Chat messages after cursor plus the next cursor"""
+    return data_manager.chat.since(room, cursor, limit)
+
+def store_attachment(stream: BinaryIO, name: str, content_type: Optional[str] = None,
+                     room: Optional[str] = None) -> Optional[Dict]:
+    """Stream an upload into the attachment store; returns the metadata a message keeps.
+
+    Thumbnails and previews of images are rendered in the background; the
+    chat room, if given, is refreshed once they are ready.
+    """
+    attachment = data_manager.attachments.store(stream, name, content_type)
+    if attachment is not None:
+        data_manager.thumbnails.submit(attachment, chat_topic(room) if room else None)
+    return attachment
+
+def release_attachment(sha256: str) -> bool:
+    """Drop one reference to a stored attachment"""
+    return data_manager.attachments.release(sha256)
+
+def attachment_rendition(attachment: Dict, size: str, wait: float = 0,
+                         room: Optional[str] = None) -> Optional[str]:
+    """Path of an image attachment's "thumb" or "preview" rendition, or None until it is ready.
+
+    A rendition that is still missing refreshes the chat room, if given, once it is rendered.
+    """
+    return data_manager.thumbnails.rendition(attachment, size, wait, chat_topic(room) if room else None)
+
+def attachment_preview_failed(attachment: Dict) -> bool:
+    """Whether an image attachment will never get a preview"""
+    return data_manager.thumbnails.failed(attachment)
+
+def read_attachment(sha256: str) -> bytes:
+    """The bytes of a stored attachment"""
+    return data_manager.attachments.read(sha256)
+
+def employee_directory() -> EmployeeDirectory:
+    """The indexed employee directory (data/employees.json)"""
+    return data_manager.directory
 
 def add_post(title: str, content: str, author: str, department: str, 
              tags: List[str] = None, is_anonymous: bool = False, 
@@ -389,14 +450,24 @@ def get_posts_for_user(user_department: str, user_role: str, user_name: str) ->
     """Get posts for user - backward compatibility"""
     return data_manager.get_posts_for_user(user_department, user_role, user_name)
 
+def get_feed_page(user_department: str, user_role: str, user_name: str, limit: int,
+                  cursor: Optional[FeedCursor] = None,
+                  vip: Optional[bool] = None) -> Tuple[List[Dict], Optional[FeedCursor]]:
+    """One page of the user's feed plus the next cursor"""
+    return data_manager.get_feed_page(user_department, user_role, user_name, limit, cursor, vip)
+
+def get_department_page(department: str, limit: int,
+                        cursor: Optional[FeedCursor] = None) -> Tuple[List[Dict], Optional[FeedCursor]]:
+    """One page of a department feed plus the next cursor"""
+    return data_manager.get_department_page(department, limit, cursor)
+
 def is_c_suite(role: str) -> bool:
     """Check C-Suite role - backward compatibility"""
     return DataManager.is_c_suite(role)
 
 def get_vip_messages_for_user(user_name: str, user_role: str) -> List[Dict]:
     """Get VIP messages for user"""
-    posts = data_manager.get_posts_for_user("", user_role, user_name)
-    return [post for post in posts if post.get("is_vip", False)]
+    return data_manager.get_posts_for_user("", user_role, user_name, vip=True)
 
 # Enhanced utility functions
 def format_timestamp(timestamp_str: str) -> str:
@@ -0,0 +1,110 @@
+# utils/directory.py - Indexed employee directory shared by auth and the pages
+import os
+import logging
+from typing import Dict, List, Optional
+
+from utils.cache import FileCache
+from utils.storage import read_json_file
+
+logger = logging.getLogger(__name__)
+
+
+class DirectoryIndex:
+    """One version of the employee list with its lookup tables.
+
+    Ids and names are matched case-insensitively (casefolded). Names are
+    not unique, so a name maps to every employee carrying it, in file
+    order. Everything is built in one pass when the file is read; lookups
+    are dictionary hits.
+    """
+
+    def __init__(self, employees: List[Dict]):
+        self.employees = employees
+        self.by_id: Dict[str, Dict] = {}
+        self.by_name: Dict[str, List[Dict]] = {}
+        self.by_department: Dict[str, List[Dict]] = {}
+        self.by_role: Dict[str, List[Dict]] = {}
+        # "Name (ID)" picker labels, in file order
+        self.by_label: Dict[str, Dict] = {}
+        self.names: List[str] = []
+
+        for employee in employees:
+            name = employee.get("name", "")
+            employee_id = str(employee.get("id", ""))
+            self.by_id.setdefault(employee_id.casefold(), employee)
+            self.by_name.setdefault(name.casefold(), []).append(employee)
+            self.by_department.setdefault(employee.get("department"), []).append(employee)
+            self.by_role.setdefault(employee.get("role"), []).append(employee)
+            self.by_label[f"{name} ({employee_id})"] = employee
+            self.names.append(name)
+
+
+class EmployeeDirectory:
+    """Employees from one JSON file, indexed once per version of the file.
+
+    Each call costs one ``os.stat``; the file is read and indexed again only
+    after it changes. Returned records are shared and must be treated as
+    read-only.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._cache = FileCache()
+
+    def index(self) -> DirectoryIndex:
+        """The index for the current version of the file (empty if it is missing or unreadable)"""
+        try:
+            return self._cache.get(self.path, self._build)
+        except Exception as e:
+            logger.error(f"Error loading employee directory {self.path}: {e}")
+            return DirectoryIndex([])
+
+    def _build(self, file_path: str) -> DirectoryIndex:
+        if not os.path.exists(file_path):
+            return DirectoryIndex([])
+        employees = read_json_file(file_path)
+        index = DirectoryIndex([employee for employee in employees if isinstance(employee, dict)])
+        logger.info(f"Indexed {len(index.employees)} employees from {file_path}")
+        return index
+
+    def __len__(self) -> int:
+        return len(self.index().employees)
+
+    def all(self) -> List[Dict]:
+        """Every employee, in file order"""
+        return self.index().employees
+
+    def get(self, employee_id: str) -> Optional[Dict]:
+        """The employee with this id"""
+        return self.index().by_id.get(str(employee_id).casefold())
+
+    def named(self, name: str) -> List[Dict]:
+        """Employees with this name"""
+        return self.index().by_name.get(name.casefold(), [])
+
+    def lookup(self, key: str) -> List[Dict]:
+        """Employees whose id or name is key, the id match first (as typed at login)"""
+        index = self.index()
+        by_id = index.by_id.get(key.casefold())
+        matches = [by_id] if by_id is not None else []
+        return matches + [employee for employee in index.by_name.get(key.casefold(), []) if employee is not by_id]
+
+    def in_department(self, department: str) -> List[Dict]:
+        """Employees of a department, in file order"""
+        return self.index().by_department.get(department, [])
+
+    def with_role(self, role: str) -> List[Dict]:
+        """Employees with this role, in file order"""
+        return self.index().by_role.get(role, [])
+
+    def departments(self) -> List[str]:
+        """Departments with at least one employee"""
+        return [department for department in self.index().by_department if department]
+
+    def names(self) -> List[str]:
+        """Every employee's name, in file order"""
+        return self.index().names
+
+    def labels(self) -> Dict[str, Dict]:
+        """Employees by "Name (ID)" label, for pickers"""
+        return self.index().by_label
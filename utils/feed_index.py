@@ -0,0 +1,118 @@
+# utils/feed_index.py - Presorted per-user visibility index over posts
+import heapq
+from bisect import bisect_left, insort
+from itertools import islice
+from typing import Dict, FrozenSet, List, Optional, Tuple, Union
+
+from utils.search_index import SearchIndex
+
+# Position of a post in a feed; feeds run newest first, so a page cursor is
+# the key of the last post shown and the next page starts just below it
+FeedCursor = Tuple[str, int]
+
+# (timestamp, id, arrival) with the arrival counter only breaking ties
+# between posts that share a timestamp and have no integer id
+Entry = Tuple[Tuple[str, int, int], Dict]
+
+
+def feed_key(post: Dict) -> FeedCursor:
+    """Keyset position of a post: (timestamp, id)"""
+    post_id = post.get("id")
+    return post.get("timestamp", ""), post_id if isinstance(post_id, int) else 0
+
+
+class FeedIndex:
+    """Posts split into the buckets the visibility rules select from.
+
+    * ``company``: non-VIP posts for "All"
+    * ``departments``: non-VIP posts per department
+    * ``vip``: every VIP post (what C-Suite roles see)
+    * ``vip_by_name``: VIP posts per recipient name, including the author
+    * ``by_department``: every post per department, VIP or not (the department pages)
+
+    Every bucket is kept sorted as posts are added, so a feed is a merge of
+    at most three presorted lists instead of a scan and sort of every post.
+    The full-text index is fed from the same stream of posts.
+    """
+
+    def __init__(self, posts: List[Dict] = (), cursor: Optional[tuple] = None):
+        self.cursor = cursor
+        self.count = 0
+        self.company: List[Entry] = []
+        self.departments: Dict[str, List[Entry]] = {}
+        self.vip: List[Entry] = []
+        self.vip_by_name: Dict[str, List[Entry]] = {}
+        self.by_department: Dict[str, List[Entry]] = {}
+        # Per post number: who may see it (None for everyone, a department,
+        # or the names a VIP post is addressed to)
+        self.posts: List[Dict] = []
+        self.audience: List[Union[None, str, FrozenSet[str]]] = []
+        self.text = SearchIndex()
+        for post in posts:
+            self.add(post)
+
+    def add(self, post: Dict):
+        """Index one post"""
+        entry = ((*feed_key(post), self.count), post)
+        self.count += 1
+        self.posts.append(post)
+        self.text.add(post)
+        insort(self.by_department.setdefault(post.get("department"), []), entry)
+
+        if post.get("is_vip", False):
+            names = frozenset({*post.get("vip_recipients", []), post.get("author")})
+            self.audience.append(names)
+            insort(self.vip, entry)
+            for name in names:
+                insort(self.vip_by_name.setdefault(name, []), entry)
+        elif post.get("department") == "All":
+            self.audience.append(None)
+            insort(self.company, entry)
+        else:
+            self.audience.append(post.get("department"))
+            insort(self.departments.setdefault(post.get("department"), []), entry)
+
+    def can_see(self, doc: int, user_department: str, is_c_suite: bool, user_name: str) -> bool:
+        """Whether post number doc is in the user's visible set"""
+        audience = self.audience[doc]
+        if isinstance(audience, frozenset):
+            return is_c_suite or user_name in audience
+        return audience is None or audience == user_department
+
+    def search(self, query: str, user_department: str, is_c_suite: bool, user_name: str) -> List[Dict]:
+        """Visible posts matching every query term (as prefixes), best match first"""
+        return [self.posts[doc] for doc, _ in self.text.search(query)
+                if self.can_see(doc, user_department, is_c_suite, user_name)]
+
+    def visible(self, user_department: str, is_c_suite: bool, user_name: str,
+                vip: Optional[bool] = None, cursor: Optional[FeedCursor] = None,
+                limit: Optional[int] = None) -> List[Dict]:
+        """Posts the user may see, newest first.
+
+        ``vip`` restricts the feed to VIP (True) or regular (False) posts;
+        ``cursor`` and ``limit`` select one page.
+        """
+        buckets = []
+        if vip is not True:
+            buckets.append(self.company)
+            if user_department in self.departments:
+                buckets.append(self.departments[user_department])
+        if vip is not False:
+            buckets.append(self.vip if is_c_suite else self.vip_by_name.get(user_name, []))
+        return self._page(buckets, cursor, limit)
+
+    def department(self, department: str, cursor: Optional[FeedCursor] = None,
+                   limit: Optional[int] = None) -> List[Dict]:
+        """Every post addressed to one department, VIP ones included, newest first"""
+        return self._page([self.by_department.get(department, [])], cursor, limit)
+
+    @staticmethod
+    def _page(buckets: List[List[Entry]], cursor: Optional[FeedCursor], limit: Optional[int]) -> List[Dict]:
+        """Merge buckets newest first, starting below cursor and stopping after limit posts"""
+        def below(bucket):
+            end = len(bucket) if cursor is None else bisect_left(bucket, tuple(cursor), key=lambda entry: entry[0][:2])
+            return (bucket[i] for i in range(end - 1, -1, -1))
+
+        merged = heapq.merge(*(below(bucket) for bucket in buckets if bucket),
+                             key=lambda entry: entry[0], reverse=True)
+        return [post for _, post in islice(merged, limit)]
@@ -0,0 +1,45 @@
+# utils/feed_pager.py - "Load more" paging for post feeds
+from typing import Callable, Dict, List, Optional, Tuple
+
+import streamlit as st
+
+from utils import config
+from utils.feed_index import FeedCursor
+
+# fetch(limit, cursor) -> (page, next_cursor), e.g. a partial of get_feed_page
+PageFetcher = Callable[[int, Optional[FeedCursor]], Tuple[List[Dict], Optional[FeedCursor]]]
+
+
+def paged_posts(key: str, fetch: PageFetcher, page_size: int = None) -> List[Dict]:
+    """Posts loaded so far for one feed, newest first.
+
+    The first page is fetched on every run so new posts show up; pages
+    loaded with "Load more" are kept in the session and only the next page
+    is fetched per click. If the first page changed, the feed starts over
+    from it instead of showing a gap.
+    """
+    page_size = page_size or config.FEED_PAGE_SIZE
+    first, next_cursor = fetch(page_size, None)
+    head = [post.get("id") for post in first]
+
+    state = st.session_state.get(key)
+    if state is None or state["head"] != head or state["page_size"] != page_size:
+        state = {"head": head, "page_size": page_size, "posts": first, "cursor": next_cursor}
+        st.session_state[key] = state
+    else:
+        state["posts"][:len(first)] = first
+    return state["posts"]
+
+
+def load_more_button(key: str, fetch: PageFetcher, label: str = "Load more"):
+    """Show a "Load more" button while the feed has older posts"""
+    state = st.session_state.get(key)
+    if state is None or state["cursor"] is None:
+        return
+    st.button(label, key=f"{key}_load_more", on_click=_load_next_page, args=(key, fetch))
+
+
+def _load_next_page(key: str, fetch: PageFetcher):
+    state = st.session_state[key]
+    page, state["cursor"] = fetch(state["page_size"], state["cursor"])
+    state["posts"] = state["posts"] + page
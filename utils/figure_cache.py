@@ -0,0 +1,85 @@
+# utils/figure_cache.py - Process-wide cache of serialized Plotly figures
+import json
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
+
+from utils import config
+
+
+class FigureCache:
+    """Plotly figures serialized to JSON, keyed by chart, data version and parameters.
+
+    Callers put everything a chart depends on into the key (usually the
+    chart name, the version of the data it is drawn from, and its layout
+    parameters), so a key never goes stale; old versions simply age out.
+    Entries are evicted least recently used first once their JSON exceeds
+    ``max_bytes``.
+
+    A hit turns the stored JSON back into a figure without validation: the
+    JSON was produced by a validated figure, and validating it again costs
+    about as much as building the chart.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        """Return the figure for key, calling build() to draw it on a miss"""
+        with self._lock:
+            spec = self._entries.get(key)
+            if spec is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        if spec is not None:
+            import plotly.graph_objects as go
+            return go.Figure(json.loads(spec), _validate=False)
+
+        self.misses += 1
+        figure = build()
+        self._store(key, figure.to_json())
+        return figure
+
+    def _store(self, key: Hashable, spec: str):
+        size = sys.getsizeof(spec)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.bytes -= sys.getsizeof(previous)
+            self._entries[key] = spec
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.bytes -= sys.getsizeof(evicted)
+                self.evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Entry count, JSON bytes held and lookup counters"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def clear(self):
+        """Drop every cached figure"""
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+
+# Shared by every session in the process
+figure_cache = FigureCache(int(config.FIGURE_CACHE_MB * 1024 * 1024))
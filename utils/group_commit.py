@@ -0,0 +1,119 @@
+# utils/group_commit.py - Batches concurrent inserts into group commits
+import queue
+import threading
+import time
+import logging
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class GroupCommitter:
+    """Write-behind queue in front of a storage engine.
+
+    A lone insert is committed as soon as it arrives. When more inserts are
+    already queued (they piled up during the previous commit), the batch
+    keeps collecting for ``window_ms``, then is written per collection with
+    one ``append_many`` call (one write and one fsync). Records without an
+    id get theirs from one ``sequences.reserve`` per collection, and
+    ``on_commit`` runs once per batch with every committed record. Each
+    submitter gets a Future that resolves to True only once its batch is
+    durable, so callers keep their "saved or not" answer while a burst of N
+    inserts costs one commit instead of N.
+    """
+
+    def __init__(self, storage, window_ms: float = 5.0, max_batch: int = 1000, sequences=None,
+                 on_commit: Optional[Callable[[Dict[str, List[Dict]]], None]] = None):
+        self.storage = storage
+        self.window = window_ms / 1000.0
+        self.max_batch = max_batch
+        self.sequences = sequences
+        self.on_commit = on_commit
+        self._queue: "queue.Queue[Tuple[str, Dict, Future]]" = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def submit(self, file_name: str, record: Dict) -> Future:
+        """Queue one insert; the returned Future resolves once it is committed"""
+        future = Future()
+        self._ensure_worker()
+        self._queue.put((file_name, record, future))
+        return future
+
+    def append(self, file_name: str, record: Dict, timeout: float = 30.0) -> bool:
+        """Queue one insert and wait until its batch is durable"""
+        return self.submit(file_name, record).result(timeout=timeout)
+
+    def _ensure_worker(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="group-commit", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if len(batch) == 1:
+                self._commit(batch)
+                continue
+
+            # Others are inserting concurrently: give them the window to join this commit
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._commit(batch)
+
+    def _commit(self, batch: List[Tuple[str, Dict, Future]]):
+        """Write a batch, one append_many per collection in arrival order"""
+        by_collection: Dict[str, List[Tuple[Dict, Future]]] = {}
+        for file_name, record, future in batch:
+            by_collection.setdefault(file_name, []).append((record, future))
+
+        committed: Dict[str, List[Dict]] = {}
+        results: List[Tuple[Future, bool]] = []
+        for file_name, items in by_collection.items():
+            try:
+                records = self._assign_ids(file_name, [record for record, _ in items])
+                ok = self.storage.append_many(file_name, records)
+            except Exception as e:
+                logger.error(f"Group commit to {file_name} failed: {e}")
+                for _, future in items:
+                    future.set_exception(e)
+                continue
+
+            if ok:
+                committed[file_name] = records
+            if len(items) > 1:
+                logger.debug(f"Group-committed {len(items)} records to {file_name}")
+            results.extend((future, ok) for _, future in items)
+
+        # Before the submitters return, so their next read already sees the counters
+        if committed and self.on_commit is not None:
+            try:
+                self.on_commit(committed)
+            except Exception as e:
+                logger.error(f"Post-commit hook failed: {e}")
+        for future, ok in results:
+            future.set_result(ok)
+
+    def _assign_ids(self, file_name: str, records: List[Dict]) -> List[Dict]:
+        """Give records without an id the next ids of their collection, in batch order"""
+        missing = sum(1 for record in records if "id" not in record)
+        if not missing or self.sequences is None:
+            return records
+        ids = iter(self.sequences.reserve(file_name, missing))
+        return [record if "id" in record else {"id": next(ids), **record} for record in records]
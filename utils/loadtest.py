@@ -0,0 +1,326 @@
+# utils/loadtest.py - Drives many simulated sessions through app.py and reports latency and lost writes
+import argparse
+import json
+import math
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_OUT_DIR = "benchmark-results"
+
+# Accounts from utils.auth; sessions without one use Guest Mode
+PASSWORD_LOGINS = [("Guruprasad", "admin123"), ("Meera", "user123"), ("Ravi", "hr123")]
+
+# Relative weight of each action a simulated user takes per step
+ACTIONS = {"home": 30, "dashboard": 20, "browse": 20, "post": 10, "chat": 15, "task": 5}
+
+# Sidebar entries for the pages the "browse" action picks from
+BROWSE_PAGES = ["📢 Campaigns", "🧩 {department} Space", "🔒 Anonymous Feedback", "🤝 Collaboration",
+                "📅 Schedule Meeting"]
+
+# Where each write lands and the field its marker text goes in
+WRITE_TARGETS = {"post": ("posts.json", "title"), "chat": ("chat.json", "message"), "task": ("tasks.json", "title")}
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile of values (q in 0..100)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)], 2)
+
+
+def _widget(elements, label: str):
+    for element in elements:
+        if element.label == label:
+            return element
+    raise LookupError(f"no widget labelled {label!r} on the page")
+
+
+class SimulatedSession:
+    """One browser session: logs in, then takes weighted random actions.
+
+    Every rerun (login, navigation, form submit) is timed. Writes carry a
+    unique marker so the run can check afterwards that each acknowledged
+    write made it to disk.
+    """
+
+    def __init__(self, name: str, seed: int, timeout: float):
+        from streamlit.testing.v1 import AppTest
+
+        self.name = name
+        self.rng = random.Random(seed)
+        self.at = AppTest.from_file(os.path.abspath("app.py"), default_timeout=timeout)
+        self.samples: List[Dict] = []
+        self.errors: List[Dict] = []
+        self.writes: List[Dict] = []
+        self.failed_writes: List[Dict] = []
+        self._writes_sent = 0
+
+    def _run(self, action: str, element=None):
+        """Rerun the script (optionally via a widget), recording latency and any exception"""
+        start = time.perf_counter()
+        try:
+            (element or self.at).run()
+        except Exception as e:
+            self.errors.append({"session": self.name, "action": action, "error": f"{type(e).__name__}: {e}"})
+            return False
+        finally:
+            self.samples.append({"action": action, "ms": (time.perf_counter() - start) * 1000})
+
+        # st.error messages are app behaviour (e.g. Dashboard access denied); exceptions are failures
+        for exception in self.at.exception:
+            self.errors.append({"session": self.name, "action": action, "error": str(exception.value)[:300]})
+        return not self.at.exception
+
+    def login(self, index: int):
+        self._run("open")
+        if index % 2 == 0:
+            _widget(self.at.button, "👀 Guest Mode").click()
+            self._run("login_guest")
+        else:
+            username, password = PASSWORD_LOGINS[index // 2 % len(PASSWORD_LOGINS)]
+            _widget(self.at.text_input, "👤 Username or Employee ID").set_value(username)
+            _widget(self.at.text_input, "🔒 Password").set_value(password)
+            _widget(self.at.button, "🚀 Login").click()
+            self._run("login_password")
+        if not self.at.session_state["logged_in"]:
+            raise RuntimeError(f"{self.name} could not log in")
+
+    def navigate(self, page: str, action: str):
+        radio = self.at.sidebar.radio[0]
+        department = self.at.session_state["employee"]["department"]
+        return self._run(action, radio.set_value(page.format(department=department)))
+
+    def step(self):
+        action = self.rng.choices(list(ACTIONS), weights=list(ACTIONS.values()))[0]
+        if action == "home":
+            self.navigate("🏠 Home Feed", "home")
+        elif action == "dashboard":
+            self.navigate("📊 Dashboard", "dashboard")
+        elif action == "browse":
+            self.navigate(self.rng.choice(BROWSE_PAGES), "browse")
+        elif action == "post":
+            self.navigate("🏠 Home Feed", "home")
+            marker = self._marker(action)
+            _widget(self.at.text_input, "Title").set_value(marker)
+            _widget(self.at.text_area, "Content").set_value("Load test post")
+            self._write(action, marker, _widget(self.at.button, "Post").click())
+        elif action == "chat":
+            self.navigate("🤝 Collaboration", "browse")
+            marker = self._marker(action)
+            _widget(self.at.text_input, "Message").set_value(marker)
+            self._write(action, marker, _widget(self.at.button, "Send Message").click())
+        elif action == "task":
+            self.navigate("✅ Tasks", "browse")
+            marker = self._marker(action)
+            _widget(self.at.text_input, "Task Title").set_value(marker)
+            self._write(action, marker, _widget(self.at.button, "Assign Task").click())
+
+    def _marker(self, action: str) -> str:
+        self._writes_sent += 1
+        return f"loadtest {self.name} {action} {self._writes_sent}"
+
+    def _write(self, action: str, marker: str, button):
+        # The pages report a failed save with st.error; Home reruns away its success message
+        write = {"action": action, "marker": marker}
+        if self._run(action, button) and not self.at.error:
+            self.writes.append(write)
+        else:
+            self.failed_writes.append(write)
+
+    def run(self, steps: int, deadline: float, index: int):
+        try:
+            self.login(index)
+        except Exception as e:
+            self.errors.append({"session": self.name, "action": "login", "error": f"{type(e).__name__}: {e}"})
+            return
+        for _ in range(steps):
+            if time.monotonic() > deadline:
+                break
+            try:
+                self.step()
+            except Exception as e:
+                # A step that could not find its widgets (page failed to render) is an error; carry on
+                self.errors.append({"session": self.name, "action": "step", "error": f"{type(e).__name__}: {e}"})
+
+
+def run_worker(index: int, steps: int, duration: float, seed: int, timeout: float) -> Dict:
+    """Run one simulated session in this process"""
+    session = SimulatedSession(f"s{index}", seed * 1000 + index, timeout)
+    start = time.perf_counter()
+    session.run(steps, time.monotonic() + duration, index)
+    return {
+        "elapsed_s": time.perf_counter() - start,
+        "samples": session.samples,
+        "errors": session.errors,
+        "writes": session.writes,
+        "failed_writes": session.failed_writes,
+    }
+
+
+def find_lost_writes(data_dir: str, engine: str, writes: List[Dict]) -> List[Dict]:
+    """Acknowledged writes whose marker is missing from the collection on disk"""
+    from utils.chat_store import ChatStore
+    from utils.storage import create_storage
+
+    storage = create_storage(data_dir, engine)
+    chat = ChatStore(data_dir)
+    found = {}
+    for file_name, field in set(WRITE_TARGETS.values()):
+        if file_name == "chat.json":
+            records = [message for room in chat.rooms() for message in chat.history(room)]
+        else:
+            records = storage.load(file_name)
+        found[file_name] = {record.get(field) for record in records}
+    lost = []
+    for write in writes:
+        file_name, _ = WRITE_TARGETS[write["action"]]
+        if write["marker"] not in found[file_name]:
+            lost.append(write)
+    return lost
+
+
+def summarize(samples: List[Dict]) -> Dict:
+    values = [sample["ms"] for sample in samples]
+    return {"count": len(values), "p50_ms": percentile(values, 50), "p95_ms": percentile(values, 95),
+            "p99_ms": percentile(values, 99), "max_ms": round(max(values), 2) if values else None}
+
+
+def render_markdown(report: Dict) -> str:
+    lines = [
+        f"# Load test ({report['sessions']} concurrent sessions, {report['engine']} engine)",
+        "",
+        f"Run {report['started_at']}: {report['reruns']} reruns in {report['elapsed_s']} s "
+        f"({report['reruns_per_s']} reruns/s), {len(report['errors'])} errors, "
+        f"{report['writes_acknowledged']} writes acknowledged, {len(report['writes_failed'])} rejected, "
+        f"{len(report['lost_writes'])} acknowledged but lost.",
+        "",
+        "| Action | Reruns | p50 ms | p95 ms | p99 ms | max ms |",
+        "|---|---|---|---|---|---|",
+    ]
+    for action, stats in [("all", report["latency"]), *report["latency_by_action"].items()]:
+        lines.append(f"| {action} | {stats['count']} | {stats['p50_ms']} | {stats['p95_ms']} | "
+                     f"{stats['p99_ms']} | {stats['max_ms']} |")
+    if report["errors"]:
+        lines += ["", "## Errors (first 20)", ""]
+        lines += [f"- {e['session']} {e['action']}: {e['error']}" for e in report["errors"][:20]]
+    if report["lost_writes"]:
+        lines += ["", "## Lost writes (first 20)", ""]
+        lines += [f"- {w['action']}: {w['marker']}" for w in report["lost_writes"][:20]]
+    return "\n".join(lines) + "\n"
+
+
+def run_load_test(sessions: int = 10, steps: int = 20, duration: float = 120,
+                  engine: str = "jsonl", scale: Optional[int] = None, seed: int = 42, timeout: float = 60,
+                  out_dir: Optional[str] = DEFAULT_OUT_DIR) -> Dict:
+    """Run the load test in a scratch workspace and write <out_dir>/loadtest-<engine>.json and .md.
+
+    The workspace starts from a copy of ./data (or synthetic data when
+    scale is given), so the real data files are never touched. Every
+    session runs in its own process, since AppTest instances sharing an
+    interpreter interfere with each other; they all contend for the same
+    data files.
+    """
+    from utils.benchmark import link_app, prepare_workspace
+
+    started_at = datetime.now().isoformat(timespec="seconds")
+    with tempfile.TemporaryDirectory(prefix="superapp-load-") as root:
+        if scale:
+            prepare_workspace(root, scale, seed, engine)
+        else:
+            link_app(root)
+            shutil.copytree(os.path.join(PROJECT_ROOT, "data"), os.path.join(root, "data"))
+        data_dir = os.path.join(root, "data")
+        env = dict(os.environ, SUPERAPP_DATA_DIR=data_dir, SUPERAPP_STORAGE=engine, SUPERAPP_METRICS_INTERVAL="0")
+
+        workers = [
+            subprocess.Popen(
+                [sys.executable, "-m", "utils.loadtest", "--worker", str(index), "--steps", str(steps),
+                 "--duration", str(duration), "--seed", str(seed), "--timeout", str(timeout)],
+                cwd=root, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+            )
+            for index in range(sessions)
+        ]
+        results = []
+        for index, process in enumerate(workers):
+            stdout, stderr = process.communicate()
+            if process.returncode != 0:
+                logger.error(f"Load test session {index} failed:\n{stderr[-4000:]}")
+                results.append({"elapsed_s": 0, "samples": [], "writes": [], "failed_writes": [],
+                                "errors": [{"session": f"s{index}", "action": "process", "error": stderr.strip()[-300:]}]})
+            else:
+                results.append(json.loads(stdout.strip().splitlines()[-1]))
+
+        samples = [sample for result in results for sample in result["samples"]]
+        writes = [write for result in results for write in result["writes"]]
+        lost = find_lost_writes(data_dir, engine, writes)
+
+    elapsed = max(result["elapsed_s"] for result in results) or 1
+    actions = sorted({sample["action"] for sample in samples})
+    report = {
+        "started_at": started_at,
+        "engine": engine,
+        "sessions": sessions,
+        "steps": steps,
+        "scale": scale,
+        "elapsed_s": round(elapsed, 2),
+        "reruns": len(samples),
+        "reruns_per_s": round(len(samples) / elapsed, 2),
+        "latency": summarize(samples),
+        "latency_by_action": {action: summarize([s for s in samples if s["action"] == action]) for action in actions},
+        "errors": [error for result in results for error in result["errors"]],
+        "writes_acknowledged": len(writes),
+        "writes_failed": [write for result in results for write in result["failed_writes"]],
+        "lost_writes": lost,
+    }
+
+    if out_dir:
+        from utils.storage import atomic_write
+
+        os.makedirs(out_dir, exist_ok=True)
+        base = os.path.join(out_dir, f"loadtest-{engine}")
+        atomic_write(base + ".json", json.dumps(report, indent=4, ensure_ascii=False).encode("utf-8"), durable=False)
+        atomic_write(base + ".md", render_markdown(report).encode("utf-8"), durable=False)
+        logger.info(f"Wrote {base}.json and {base}.md")
+    return report
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Concurrent-session load test for the Streamlit app")
+    parser.add_argument("--sessions", type=int, default=10, help="concurrent sessions (one process each)")
+    parser.add_argument("--steps", type=int, default=20, help="actions per session after logging in")
+    parser.add_argument("--duration", type=float, default=120, help="stop sessions after this many seconds")
+    parser.add_argument("--engine", default="jsonl", choices=["jsonl", "json", "sqlite"])
+    parser.add_argument("--scale", type=int, help="start from synthetic data with this many posts instead of ./data")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--timeout", type=float, default=60, help="seconds allowed per rerun")
+    parser.add_argument("--out", default=DEFAULT_OUT_DIR, help="directory for the JSON and Markdown report")
+    parser.add_argument("--worker", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker is not None:
+        # Child process: run one session and print one JSON line
+        logging.disable(logging.WARNING)
+        print(json.dumps(run_worker(args.worker, args.steps, args.duration, args.seed, args.timeout)))
+        return
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    report = run_load_test(args.sessions, args.steps, args.duration, args.engine, args.scale,
+                           args.seed, args.timeout, args.out)
+    print(render_markdown(report))
+
+
+if __name__ == "__main__":
+    # python -m utils.loadtest --sessions 20 --engine json
+    main()
@@ -0,0 +1,260 @@
+# utils/metrics.py - In-process metrics for data operations, exported as Prometheus text
+import functools
+import os
+import random
+import threading
+import time
+import logging
+from typing import Callable, Dict, List, Optional, Tuple
+
+from utils import config
+
+logger = logging.getLogger(__name__)
+
+# Latency histogram bucket bounds in seconds (+Inf is implied)
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+def log_sampled(log: logging.Logger, message: str, rate: int = None):
+    """Debug-log roughly one in `rate` calls (SUPERAPP_LOG_SAMPLE_RATE), for hot paths"""
+    rate = rate or config.LOG_SAMPLE_RATE
+    if rate > 0 and log.isEnabledFor(logging.DEBUG) and random.randrange(rate) == 0:
+        log.debug(f"{message} (sampled 1/{rate})")
+
+
+class OperationStats:
+    """Counters and a latency histogram for one (operation, collection) pair"""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.records = 0
+        self.latency_sum = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def observe(self, seconds: float, records: int = 0, error: bool = False):
+        self.calls += 1
+        self.errors += int(error)
+        self.records += records
+        self.latency_sum += seconds
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+                return
+        self.buckets[-1] += 1
+
+    def quantile(self, q: float) -> float:
+        """Upper bucket bound holding the q-th quantile (an estimate, as in Prometheus)"""
+        if not self.calls:
+            return 0.0
+        rank = q * self.calls
+        seen = 0
+        for i, count in enumerate(self.buckets[:-1]):
+            seen += count
+            if seen >= rank:
+                return LATENCY_BUCKETS[i]
+        return float("inf")
+
+
+class Metrics:
+    """Process-wide registry of operation timings, storage bytes and cache activity.
+
+    Recording is a dict lookup and a few additions under a lock, so it can
+    stay on the hot path. ``write_prometheus`` renders the text exposition
+    format; a daemon thread writes it to SUPERAPP_METRICS_FILE periodically
+    for a node_exporter textfile collector or similar to pick up.
+    """
+
+    def __init__(self):
+        self.operations: Dict[Tuple[str, str], OperationStats] = {}
+        self.bytes: Dict[Tuple[str, str], int] = {}
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._exporter = None
+
+    def observe(self, operation: str, collection: str, seconds: float, records: int = 0, error: bool = False):
+        """Record one call of an operation"""
+        with self._lock:
+            stats = self.operations.get((operation, collection))
+            if stats is None:
+                stats = self.operations[(operation, collection)] = OperationStats()
+            stats.observe(seconds, records, error)
+        self._ensure_exporter()
+
+    def add_bytes(self, collection: str, read: int = 0, written: int = 0):
+        """Record bytes moved to or from a collection's backing file"""
+        with self._lock:
+            if read:
+                self.bytes[(collection, "read")] = self.bytes.get((collection, "read"), 0) + read
+            if written:
+                self.bytes[(collection, "written")] = self.bytes.get((collection, "written"), 0) + written
+
+    def summary(self) -> List[Dict]:
+        """One row per (operation, collection), busiest first, for display"""
+        with self._lock:
+            rows = [
+                {
+                    "operation": operation,
+                    "collection": collection,
+                    "calls": stats.calls,
+                    "errors": stats.errors,
+                    "records": stats.records,
+                    "mean_ms": round(stats.latency_sum / stats.calls * 1000, 3) if stats.calls else 0.0,
+                    "p95_ms_le": stats.quantile(0.95) * 1000,
+                }
+                for (operation, collection), stats in self.operations.items()
+            ]
+        return sorted(rows, key=lambda row: row["calls"], reverse=True)
+
+    def prometheus_text(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        from utils.cache import file_cache
+        from utils.figure_cache import figure_cache
+
+        lines = [
+            "# HELP superapp_operation_calls_total Data operation calls.",
+            "# TYPE superapp_operation_calls_total counter",
+        ]
+        with self._lock:
+            operations = sorted(self.operations.items())
+            byte_counts = sorted(self.bytes.items())
+
+        for (operation, collection), stats in operations:
+            lines.append(f'superapp_operation_calls_total{{{_labels(operation, collection)}}} {stats.calls}')
+
+        lines += [
+            "# HELP superapp_operation_errors_total Data operation calls that failed.",
+            "# TYPE superapp_operation_errors_total counter",
+        ]
+        for (operation, collection), stats in operations:
+            lines.append(f'superapp_operation_errors_total{{{_labels(operation, collection)}}} {stats.errors}')
+
+        lines += [
+            "# HELP superapp_operation_records_total Records returned or written by data operations.",
+            "# TYPE superapp_operation_records_total counter",
+        ]
+        for (operation, collection), stats in operations:
+            lines.append(f'superapp_operation_records_total{{{_labels(operation, collection)}}} {stats.records}')
+
+        lines += [
+            "# HELP superapp_operation_latency_seconds Data operation latency.",
+            "# TYPE superapp_operation_latency_seconds histogram",
+        ]
+        for (operation, collection), stats in operations:
+            labels = _labels(operation, collection)
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS, stats.buckets):
+                cumulative += count
+                lines.append(f'superapp_operation_latency_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'superapp_operation_latency_seconds_bucket{{{labels},le="+Inf"}} {stats.calls}')
+            lines.append(f'superapp_operation_latency_seconds_sum{{{labels}}} {stats.latency_sum:.6f}')
+            lines.append(f'superapp_operation_latency_seconds_count{{{labels}}} {stats.calls}')
+
+        lines += [
+            "# HELP superapp_storage_bytes_total Bytes read from and written to collection files.",
+            "# TYPE superapp_storage_bytes_total counter",
+        ]
+        for (collection, direction), count in byte_counts:
+            lines.append(f'superapp_storage_bytes_total{{collection="{_escape(collection)}",direction="{direction}"}} {count}')
+
+        lines += [
+            "# HELP superapp_cache_lookups_total File cache lookups by result.",
+            "# TYPE superapp_cache_lookups_total counter",
+        ]
+        for path, (hits, misses) in sorted(file_cache.stats.items()):
+            name = _escape(os.path.basename(path))
+            lines.append(f'superapp_cache_lookups_total{{file="{name}",result="hit"}} {hits}')
+            lines.append(f'superapp_cache_lookups_total{{file="{name}",result="miss"}} {misses}')
+
+        figures = figure_cache.stats()
+        lines += [
+            "# HELP superapp_figure_cache_lookups_total Chart figure cache lookups by result.",
+            "# TYPE superapp_figure_cache_lookups_total counter",
+            f'superapp_figure_cache_lookups_total{{result="hit"}} {figures["hits"]}',
+            f'superapp_figure_cache_lookups_total{{result="miss"}} {figures["misses"]}',
+            "# HELP superapp_figure_cache_bytes Serialized figure JSON held by the chart cache.",
+            "# TYPE superapp_figure_cache_bytes gauge",
+            f"superapp_figure_cache_bytes {figures['bytes']}",
+        ]
+
+        lines += [
+            "# HELP superapp_process_start_time_seconds Start time of the process.",
+            "# TYPE superapp_process_start_time_seconds gauge",
+            f"superapp_process_start_time_seconds {self.started:.3f}",
+        ]
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, file_path: str):
+        """Write the text format atomically so a collector never reads half a file"""
+        from utils.storage import atomic_write
+
+        atomic_write(file_path, self.prometheus_text().encode("utf-8"), durable=False)
+
+    def reset(self):
+        """Forget everything recorded so far"""
+        with self._lock:
+            self.operations.clear()
+            self.bytes.clear()
+
+    def _ensure_exporter(self):
+        if self._exporter is not None or not config.METRICS_FILE or config.METRICS_EXPORT_INTERVAL <= 0:
+            return
+        with self._lock:
+            if self._exporter is None:
+                self._exporter = threading.Thread(target=self._export_loop, name="metrics-export", daemon=True)
+                self._exporter.start()
+
+    def _export_loop(self):
+        while True:
+            time.sleep(config.METRICS_EXPORT_INTERVAL)
+            try:
+                self.write_prometheus(config.METRICS_FILE)
+            except OSError as e:
+                logger.warning(f"Could not write metrics to {config.METRICS_FILE}: {e}")
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(operation: str, collection: str) -> str:
+    return f'operation="{_escape(operation)}",collection="{_escape(collection)}"'
+
+
+# Shared by every session in the process
+metrics = Metrics()
+
+
+def timed(operation: str, collection: Optional[str] = None):
+    """Decorator recording a DataManager method's latency and record count.
+
+    The collection is the fixed `collection` or else the method's first
+    argument (its file name). Records are the length of a list result, or
+    of the list being saved for writes that return a bool.
+    """
+    def decorator(func: Callable):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            name = collection or (args[0] if args else kwargs.get("file_name", "unknown"))
+            start = time.perf_counter()
+            error = False
+            result = None
+            try:
+                result = func(self, *args, **kwargs)
+                return result
+            except Exception:
+                error = True
+                raise
+            finally:
+                elapsed = time.perf_counter() - start
+                if isinstance(result, list):
+                    records = len(result)
+                elif len(args) > 1 and isinstance(args[1], list):
+                    records = len(args[1])
+                else:
+                    records = 0
+                error = error or result is False
+                metrics.observe(operation, name, elapsed, records, error)
+                log_sampled(logger, f"{operation} {name}: {records} records in {elapsed * 1000:.2f} ms")
+        return wrapper
+    return decorator
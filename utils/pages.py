@@ -0,0 +1,56 @@
+# utils/pages.py - Compiled page modules for the app.py page loader
+import os
+import glob
+import logging
+from types import CodeType
+from typing import List
+
+from utils import config
+from utils.cache import FileCache
+
+logger = logging.getLogger(__name__)
+
+PAGES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "pages")
+
+
+def compile_page(file_path: str) -> CodeType:
+    """Read and compile a page once; tracebacks point at the page file"""
+    with open(file_path, "r", encoding="utf-8") as f:
+        source = f.read()
+    logger.debug(f"Compiled page {file_path}")
+    return compile(source, file_path, "exec")
+
+
+class PageRegistry:
+    """Code objects for the pages, keyed by path and file stamp.
+
+    A rerun costs one ``os.stat`` of the selected page; the source is only
+    read and compiled again after the file changes on disk.
+    """
+
+    def __init__(self, pages_dir: str = PAGES_DIR):
+        self.pages_dir = pages_dir
+        self._cache = FileCache()
+
+    def get(self, file_path: str) -> CodeType:
+        """Compiled code for a page file (raises FileNotFoundError if it is missing)"""
+        return self._cache.get(os.path.abspath(file_path), compile_page)
+
+    def preload(self) -> List[str]:
+        """Compile every page up front, skipping (and logging) pages that fail"""
+        loaded = []
+        for file_path in sorted(glob.glob(os.path.join(self.pages_dir, "*.py"))):
+            try:
+                self.get(file_path)
+                loaded.append(file_path)
+            except (OSError, SyntaxError) as e:
+                logger.error(f"Could not preload page {file_path}: {e}")
+        logger.info(f"Preloaded {len(loaded)} pages")
+        return loaded
+
+
+# Shared by every session in the process
+page_registry = PageRegistry()
+
+if config.PRELOAD_PAGES:
+    page_registry.preload()
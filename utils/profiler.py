@@ -0,0 +1,144 @@
+# utils/profiler.py - Startup profile: module import times and first page renders
+import builtins
+import importlib.util
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict
+
+# Report path; empty disables profiling. Read here rather than from utils.config
+# so installing the hook imports nothing that it should be timing.
+REPORT_PATH = os.environ.get("SUPERAPP_STARTUP_PROFILE", "")
+
+logger = logging.getLogger(__name__)
+
+
+class StartupProfiler:
+    """Times every import that loads new modules and the first render of each page.
+
+    Imports are timed by wrapping ``builtins.__import__``: each call that
+    adds modules to ``sys.modules`` is recorded with its inclusive time and
+    its own (self) time with nested imports taken out. The report is
+    rewritten after each first page render, so it is current while the
+    server keeps running.
+    """
+
+    def __init__(self, report_path: str):
+        self.report_path = report_path
+        self.started = time.perf_counter()
+        self.started_at = datetime.now().isoformat()
+        self.imports: Dict[str, Dict] = {}
+        self.pages: Dict[str, float] = {}
+        self.shell_ms = None
+        # Per-thread stack of time spent in nested imports (sessions run on their own threads)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._original_import = builtins.__import__
+
+    def install(self):
+        """Start timing imports"""
+        builtins.__import__ = self._timed_import
+
+    def uninstall(self):
+        """Stop timing imports"""
+        builtins.__import__ = self._original_import
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+
+        before = len(sys.modules)
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            nested = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            loaded = len(sys.modules) - before
+            if loaded > 0:
+                self._record_import(name, globals, level, elapsed, elapsed - nested, loaded)
+
+    def _record_import(self, name, globals, level, elapsed, own, loaded):
+        if level:
+            package = (globals or {}).get("__package__") or ""
+            try:
+                name = importlib.util.resolve_name("." * level + name, package)
+            except (ImportError, ValueError):
+                pass
+        entry = self.imports.setdefault(name, {"module": name, "inclusive_ms": 0.0, "self_ms": 0.0, "modules_loaded": 0})
+        entry["inclusive_ms"] += elapsed * 1000
+        entry["self_ms"] += own * 1000
+        entry["modules_loaded"] += loaded
+
+    def mark_shell_ready(self):
+        """Record time from install until the app shell reaches the page loader (first run only)"""
+        if self.shell_ms is None:
+            self.shell_ms = (time.perf_counter() - self.started) * 1000
+
+    @contextmanager
+    def page_render(self, page: str):
+        """Time the first render of a page in this process"""
+        if page in self.pages:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.pages[page] = (time.perf_counter() - start) * 1000
+            self.write_report()
+
+    def report(self) -> Dict:
+        """The profile as a JSON-ready dict, slowest imports first"""
+        imports = sorted(self.imports.values(), key=lambda entry: entry["inclusive_ms"], reverse=True)
+        return {
+            "started_at": self.started_at,
+            "python": sys.version.split()[0],
+            "shell_ms": round(self.shell_ms, 2) if self.shell_ms is not None else None,
+            "first_render_ms": {page: round(ms, 2) for page, ms in self.pages.items()},
+            "imports": [
+                {**entry, "inclusive_ms": round(entry["inclusive_ms"], 2), "self_ms": round(entry["self_ms"], 2)}
+                for entry in imports
+            ],
+        }
+
+    def write_report(self):
+        """Write the report file (a failed write never breaks the page)"""
+        from utils.storage import atomic_write
+
+        with self._lock:
+            try:
+                payload = json.dumps(self.report(), indent=4, ensure_ascii=False).encode("utf-8")
+                atomic_write(self.report_path, payload, durable=False)
+            except OSError as e:
+                logger.error(f"Could not write startup profile to {self.report_path}: {e}")
+
+
+# One profiler per process, installed by app.py before it imports anything else
+profiler = StartupProfiler(REPORT_PATH) if REPORT_PATH else None
+
+
+def start():
+    """Install the import hook if SUPERAPP_STARTUP_PROFILE is set"""
+    if profiler is not None and builtins.__import__ != profiler._timed_import:
+        profiler.install()
+
+
+@contextmanager
+def page_render(page: str):
+    """Time a page's first render when profiling, otherwise do nothing"""
+    if profiler is None:
+        yield
+        return
+    profiler.mark_shell_ready()
+    with profiler.page_render(page):
+        yield
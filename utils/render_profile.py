@@ -0,0 +1,179 @@
+# utils/render_profile.py - Admin-only cProfile/tracemalloc capture of one page render
+import cProfile
+import marshal
+import os
+import pstats
+import time
+import tracemalloc
+import logging
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List
+
+import streamlit as st
+
+from utils.auth import ADMIN_ROLES
+
+logger = logging.getLogger(__name__)
+
+# ?profile=1 captures the page being opened
+QUERY_PARAM = "profile"
+
+# Session keys: the page whose next render is captured, and the last capture
+REQUEST_KEY = "_profile_next_render"
+RESULT_KEY = "_render_profile"
+
+TOP_FUNCTIONS = 25
+TOP_ALLOCATIONS = 15
+TRACEMALLOC_FRAMES = 5
+
+# Allocation sites that belong to the capture itself rather than the page
+IGNORED_ALLOCATIONS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, __file__),
+]
+
+
+class RenderCapture:
+    """cProfile plus tracemalloc around one render.
+
+    cProfile sees only the script thread of this session. tracemalloc is
+    process-wide, so allocations by other sessions rendering at the same
+    time are counted too; on a quiet server they are noise.
+    """
+
+    def __init__(self, page: str):
+        self.page = page
+        self.profile = cProfile.Profile()
+        self._owns_tracemalloc = False
+        self._started = 0.0
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+            self._owns_tracemalloc = True
+        tracemalloc.reset_peak()
+        self._started = time.perf_counter()
+        self.profile.enable()
+
+    def stop(self) -> Dict:
+        """Stop both tools and return the capture as plain data"""
+        self.profile.disable()
+        wall_ms = (time.perf_counter() - self._started) * 1000
+        snapshot = tracemalloc.take_snapshot().filter_traces(IGNORED_ALLOCATIONS)
+        _, peak = tracemalloc.get_traced_memory()
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+
+        # pstats takes the profile's stats over, so read them once and share
+        stats = pstats.Stats(self.profile)
+        return {
+            "page": self.page,
+            "captured_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "wall_ms": round(wall_ms, 1),
+            "peak_kb": round(peak / 1024, 1),
+            "functions": top_functions(stats),
+            "allocations": top_allocations(snapshot),
+            # The .prof format read by pstats, snakeviz and friends
+            "prof": marshal.dumps(stats.stats),
+        }
+
+
+def top_functions(stats: pstats.Stats, limit: int = TOP_FUNCTIONS) -> List[Dict]:
+    """Functions with the most cumulative time"""
+    rows = []
+    for (file_name, line, name), (primitive, calls, own, cumulative, _) in stats.stats.items():
+        rows.append({
+            "function": name if file_name == "~" else f"{name} ({_short_path(file_name)}:{line})",
+            "calls": calls,
+            "primitive_calls": primitive,
+            "tottime_ms": round(own * 1000, 2),
+            "cumtime_ms": round(cumulative * 1000, 2),
+        })
+    rows.sort(key=lambda row: row["cumtime_ms"], reverse=True)
+    return rows[:limit]
+
+
+def top_allocations(snapshot: tracemalloc.Snapshot, limit: int = TOP_ALLOCATIONS) -> List[Dict]:
+    """Source lines holding the most memory allocated during the render"""
+    return [
+        {
+            "site": f"{_short_path(stat.traceback[0].filename)}:{stat.traceback[0].lineno}",
+            "size_kb": round(stat.size / 1024, 1),
+            "blocks": stat.count,
+        }
+        for stat in snapshot.statistics("lineno")[:limit]
+    ]
+
+
+def _short_path(file_name: str) -> str:
+    """Path relative to the app or to site-packages, so table rows stay readable"""
+    if "site-packages" in file_name:
+        return file_name.split("site-packages" + os.sep, 1)[1]
+    try:
+        relative = os.path.relpath(file_name)
+    except ValueError:
+        return file_name
+    return file_name if relative.startswith("..") else relative
+
+
+def request_capture(page: str):
+    """Profile the next render of page in this session"""
+    st.session_state[REQUEST_KEY] = page
+
+
+def _capture_wanted(page: str) -> bool:
+    if st.session_state.get("employee", {}).get("role") not in ADMIN_ROLES:
+        return False
+    if st.query_params.get(QUERY_PARAM):
+        del st.query_params[QUERY_PARAM]
+        return True
+    if st.session_state.get(REQUEST_KEY) == page:
+        del st.session_state[REQUEST_KEY]
+        return True
+    return False
+
+
+@contextmanager
+def capture_render(page: str):
+    """Profile this render of page if an admin asked for it, otherwise do nothing"""
+    if not _capture_wanted(page):
+        yield
+        return
+    capture = RenderCapture(page)
+    capture.start()
+    try:
+        yield
+    finally:
+        # Also runs for st.stop/st.rerun, which end a render by raising
+        st.session_state[RESULT_KEY] = capture.stop()
+        logger.info(f"Captured render profile of {page}")
+
+
+def _dismiss():
+    st.session_state.pop(RESULT_KEY, None)
+
+
+def show_render_profile():
+    """Show the last capture of this session with a .prof download"""
+    result = st.session_state.get(RESULT_KEY)
+    if not result:
+        return
+    with st.expander(f"🔬 Render profile: {result['page']} ({result['captured_at']})", expanded=True):
+        col1, col2 = st.columns(2)
+        col1.metric("Render time", f"{result['wall_ms']:.0f} ms")
+        col2.metric("Peak traced memory", f"{result['peak_kb']:,.0f} KB")
+
+        st.markdown("**Top functions by cumulative time**")
+        st.dataframe(result["functions"], use_container_width=True, hide_index=True)
+        st.markdown("**Top allocation sites**")
+        st.dataframe(result["allocations"], use_container_width=True, hide_index=True)
+
+        slug = "".join(ch for ch in result["page"] if ch.isalnum() or ch in " -").strip().replace(" ", "-").lower()
+        col1, col2 = st.columns(2)
+        col1.download_button("⬇️ Download .prof", result["prof"],
+                             file_name=f"{slug or 'page'}-{result['captured_at'].replace(' ', '_').replace(':', '')}.prof",
+                             mime="application/octet-stream", use_container_width=True)
+        col2.button("Dismiss", on_click=_dismiss, use_container_width=True)
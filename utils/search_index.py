@@ -0,0 +1,120 @@
+# utils/search_index.py - Inverted full-text index over posts with BM25 ranking
+import math
+import re
+import threading
+from bisect import bisect_left
+from typing import Dict, Iterator, List, Tuple
+
+TOKEN_RE = re.compile(r"\w+")
+
+# Term frequency weight per field: a hit in the title or a tag counts double
+FIELD_WEIGHTS = {"title": 2.0, "content": 1.0, "tags": 2.0}
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens of a text"""
+    return TOKEN_RE.findall(text.casefold())
+
+
+class SearchIndex:
+    """Postings from term to {doc: weighted term frequency} for post text.
+
+    Documents are numbered in the order they are added (the same numbering
+    FeedIndex uses), so a search can be checked against the caller's
+    visibility index without going back to the posts. Every query term is a
+    prefix, terms are ANDed, and matches are ranked with BM25.
+
+    New terms are only collected while posts are added; the sorted term
+    list prefix lookups bisect is brought up to date on the next search.
+    """
+
+    def __init__(self):
+        self.postings: Dict[str, Dict[int, float]] = {}
+        # Sorted terms, plus terms added since it was last sorted
+        self.terms: List[str] = []
+        self._new_terms: List[str] = []
+        self._terms_lock = threading.Lock()
+        self.lengths: List[float] = []
+        self.total_length = 0.0
+
+    def add(self, post: Dict) -> int:
+        """Index one post and return its document number"""
+        doc = len(self.lengths)
+        counts: Dict[str, float] = {}
+        fields = {
+            "title": post.get("title", ""),
+            "content": post.get("content", ""),
+            "tags": " ".join(post.get("tags", [])),
+        }
+        for field, text in fields.items():
+            for term in tokenize(text or ""):
+                counts[term] = counts.get(term, 0.0) + FIELD_WEIGHTS[field]
+
+        for term, weight in counts.items():
+            postings = self.postings.get(term)
+            if postings is None:
+                postings = self.postings[term] = {}
+                with self._terms_lock:
+                    self._new_terms.append(term)
+            postings[doc] = weight
+
+        length = sum(counts.values())
+        self.lengths.append(length)
+        self.total_length += length
+        return doc
+
+    def sorted_terms(self) -> List[str]:
+        """Every indexed term in order, merging in terms added since the last call"""
+        with self._terms_lock:
+            if self._new_terms:
+                # Two sorted runs: the sort only merges them, linear in the vocabulary
+                terms = self.terms + sorted(self._new_terms)
+                terms.sort()
+                self.terms = terms
+                self._new_terms = []
+            return self.terms
+
+    def expand(self, prefix: str) -> Iterator[str]:
+        """Indexed terms starting with prefix"""
+        terms = self.sorted_terms()
+        for i in range(bisect_left(terms, prefix), len(terms)):
+            if not terms[i].startswith(prefix):
+                break
+            yield terms[i]
+
+    def search(self, query: str) -> List[Tuple[int, float]]:
+        """Documents matching every query term as (doc, score), best first"""
+        words = tokenize(query)
+        if not words or not self.lengths:
+            return []
+
+        n = len(self.lengths)
+        avg_length = self.total_length / n or 1.0
+        scores: Dict[int, float] = {}
+        matched = None
+
+        # Rarest terms first so the AND intersection shrinks quickly
+        expansions = sorted(
+            ([(term, self.postings[term]) for term in self.expand(word)] for word in set(words)),
+            key=lambda terms: sum(len(postings) for _, postings in terms)
+        )
+        for terms in expansions:
+            word_scores: Dict[int, float] = {}
+            for term, postings in terms:
+                idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc, tf in postings.items():
+                    if matched is not None and doc not in matched:
+                        continue
+                    norm = tf + K1 * (1 - B + B * self.lengths[doc] / avg_length)
+                    word_scores[doc] = word_scores.get(doc, 0.0) + idf * tf * (K1 + 1) / norm
+
+            matched = set(word_scores)
+            if not matched:
+                return []
+            scores = {doc: scores.get(doc, 0.0) + score for doc, score in word_scores.items()}
+
+        return sorted(((doc, scores[doc]) for doc in matched), key=lambda item: (-item[1], -item[0]))
@@ -0,0 +1,74 @@
+# utils/sequences.py - Persistent per-collection ID sequences
+import json
+import os
+import threading
+import logging
+from typing import Callable, Dict, Optional
+
+from utils import config
+from utils.storage import atomic_write, collection_lock, read_json_file
+
+logger = logging.getLogger(__name__)
+
+
+class SequenceStore:
+    """One counter per collection, kept in a small JSON file next to the data.
+
+    Each process takes ids from the file ``block_size`` at a time, under its
+    lock, and hands them out from memory; the file is only rewritten (and
+    fsynced) when a block runs out, and ids stay unique across processes.
+    Ids left in a block when a process exits are never used, so a
+    collection's ids can have gaps and, across processes, are not in insert
+    order. A collection without a counter is seeded once from its highest
+    existing id.
+    """
+
+    def __init__(self, data_dir: str, seed: Optional[Callable[[str], int]] = None,
+                 file_name: str = "sequences.json", block_size: int = config.SEQUENCE_BLOCK_SIZE):
+        self.path = os.path.join(data_dir, file_name)
+        self.seed = seed or (lambda collection: 0)
+        self.block_size = max(1, block_size)
+        # Unused part of the block this process holds, per collection
+        self._blocks: Dict[str, range] = {}
+        self._lock = threading.Lock()
+
+    def next_id(self, collection: str) -> int:
+        """Allocate one id"""
+        return self.reserve(collection, 1).start
+
+    def reserve(self, collection: str, count: int) -> range:
+        """Allocate consecutive ids, e.g. for a bulk insert"""
+        if count < 1:
+            raise ValueError("count must be at least 1")
+
+        with self._lock:
+            block = self._blocks.get(collection, range(0))
+            if len(block) < count:
+                # What is left of the old block is skipped so the ids stay consecutive
+                block = self._allocate(collection, max(count, self.block_size))
+            self._blocks[collection] = block[count:]
+            return block[:count]
+
+    def _allocate(self, collection: str, count: int) -> range:
+        """Take count ids from the shared counters file"""
+        with collection_lock(self.path):
+            counters = self._read()
+            current = counters.get(collection)
+            if current is None:
+                current = self.seed(collection)
+                logger.info(f"Seeded id sequence for {collection} at {current}")
+
+            counters[collection] = current + count
+            atomic_write(self.path, json.dumps(counters, indent=4).encode("utf-8"))
+
+        return range(current + 1, current + count + 1)
+
+    def current(self, collection: str) -> Optional[int]:
+        """Last id reserved from the file for a collection (by any process), or None before the first"""
+        return self._read().get(collection)
+
+    def _read(self) -> Dict[str, int]:
+        if not os.path.exists(self.path):
+            return {}
+        counters = read_json_file(self.path)
+        return counters if isinstance(counters, dict) else {}
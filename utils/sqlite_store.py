@@ -0,0 +1,400 @@
+# utils/sqlite_store.py - Optional SQLite engine (SUPERAPP_STORAGE=sqlite)
+import json
+import os
+import sqlite3
+import threading
+import logging
+from typing import List, Dict, Optional, Tuple
+
+from utils import config
+from utils.data import DataManager
+from utils.feed_index import FeedCursor
+from utils.metrics import log_sampled, metrics, timed
+from utils.search_index import FIELD_WEIGHTS, tokenize
+from utils.storage import JsonStorage, JsonlStorage
+
+logger = logging.getLogger(__name__)
+
+# Record fields copied into real columns so queries can filter on them through an index
+INDEXED_FIELDS = ["id", "department", "assigned_to", "status", "route_to", "timestamp", "author", "is_vip"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    collection TEXT NOT NULL,
+    id,
+    department TEXT,
+    assigned_to TEXT,
+    status TEXT,
+    route_to TEXT,
+    timestamp TEXT,
+    author TEXT,
+    is_vip INTEGER NOT NULL DEFAULT 0,
+    body TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS collections (name TEXT PRIMARY KEY);
+-- Bumped in the same transaction as every write, so readers can tell when a collection changed
+CREATE TABLE IF NOT EXISTS collection_versions (name TEXT PRIMARY KEY, version INTEGER NOT NULL);
+CREATE INDEX IF NOT EXISTS idx_records_id ON records (collection, id);
+CREATE INDEX IF NOT EXISTS idx_records_department ON records (collection, department);
+CREATE INDEX IF NOT EXISTS idx_records_assigned_to ON records (collection, assigned_to);
+CREATE INDEX IF NOT EXISTS idx_records_status ON records (collection, status);
+CREATE INDEX IF NOT EXISTS idx_records_route_to ON records (collection, route_to);
+CREATE INDEX IF NOT EXISTS idx_records_timestamp ON records (collection, timestamp);
+
+-- Full-text index over posts, keyed by records.seq and kept in step by triggers
+CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5(title, content, tags);
+CREATE TRIGGER IF NOT EXISTS posts_fts_insert AFTER INSERT ON records
+WHEN new.collection = 'posts.json' BEGIN
+    INSERT INTO posts_fts (rowid, title, content, tags) VALUES (
+        new.seq, json_extract(new.body, '$.title'), json_extract(new.body, '$.content'),
+        (SELECT group_concat(value, ' ') FROM json_each(new.body, '$.tags'))
+    );
+END;
+CREATE TRIGGER IF NOT EXISTS posts_fts_delete AFTER DELETE ON records
+WHEN old.collection = 'posts.json' BEGIN
+    DELETE FROM posts_fts WHERE rowid = old.seq;
+END;
+CREATE TRIGGER IF NOT EXISTS posts_fts_update AFTER UPDATE OF body ON records
+WHEN new.collection = 'posts.json' BEGIN
+    DELETE FROM posts_fts WHERE rowid = old.seq;
+    INSERT INTO posts_fts (rowid, title, content, tags) VALUES (
+        new.seq, json_extract(new.body, '$.title'), json_extract(new.body, '$.content'),
+        (SELECT group_concat(value, ' ') FROM json_each(new.body, '$.tags'))
+    );
+END;
+"""
+
+# Posts stored before the full-text table existed
+BACKFILL_POSTS_FTS = """
+INSERT INTO posts_fts (rowid, title, content, tags)
+SELECT seq, json_extract(body, '$.title'), json_extract(body, '$.content'),
+       (SELECT group_concat(value, ' ') FROM json_each(records.body, '$.tags'))
+FROM records
+WHERE collection = 'posts.json' AND seq NOT IN (SELECT rowid FROM posts_fts)
+"""
+
+
+def _row_values(file_name: str, record: Dict) -> tuple:
+    """Column values for one record"""
+    values = [record.get(field) for field in INDEXED_FIELDS]
+    values[INDEXED_FIELDS.index("is_vip")] = 1 if record.get("is_vip") else 0
+    return (file_name, *values, json.dumps(record, ensure_ascii=False))
+
+
+class SqliteStorage(JsonStorage):
+    """SQLite engine in WAL mode: one row per record with the filter fields indexed.
+
+    Collections still stored as JSONL logs or JSON arrays are imported the
+    first time they are touched.
+    """
+
+    def __init__(self, data_dir: str, db_name: str = config.SQLITE_DB):
+        super().__init__(data_dir)
+        self.db_path = os.path.join(data_dir, db_name)
+        self._local = threading.local()
+        self._imported = set()
+        self._import_lock = threading.Lock()
+
+        with self.connection() as conn:
+            conn.executescript(SCHEMA)
+            conn.execute(BACKFILL_POSTS_FTS)
+
+    def connection(self) -> sqlite3.Connection:
+        """Per-thread connection (Streamlit runs each session on its own thread)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def collection(self, file_name: str) -> sqlite3.Connection:
+        """Connection with the collection imported and ready to query"""
+        conn = self.connection()
+        if file_name not in self._imported:
+            with self._import_lock:
+                self._import_legacy(conn, file_name)
+                self._imported.add(file_name)
+        return conn
+
+    def load(self, file_name: str) -> List[Dict]:
+        """Load a collection in insertion order"""
+        try:
+            rows = self.collection(file_name).execute(
+                "SELECT body FROM records WHERE collection = ? ORDER BY seq", (file_name,)
+            ).fetchall()
+            metrics.add_bytes(file_name, read=sum(len(body) for (body,) in rows))
+            log_sampled(logger, f"Loaded {len(rows)} records from {file_name}")
+            return [json.loads(body) for (body,) in rows]
+        except Exception as e:
+            logger.error(f"Error loading {file_name}: {e}")
+            return []
+
+    def save(self, file_name: str, data: List[Dict]) -> bool:
+        """Replace a whole collection in one transaction"""
+        try:
+            with self.collection(file_name) as conn:
+                conn.execute("DELETE FROM records WHERE collection = ?", (file_name,))
+                self._insert(conn, file_name, data)
+            log_sampled(logger, f"Saved {len(data)} records to {file_name}")
+            return True
+        except Exception as e:
+            logger.error(f"Error saving {file_name}: {e}")
+            return False
+
+    def append(self, file_name: str, record: Dict) -> bool:
+        """Insert one row"""
+        return self.append_many(file_name, [record])
+
+    def append_many(self, file_name: str, records: List[Dict]) -> bool:
+        """Insert a batch of rows in one transaction"""
+        try:
+            with self.collection(file_name) as conn:
+                self._insert(conn, file_name, records)
+            return True
+        except Exception as e:
+            logger.error(f"Error appending to {file_name}: {e}")
+            return False
+
+    def update(self, file_name: str, record_id, changes: Dict) -> bool:
+        """Merge changes into the first record with the given id"""
+        try:
+            with self.collection(file_name) as conn:
+                row = conn.execute(
+                    "SELECT seq, body FROM records WHERE collection = ? AND id = ? ORDER BY seq LIMIT 1",
+                    (file_name, record_id)
+                ).fetchone()
+                if row is None:
+                    return False
+
+                seq, body = row
+                record = json.loads(body)
+                record.update(changes)
+                values = _row_values(file_name, record)
+                conn.execute(
+                    f"UPDATE records SET {', '.join(f'{field} = ?' for field in INDEXED_FIELDS)}, body = ? WHERE seq = ?",
+                    (*values[1:], seq)
+                )
+                self._bump_version(conn, file_name)
+            return True
+        except Exception as e:
+            logger.error(f"Error updating {file_name}: {e}")
+            return False
+
+    def _insert(self, conn: sqlite3.Connection, file_name: str, records: List[Dict]):
+        columns = ["collection", *INDEXED_FIELDS, "body"]
+        rows = [_row_values(file_name, record) for record in records]
+        conn.executemany(
+            f"INSERT INTO records ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})",
+            rows
+        )
+        self._bump_version(conn, file_name)
+        metrics.add_bytes(file_name, written=sum(len(row[-1]) for row in rows))
+
+    def _bump_version(self, conn: sqlite3.Connection, file_name: str):
+        conn.execute(
+            "INSERT INTO collection_versions (name, version) VALUES (?, 1) "
+            "ON CONFLICT (name) DO UPDATE SET version = version + 1",
+            (file_name,)
+        )
+
+    def version(self, file_name: str) -> Optional[tuple]:
+        """Write counter of a collection; changes with every insert, update or save"""
+        row = self.collection(file_name).execute(
+            "SELECT version FROM collection_versions WHERE name = ?", (file_name,)
+        ).fetchone()
+        return (row[0] if row else 0,)
+
+    def snapshot(self, file_name: str) -> Tuple[List[Dict], Optional[tuple]]:
+        """Records plus the collection version they reflect"""
+        version = self.version(file_name)
+        return self.load(file_name), version
+
+    def tail(self, file_name: str, cursor: Optional[tuple]) -> Tuple[Optional[List[Dict]], Optional[tuple]]:
+        """[] while the collection version still matches cursor, otherwise (None, None) to re-snapshot"""
+        if cursor is not None and self.version(file_name) == cursor:
+            return [], cursor
+        return None, None
+
+    def _import_legacy(self, conn: sqlite3.Connection, file_name: str):
+        """Copy a collection from its JSONL log or JSON array the first time it is used"""
+        if conn.execute("SELECT 1 FROM collections WHERE name = ?", (file_name,)).fetchone():
+            return
+
+        jsonl = JsonlStorage(self.data_dir)
+        if os.path.exists(jsonl.log_path(file_name)):
+            records = jsonl.load(file_name)
+        elif os.path.exists(self.path(file_name)):
+            records = JsonStorage.load(self, file_name)
+        else:
+            records = []
+
+        # Another process may be importing the same collection; only the first one wins
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if conn.execute("SELECT 1 FROM collections WHERE name = ?", (file_name,)).fetchone():
+                conn.rollback()
+                return
+            conn.execute("INSERT INTO collections (name) VALUES (?)", (file_name,))
+            self._insert(conn, file_name, records)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+        if records:
+            logger.info(f"Imported {len(records)} records from legacy {file_name}")
+
+
+class SqliteDataManager(DataManager):
+    """DataManager whose queries run as indexed SQL instead of Python scans"""
+
+    def __init__(self):
+        super().__init__()
+        # Analytics are indexed GROUP BY queries here; no counter file to maintain
+        self.counters = None
+
+    @timed("get_posts_for_user", "posts.json")
+    def get_posts_for_user(self, user_department: str, user_role: str, user_name: str,
+                           limit: Optional[int] = None, cursor: Optional[FeedCursor] = None,
+                           vip: Optional[bool] = None) -> List[Dict]:
+        """Get posts visible to user, newest first, optionally one page after cursor"""
+        try:
+            c_suite = 1 if self.is_c_suite(user_role) else 0
+            regular = "(is_vip = 0 AND department IN ('All', ?))"
+            vip_visible = """(is_vip = 1 AND (
+                ? OR author = ?
+                OR EXISTS (SELECT 1 FROM json_each(records.body, '$.vip_recipients') WHERE value = ?)
+            ))"""
+            clauses, params = [], []
+            if vip is not True:
+                clauses.append(regular)
+                params.append(user_department)
+            if vip is not False:
+                clauses.append(vip_visible)
+                params.extend([c_suite, user_name, user_name])
+
+            return self._feed_query("(" + " OR ".join(clauses) + ")", params, cursor, limit)
+
+        except Exception as e:
+            logger.error(f"Error getting posts for user: {e}")
+            return []
+
+    def get_department_posts(self, department: str, limit: Optional[int] = None,
+                             cursor: Optional[FeedCursor] = None) -> List[Dict]:
+        """Get every post addressed to a department, VIP ones included, newest first"""
+        try:
+            return self._feed_query("department = ?", [department], cursor, limit)
+
+        except Exception as e:
+            logger.error(f"Error getting posts for {department}: {e}")
+            return []
+
+    def _feed_query(self, condition: str, params: List, cursor: Optional[FeedCursor],
+                    limit: Optional[int]) -> List[Dict]:
+        """Posts matching condition in feed order, starting below cursor"""
+        if cursor is not None:
+            condition += " AND (COALESCE(timestamp, '') < ? OR (COALESCE(timestamp, '') = ? AND id < ?))"
+            params = [*params, cursor[0], cursor[0], cursor[1]]
+        rows = self.storage.collection("posts.json").execute(
+            f"""
+            SELECT body FROM records
+            WHERE collection = 'posts.json' AND {condition}
+            ORDER BY COALESCE(timestamp, '') DESC, id DESC, seq DESC
+            LIMIT ?
+            """,
+            (*params, -1 if limit is None else limit)
+        ).fetchall()
+        return [json.loads(body) for (body,) in rows]
+
+    def get_user_tasks(self, user_name: str) -> List[Dict]:
+        """Get tasks assigned to user, by deadline then priority"""
+        try:
+            rows = self.storage.collection("tasks.json").execute(
+                """
+                SELECT body FROM records
+                WHERE collection = 'tasks.json' AND assigned_to = ?
+                ORDER BY
+                    COALESCE(json_extract(body, '$.deadline'), '9999-12-31'),
+                    CASE COALESCE(json_extract(body, '$.priority'), 'Medium')
+                        WHEN 'High' THEN 1 WHEN 'Low' THEN 3 ELSE 2 END,
+                    seq
+                """,
+                (user_name,)
+            ).fetchall()
+            return [json.loads(body) for (body,) in rows]
+
+        except Exception as e:
+            logger.error(f"Error getting user tasks: {e}")
+            return []
+
+    @timed("search_posts", "posts.json")
+    def search_posts(self, query: str, user_department: str, user_role: str, user_name: str) -> List[Dict]:
+        """Search posts with user visibility rules through the FTS5 index, best match first"""
+        if not query or not query.strip():
+            return self.get_posts_for_user(user_department, user_role, user_name)
+
+        # Every word is a prefix and all of them must match, as in SearchIndex
+        words = tokenize(query)
+        if not words:
+            return []
+        match = " AND ".join(f'"{word}"*' for word in words)
+
+        try:
+            rows = self.storage.collection("posts.json").execute(
+                """
+                SELECT records.body FROM posts_fts
+                JOIN records ON records.seq = posts_fts.rowid
+                WHERE posts_fts MATCH ? AND (
+                    (is_vip = 0 AND department IN ('All', ?))
+                    OR (is_vip = 1 AND (
+                        ? OR author = ?
+                        OR EXISTS (SELECT 1 FROM json_each(records.body, '$.vip_recipients') WHERE value = ?)
+                    ))
+                )
+                ORDER BY bm25(posts_fts, ?, ?, ?), records.seq DESC
+                """,
+                (match, user_department, 1 if self.is_c_suite(user_role) else 0, user_name, user_name,
+                 FIELD_WEIGHTS["title"], FIELD_WEIGHTS["content"], FIELD_WEIGHTS["tags"])
+            ).fetchall()
+            return [json.loads(body) for (body,) in rows]
+
+        except Exception as e:
+            logger.error(f"Error searching posts: {e}")
+            return []
+
+    @timed("get_analytics_data", "analytics")
+    def get_analytics_data(self) -> Dict:
+        """Get analytics data for dashboard from indexed aggregates"""
+        try:
+            def count(file_name):
+                conn = self.storage.collection(file_name)
+                return conn.execute(
+                    "SELECT COUNT(*) FROM records WHERE collection = ?", (file_name,)
+                ).fetchone()[0]
+
+            def group(file_name, column):
+                conn = self.storage.collection(file_name)
+                rows = conn.execute(
+                    f"SELECT COALESCE({column}, 'Unknown'), COUNT(*) FROM records "
+                    f"WHERE collection = ? GROUP BY 1 ORDER BY MIN(seq)",
+                    (file_name,)
+                ).fetchall()
+                return dict(rows)
+
+            return {
+                "total_posts": count("posts.json"),
+                "total_tasks": count("tasks.json"),
+                "total_feedback": count("feedback.json"),
+                "total_meetings": count("scheduled_meetings.json"),
+                "posts_by_department": group("posts.json", "department"),
+                "tasks_by_status": group("tasks.json", "status"),
+                "feedback_by_route": group("feedback.json", "route_to"),
+                "recent_activity": []
+            }
+
+        except Exception as e:
+            logger.error(f"Error getting analytics data: {e}")
+            return {}
@@ -0,0 +1,501 @@
+# utils/storage.py - Storage engines behind DataManager
+import json
+import os
+import shutil
+import stat
+import tempfile
+import threading
+import logging
+from contextlib import contextmanager
+from datetime import datetime
+from typing import List, Dict, Optional, Tuple
+
+from utils import config
+from utils.cache import file_cache, file_stamp
+from utils.metrics import log_sampled, metrics
+
+# fcntl is POSIX-only; without it writers are serialized within this process only
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+_path_locks: Dict[str, threading.Lock] = {}
+_path_locks_guard = threading.Lock()
+_held_locks = threading.local()
+
+
+@contextmanager
+def collection_lock(file_path: str):
+    """Exclusive advisory lock serializing writers of one collection across threads and processes.
+
+    Re-entering the lock from the thread that already holds it is a no-op.
+    """
+    held = getattr(_held_locks, "paths", None)
+    if held is None:
+        held = _held_locks.paths = set()
+    if file_path in held:
+        yield
+        return
+
+    with _path_locks_guard:
+        thread_lock = _path_locks.setdefault(file_path, threading.Lock())
+
+    with thread_lock:
+        held.add(file_path)
+        try:
+            if fcntl is None:
+                yield
+                return
+            with open(f"{file_path}.lock", "a") as lock_file:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+        finally:
+            held.discard(file_path)
+
+
+def _fsync_directory(directory: str):
+    """Persist a rename; not supported on Windows, where it is skipped"""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def make_backup(file_path: str):
+    """Keep the current version as <file>.bak by hardlinking it (no bytes are copied)"""
+    backup_path = f"{file_path}.bak"
+    try:
+        if os.path.exists(backup_path):
+            os.unlink(backup_path)
+        os.link(file_path, backup_path)
+    except OSError:
+        # Filesystems without hardlinks fall back to a copy
+        shutil.copy2(file_path, backup_path)
+
+
+def atomic_write(file_path: str, payload: bytes, backup: bool = False, durable: bool = True):
+    """Write a file via temp file, fsync and os.replace so readers never see a partial file.
+
+    With backup=True the version being replaced is kept as <file>.bak.
+    durable=False skips the fsyncs for derived files that can be rebuilt.
+    """
+    directory = os.path.dirname(file_path) or "."
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(file_path)}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+
+        # mkstemp creates files as 0600; keep the permissions an ordinary open() would give
+        if os.path.exists(file_path):
+            os.chmod(tmp_path, stat.S_IMODE(os.stat(file_path).st_mode))
+            if backup:
+                make_backup(file_path)
+        else:
+            os.chmod(tmp_path, 0o644)
+
+        os.replace(tmp_path, file_path)
+        if durable:
+            _fsync_directory(directory)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def read_json_file(file_path: str) -> List[Dict]:
+    """Read a JSON array file, tolerating BOMs and empty files"""
+    with open(file_path, "rb") as f:
+        raw = f.read()
+
+    # Files saved from PowerShell are UTF-16 with a BOM
+    if raw.startswith((b"\xff\xfe", b"\xfe\xff")):
+        text = raw.decode("utf-16")
+    else:
+        text = raw.decode("utf-8-sig")
+
+    if not text.strip():
+        return []
+    return json.loads(text)
+
+
+class JsonStorage:
+    """Legacy engine: every collection is a single JSON array file"""
+
+    def __init__(self, data_dir: str):
+        self.data_dir = data_dir
+
+    def path(self, file_name: str) -> str:
+        """Path of the file backing a collection"""
+        return os.path.join(self.data_dir, file_name)
+
+    def load(self, file_name: str) -> List[Dict]:
+        """Load a collection with error handling (cached until the file changes)"""
+        file_path = self.path(file_name)
+
+        try:
+            if not os.path.exists(file_path):
+                logger.info(f"File {file_name} not found, creating empty file")
+                with open(file_path, "w", encoding="utf-8") as f:
+                    json.dump([], f)
+                return []
+
+            return list(file_cache.get(file_path, self._read))
+
+        except json.JSONDecodeError as e:
+            logger.error(f"JSON decode error in {file_name}: {e}")
+            return self._recover(file_name)
+
+        except Exception as e:
+            logger.error(f"Error loading {file_name}: {e}")
+            return []
+
+    def _read(self, file_path: str) -> List[Dict]:
+        data = read_json_file(file_path)
+        file_name = os.path.basename(file_path)
+        metrics.add_bytes(file_name, read=os.path.getsize(file_path))
+        log_sampled(logger, f"Loaded {len(data)} records from {file_name}")
+        return data
+
+    def _recover(self, file_name: str) -> List[Dict]:
+        """Move a corrupted file aside and fall back to the last good version"""
+        file_path = self.path(file_name)
+        backup_path = f"{file_path}.backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        try:
+            with collection_lock(file_path):
+                os.rename(file_path, backup_path)
+                logger.info(f"Corrupted file backed up to {backup_path}")
+                if os.path.exists(f"{file_path}.bak"):
+                    os.link(f"{file_path}.bak", file_path)
+                    logger.info(f"Restored {file_name} from {file_path}.bak")
+                    return read_json_file(file_path)
+        except Exception as e:
+            logger.error(f"Could not recover {file_name}: {e}")
+        return []
+
+    def save(self, file_name: str, data: List[Dict]) -> bool:
+        """Save a whole collection atomically, keeping the previous version as .bak"""
+        file_path = self.path(file_name)
+
+        try:
+            with collection_lock(file_path):
+                self._write(file_path, data)
+            log_sampled(logger, f"Saved {len(data)} records to {file_name}")
+            return True
+
+        except Exception as e:
+            logger.error(f"Error saving {file_name}: {e}")
+            return False
+
+    def append(self, file_name: str, record: Dict) -> bool:
+        """Append one record (rewrites the whole file under the collection lock)"""
+        return self.append_many(file_name, [record])
+
+    def append_many(self, file_name: str, records: List[Dict]) -> bool:
+        """Append a batch of records with a single rewrite"""
+        file_path = self.path(file_name)
+
+        try:
+            with collection_lock(file_path):
+                data = self.load(file_name)
+                data.extend(records)
+                self._write(file_path, data)
+            return True
+
+        except Exception as e:
+            logger.error(f"Error appending to {file_name}: {e}")
+            return False
+
+    def update(self, file_name: str, record_id, changes: Dict) -> bool:
+        """Apply changes to the record with the given id (rewrites the whole file under the collection lock)"""
+        file_path = self.path(file_name)
+
+        try:
+            with collection_lock(file_path):
+                data = self.load(file_name)
+                for position, record in enumerate(data):
+                    if record.get("id") == record_id:
+                        # Loaded records are shared through the cache, so replace rather than mutate
+                        data[position] = {**record, **changes}
+                        self._write(file_path, data)
+                        return True
+            return False
+
+        except Exception as e:
+            logger.error(f"Error updating {file_name}: {e}")
+            return False
+
+    def version(self, file_name: str) -> Optional[tuple]:
+        """Stamp of the file backing a collection; changes with every write"""
+        return file_stamp(self.path(file_name))
+
+    def snapshot(self, file_name: str) -> Tuple[List[Dict], Optional[tuple]]:
+        """Records plus a cursor marking the version they reflect"""
+        stamp = file_stamp(self.path(file_name))
+        return self.load(file_name), stamp
+
+    def tail(self, file_name: str, cursor: Optional[tuple]) -> Tuple[Optional[List[Dict]], Optional[tuple]]:
+        """Entries written since cursor: [] when unchanged, (None, None) when the caller must re-snapshot.
+
+        A whole-file JSON array has no cheap way to read just the new records,
+        so any change asks for a new snapshot.
+        """
+        stamp = file_stamp(self.path(file_name))
+        if cursor is not None and stamp == cursor:
+            return [], cursor
+        return None, None
+
+    def _write(self, file_path: str, data: List[Dict]):
+        """Write a collection; the caller holds the collection lock"""
+        payload = json.dumps(data, indent=4, ensure_ascii=False).encode("utf-8")
+        atomic_write(file_path, payload, backup=True)
+        metrics.add_bytes(os.path.basename(file_path), written=len(payload))
+        file_cache.invalidate(file_path)
+
+
+class JsonlStorage(JsonStorage):
+    """Append-only engine: every collection is a JSON Lines log.
+
+    Each line is an ``insert`` carrying a full record or an ``update`` carrying
+    the changed fields of one record. Inserts append a single line and fsync,
+    reads replay the log, and once enough updates pile up the log is compacted
+    into a fresh segment holding one insert per live record. A collection that
+    still only exists as a legacy ``.json`` array is imported on first access.
+    """
+
+    def __init__(self, data_dir: str, compact_threshold: int = config.JSONL_COMPACT_THRESHOLD):
+        super().__init__(data_dir)
+        self.compact_threshold = compact_threshold
+        self._pending_updates: Dict[str, int] = {}
+
+    def log_path(self, file_name: str) -> str:
+        """Path of the JSONL log backing a collection"""
+        base, _ = os.path.splitext(file_name)
+        return os.path.join(self.data_dir, base + ".jsonl")
+
+    def load(self, file_name: str) -> List[Dict]:
+        """Replay a collection's log into memory (cached until the log changes)"""
+        try:
+            self._ensure_log(file_name)
+            return list(file_cache.get(self.log_path(file_name), lambda path: self._read_log(file_name)))
+        except Exception as e:
+            logger.error(f"Error loading {file_name}: {e}")
+            return []
+
+    def save(self, file_name: str, data: List[Dict]) -> bool:
+        """Replace a collection with a new segment holding exactly these records"""
+        try:
+            with collection_lock(self.log_path(file_name)):
+                self._write_segment(file_name, data)
+            log_sampled(logger, f"Saved {len(data)} records to {file_name}")
+            return True
+        except Exception as e:
+            logger.error(f"Error saving {file_name}: {e}")
+            return False
+
+    def append(self, file_name: str, record: Dict) -> bool:
+        """Append one insert entry"""
+        return self.append_many(file_name, [record])
+
+    def append_many(self, file_name: str, records: List[Dict]) -> bool:
+        """Append a batch of insert entries with a single write and fsync"""
+        try:
+            self._ensure_log(file_name)
+            with collection_lock(self.log_path(file_name)):
+                self._append_entries(file_name, [{"op": "insert", "record": record} for record in records])
+            return True
+        except Exception as e:
+            logger.error(f"Error appending to {file_name}: {e}")
+            return False
+
+    def update(self, file_name: str, record_id, changes: Dict) -> bool:
+        """Append one update entry, compacting the log when updates pile up"""
+        try:
+            self._ensure_log(file_name)
+            with collection_lock(self.log_path(file_name)):
+                self._append_entries(file_name, [{"op": "update", "id": record_id, "changes": changes}])
+                pending = self._pending_updates.get(file_name, 0) + 1
+                self._pending_updates[file_name] = pending
+                if pending >= self.compact_threshold:
+                    self._write_segment(file_name, self._replay(file_name))
+            return True
+        except Exception as e:
+            logger.error(f"Error updating {file_name}: {e}")
+            return False
+
+    def compact(self, file_name: str) -> bool:
+        """Fold every update into a fresh segment"""
+        try:
+            self._ensure_log(file_name)
+            with collection_lock(self.log_path(file_name)):
+                self._write_segment(file_name, self._replay(file_name))
+            return True
+        except Exception as e:
+            logger.error(f"Error compacting {file_name}: {e}")
+            return False
+
+    def _ensure_log(self, file_name: str):
+        """Create the log, importing the legacy JSON array if there is one"""
+        if os.path.exists(self.log_path(file_name)):
+            return
+        with collection_lock(self.log_path(file_name)):
+            if os.path.exists(self.log_path(file_name)):
+                return
+            records = []
+            if os.path.exists(self.path(file_name)):
+                records = JsonStorage.load(self, file_name)
+                logger.info(f"Imported {len(records)} records from legacy {file_name}")
+            self._write_segment(file_name, records)
+
+    def _read_log(self, file_name: str) -> List[Dict]:
+        records = self._replay(file_name)
+        log_sampled(logger, f"Loaded {len(records)} records from {file_name}")
+        return records
+
+    def version(self, file_name: str) -> Optional[tuple]:
+        """Stamp of the collection's log; changes with every append or compaction"""
+        return file_stamp(self.log_path(file_name))
+
+    def snapshot(self, file_name: str) -> Tuple[List[Dict], Optional[tuple]]:
+        """Live records plus a cursor (inode, offset) marking the end of the log they reflect"""
+        self._ensure_log(file_name)
+        return self._replay_with_cursor(file_name)
+
+    def tail(self, file_name: str, cursor: Optional[tuple]) -> Tuple[Optional[List[Dict]], Optional[tuple]]:
+        """Log entries appended since cursor, reading only the new bytes.
+
+        Returns (None, None) when the log was replaced by a compaction or save
+        and the caller has to take a fresh snapshot.
+        """
+        if cursor is None:
+            return None, None
+        inode, offset = cursor
+        stamp = file_stamp(self.log_path(file_name))
+        if stamp is None or stamp[2] != inode or stamp[1] < offset:
+            return None, None
+        if stamp[1] == offset:
+            return [], cursor
+
+        with open(self.log_path(file_name), "rb") as f:
+            if os.fstat(f.fileno()).st_ino != inode:
+                return None, None
+            f.seek(offset)
+            chunk = f.read()
+        metrics.add_bytes(file_name, read=len(chunk))
+
+        # Leave an unfinished last line for the next call
+        end = chunk.rfind(b"\n") + 1
+        return list(self._parse_entries(chunk[:end], file_name)), (inode, offset + end)
+
+    def _replay(self, file_name: str) -> List[Dict]:
+        """Rebuild the live records from the log"""
+        records, _ = self._replay_with_cursor(file_name)
+        return records
+
+    def _replay_with_cursor(self, file_name: str) -> Tuple[List[Dict], tuple]:
+        records = []
+        positions = {}
+        updates = 0
+
+        with open(self.log_path(file_name), "rb") as f:
+            inode = os.fstat(f.fileno()).st_ino
+            chunk = f.read()
+        metrics.add_bytes(file_name, read=len(chunk))
+        end = chunk.rfind(b"\n") + 1
+        entries = list(self._parse_entries(chunk[:end], file_name))
+        if end < len(chunk):
+            # A last line without a newline counts if it is whole; a torn one
+            # stays behind the cursor and is skipped once an append ends it
+            try:
+                entries.append(json.loads(chunk[end:]))
+                end = len(chunk)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                logger.warning(f"Skipping unreadable last line in {file_name}")
+
+        for entry in entries:
+            if entry.get("op") == "insert":
+                record = entry["record"]
+                if "id" in record:
+                    positions.setdefault(record["id"], len(records))
+                records.append(record)
+            elif entry.get("op") == "update":
+                position = positions.get(entry["id"])
+                if position is not None:
+                    records[position].update(entry["changes"])
+                updates += 1
+
+        self._pending_updates[file_name] = updates
+        return records, (inode, end)
+
+    def _parse_entries(self, chunk: bytes, file_name: str):
+        """Decode complete log lines, skipping any that cannot be parsed"""
+        for line_no, line in enumerate(chunk.split(b"\n"), 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                # A crash mid-append leaves a torn line; everything around it is intact
+                logger.warning(f"Skipping unreadable line {line_no} in {file_name}")
+
+    def _append_entries(self, file_name: str, entries: List[Dict]):
+        """Append entries as lines and fsync; the caller holds the collection lock"""
+        payload = "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries).encode("utf-8")
+
+        with open(self.log_path(file_name), "a+b") as f:
+            # Never glue a new entry onto a torn last line
+            if f.seek(0, os.SEEK_END):
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    payload = b"\n" + payload
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        metrics.add_bytes(file_name, written=len(payload))
+        file_cache.invalidate(self.log_path(file_name))
+
+    def _write_segment(self, file_name: str, records: List[Dict]):
+        """Swap in a new segment holding records; the caller holds the collection lock"""
+        log_path = self.log_path(file_name)
+        payload = "".join(
+            json.dumps({"op": "insert", "record": record}, ensure_ascii=False) + "\n" for record in records
+        ).encode("utf-8")
+        atomic_write(log_path, payload, backup=True)
+        metrics.add_bytes(file_name, written=len(payload))
+        file_cache.invalidate(log_path)
+        self._pending_updates[file_name] = 0
+
+
+STORAGE_ENGINES = {
+    "json": JsonStorage,
+    "jsonl": JsonlStorage,
+}
+
+
+def create_storage(data_dir: str, engine: Optional[str] = None) -> JsonStorage:
+    """Create the configured storage engine"""
+    engine = engine or config.STORAGE_ENGINE
+    if engine == "sqlite":
+        from utils.sqlite_store import SqliteStorage
+        return SqliteStorage(data_dir)
+    if engine not in STORAGE_ENGINES:
+        logger.warning(f"Unknown storage engine '{engine}', falling back to jsonl")
+        engine = "jsonl"
+    return STORAGE_ENGINES[engine](data_dir)
@@ -0,0 +1,256 @@
+# utils/synthetic.py - Seeded synthetic data at a chosen scale, for benchmarks and load tests
+import json
+import os
+import random
+import logging
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterator, List, Optional
+
+from utils.chat_store import ChatStore
+from utils.storage import atomic_write, create_storage
+
+logger = logging.getLogger(__name__)
+
+# Department sizes are skewed the way a real org chart is
+DEPARTMENTS = {"Engineering": 0.30, "Ops": 0.20, "Marketing": 0.15, "Finance": 0.13, "Design": 0.12, "HR": 0.10}
+
+ROLES = {
+    "Employee": 0.55, "Senior": 0.20, "Manager": 0.15, "Director": 0.05, "Executive": 0.03,
+    "Vice President": 0.010, "President": 0.004, "Group President": 0.003, "CEO": 0.002, "Chairman": 0.001,
+}
+C_SUITE_ROLES = {"Chairman", "CEO", "President", "Vice President", "Group President"}
+
+# A few tags carry most posts, as with real hashtags (Zipf-like weights)
+TAGS = ["update", "campaign", "release", "hiring", "policy", "budget", "design", "incident",
+        "training", "benefits", "roadmap", "customer", "security", "offsite", "wellness", "q3"]
+TAG_WEIGHTS = [1 / rank for rank in range(1, len(TAGS) + 1)]
+
+TASK_STATUSES = {"Pending": 0.40, "In Progress": 0.30, "Completed": 0.25, "Not Started": 0.05}
+PRIORITIES = {"Medium": 0.5, "High": 0.3, "Low": 0.2}
+FEEDBACK_ROUTES = {"General": 0.35, "HR": 0.25, "Engineering": 0.15, "Leadership": 0.15, "Marketing": 0.10}
+
+FIRST_NAMES = ["Asha", "Ravi", "Meera", "Arjun", "Priya", "Karthik", "Divya", "Vikram", "Nisha", "Rahul",
+               "Sara", "John", "Li", "Omar", "Elena", "Mateo", "Yuki", "Fatima", "Noah", "Grace"]
+LAST_NAMES = ["Iyer", "Rao", "Shah", "Menon", "Patel", "Khan", "Smith", "Garcia", "Chen", "Kim",
+              "Nair", "Das", "Silva", "Okafor", "Novak", "Muller", "Sato", "Ali", "Brown", "Singh"]
+WORDS = ("team launch review plan customer metrics quarter sprint deploy budget hiring policy design "
+         "feedback release roadmap security training meeting report growth process support partner "
+         "update office project goal revenue incident data cloud mobile brand event wellness").split()
+
+# Records per collection for one unit of scale (scale = number of posts)
+RATIOS = {
+    "posts.json": 1.0,
+    "tasks.json": 0.5,
+    "feedback.json": 0.1,
+    "scheduled_meetings.json": 0.05,
+    "chat.json": 1.0,
+}
+
+# Generated timestamps span this many days before the reference date
+HISTORY_DAYS = 365
+
+
+def _pick(rng: random.Random, weights: Dict[str, float]) -> str:
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+def _sentence(rng: random.Random, low: int, high: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(low, high))).capitalize()
+
+
+class SyntheticData:
+    """Generates every collection for one scale from a single seed.
+
+    Each collection has its own random stream derived from the seed, so
+    the posts for a seed are the same whether or not the tasks were
+    generated first. Generators yield records one at a time; only the
+    employees are held in memory.
+    """
+
+    def __init__(self, scale: int, seed: int = 42, now: Optional[datetime] = None):
+        self.scale = scale
+        self.seed = seed
+        self.now = now or datetime(2025, 7, 1, 9, 0)
+        self.employees = self.generate_employees(max(50, scale // 100))
+        self.c_suite = [e for e in self.employees if e["role"] in C_SUITE_ROLES]
+
+    def count(self, file_name: str) -> int:
+        """Records generated for a collection at this scale"""
+        return max(1, int(self.scale * RATIOS[file_name]))
+
+    def _rng(self, name: str) -> random.Random:
+        return random.Random(f"{self.seed}:{self.scale}:{name}")
+
+    def _timestamp(self, i: int, total: int, rng: random.Random) -> datetime:
+        # Ids and timestamps rise together, with jitter, like real appends
+        offset = HISTORY_DAYS * 86400 * (1 - (i + rng.random()) / total)
+        return self.now - timedelta(seconds=offset)
+
+    def generate_employees(self, count: int) -> List[Dict]:
+        """Employees; the first is always an Engineering CEO (the benchmark's admin user)"""
+        rng = self._rng("employees")
+        employees, seen = [], {}
+        for i in range(count):
+            name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+            seen[name] = seen.get(name, 0) + 1
+            if seen[name] > 1:
+                name = f"{name} {seen[name]}"
+            employees.append({
+                "id": f"EMP{i + 1:06d}",
+                "name": name,
+                "department": "Engineering" if i == 0 else _pick(rng, DEPARTMENTS),
+                "role": "CEO" if i == 0 else _pick(rng, ROLES),
+            })
+        return employees
+
+    def posts(self) -> Iterator[Dict]:
+        rng = self._rng("posts")
+        total = self.count("posts.json")
+        for i in range(total):
+            is_vip = bool(self.c_suite) and rng.random() < 0.03
+            author = rng.choice(self.c_suite) if is_vip else rng.choice(self.employees)
+            department = "All" if rng.random() < 0.15 else author["department"]
+            is_anonymous = is_vip and rng.random() < 0.2
+            yield {
+                "id": i + 1,
+                "title": _sentence(rng, 3, 8),
+                "content": _sentence(rng, 10, 60),
+                "author": author["name"],
+                "display_author": "Anonymous Executive" if is_anonymous else author["name"],
+                "department": department,
+                "tags": sorted(set(rng.choices(TAGS, weights=TAG_WEIGHTS, k=rng.randint(0, 3)))),
+                "timestamp": self._timestamp(i, total, rng).isoformat(),
+                "privacy": "department" if department != "All" else "company",
+                "is_anonymous": is_anonymous,
+                "is_vip": is_vip,
+                "vip_recipients": [e["name"] for e in rng.sample(self.employees, rng.randint(1, 5))] if is_vip else [],
+                "likes": int(rng.paretovariate(1.5)) - 1,
+                "views": int(rng.paretovariate(1.2) * 10),
+            }
+
+    def tasks(self) -> Iterator[Dict]:
+        rng = self._rng("tasks")
+        total = self.count("tasks.json")
+        for i in range(total):
+            assignee = rng.choice(self.employees)
+            created = self._timestamp(i, total, rng)
+            yield {
+                "id": i + 1,
+                "title": _sentence(rng, 3, 7),
+                "description": _sentence(rng, 8, 30),
+                "assigned_to": assignee["name"],
+                "employee_id": assignee["id"],
+                "assigned_by": rng.choice(self.employees)["name"],
+                "department": assignee["department"],
+                "status": _pick(rng, TASK_STATUSES),
+                "priority": _pick(rng, PRIORITIES),
+                "deadline": (created + timedelta(days=rng.randint(1, 60))).strftime("%Y-%m-%d"),
+                "created_at": created.isoformat(),
+                "updated_at": created.isoformat(),
+                "comments": [],
+            }
+
+    def feedback(self) -> Iterator[Dict]:
+        rng = self._rng("feedback")
+        total = self.count("feedback.json")
+        for i in range(total):
+            yield {
+                "id": i + 1,
+                "content": _sentence(rng, 8, 40),
+                "route_to": _pick(rng, FEEDBACK_ROUTES),
+                "status": "unread" if rng.random() < 0.6 else "read",
+                "timestamp": self._timestamp(i, total, rng).isoformat(),
+                "priority": "normal",
+            }
+
+    def meetings(self) -> Iterator[Dict]:
+        # The Collaboration and Schedule Meeting pages read different fields from
+        # the same file, so every meeting carries both sets
+        rng = self._rng("meetings")
+        total = self.count("scheduled_meetings.json")
+        for i in range(total):
+            host = rng.choice(self.employees)
+            when = self._timestamp(i, total, rng) + timedelta(days=rng.randint(0, 30))
+            title = _sentence(rng, 2, 6)
+            agenda = _sentence(rng, 5, 20)
+            link = f"https://meet.jit.si/{host['department']}_{host['name'].replace(' ', '')}"
+            yield {
+                "id": i + 1,
+                "title": title,
+                "topic": title,
+                "organizer": host["name"],
+                "host": host["name"],
+                "department": host["department"],
+                "participants": [e["name"] for e in rng.sample(self.employees, rng.randint(2, 8))],
+                "time": when.strftime("%Y-%m-%d %H:%M"),
+                "datetime": when.strftime("%Y-%m-%d %H:%M:%S"),
+                "description": agenda,
+                "agenda": agenda,
+                "link": link,
+                "status": "scheduled",
+                "created_at": when.isoformat(),
+            }
+
+    def chat(self) -> Iterator[Dict]:
+        rng = self._rng("chat")
+        total = self.count("chat.json")
+        for i in range(total):
+            sender = rng.choice(self.employees)
+            yield {
+                "id": i + 1,
+                "room": sender["department"],
+                "sender": sender["name"],
+                "message": _sentence(rng, 2, 25),
+                "timestamp": self._timestamp(i, total, rng).strftime("%Y-%m-%d %H:%M"),
+                "attachment": None,
+                "replies": [
+                    {"sender": rng.choice(self.employees)["name"], "message": _sentence(rng, 1, 10)}
+                    for _ in range(rng.choices([0, 1, 2], weights=[0.8, 0.15, 0.05])[0])
+                ],
+            }
+
+    def collections(self) -> Dict[str, Callable[[], Iterator[Dict]]]:
+        """Generator for each data collection, by file name"""
+        return {
+            "posts.json": self.posts,
+            "tasks.json": self.tasks,
+            "feedback.json": self.feedback,
+            "scheduled_meetings.json": self.meetings,
+            "chat.json": self.chat,
+        }
+
+
+def write_dataset(data_dir: str, scale: int, seed: int = 42, engine: Optional[str] = None) -> Dict[str, int]:
+    """Generate every collection into data_dir through a storage engine; returns record counts.
+
+    employees.json is written as a plain JSON array, as the app reads it
+    directly rather than through DataManager. Chat goes into per-room
+    segments, as utils.chat_store keeps it.
+    """
+    os.makedirs(data_dir, exist_ok=True)
+    data = SyntheticData(scale, seed)
+    storage = create_storage(data_dir, engine)
+
+    atomic_write(os.path.join(data_dir, "employees.json"),
+                 json.dumps(data.employees, indent=4).encode("utf-8"), durable=False)
+    counts = {"employees.json": len(data.employees)}
+
+    for file_name, generate in data.collections().items():
+        records = list(generate())
+        if file_name == "chat.json":
+            ChatStore(data_dir).import_messages(records)
+        elif not storage.save(file_name, records):
+            raise IOError(f"Could not write {file_name} to {data_dir}")
+        counts[file_name] = len(records)
+        logger.info(f"Generated {len(records)} records for {file_name}")
+    return counts
+
+
+if __name__ == "__main__":
+    # python -m utils.synthetic <data dir> <scale> [seed]
+    import sys
+
+    logging.basicConfig(level=logging.INFO)
+    if len(sys.argv) < 3:
+        sys.exit("usage: python -m utils.synthetic <data dir> <scale> [seed]")
+    print(write_dataset(sys.argv[1], int(sys.argv[2]), int(sys.argv[3]) if len(sys.argv) > 3 else 42))
@@ -0,0 +1,170 @@
+# utils/theme.py - Bundled, minified stylesheet with self-hosted fonts, injected once per session
+import base64
+import glob
+import hashlib
+import json
+import os
+import re
+import logging
+import threading
+from typing import List, Optional, Tuple
+
+from utils.cache import file_stamp
+from utils.storage import atomic_write
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Theme sources and font files; bundled in memory, nothing is served from here
+STATIC_DIR = os.path.join(PROJECT_ROOT, "static")
+
+# Stylesheets merged into the bundle, in cascade order
+CSS_SOURCES = ["css/app.css", "css/login.css", "css/dashboard.css"]
+
+# Self-hosted font files, static/fonts/<family>-<weight>.woff2 (latin subset)
+FONT_FAMILIES = {"Inter": "inter", "Poppins": "poppins"}
+FONT_WEIGHTS = [300, 400, 500, 600, 700]
+FONT_SOURCE_URL = "https://cdn.jsdelivr.net/fontsource/fonts/{slug}@latest/latin-{weight}-normal.woff2"
+
+
+def font_file(family: str, weight: int) -> str:
+    """Path of a font file relative to static/"""
+    return f"fonts/{FONT_FAMILIES[family]}-{weight}.woff2"
+
+
+def font_faces(static_dir: str = STATIC_DIR) -> str:
+    """@font-face rules embedding the font files present under static/fonts.
+
+    The fonts go in as data URIs, so the browser never requests them from
+    a server that may send the wrong content type. Missing files are left
+    out, and the font stacks fall back to system fonts.
+    """
+    rules = []
+    for family in FONT_FAMILIES:
+        for weight in FONT_WEIGHTS:
+            path = os.path.join(static_dir, font_file(family, weight))
+            if not os.path.exists(path):
+                continue
+            with open(path, "rb") as f:
+                data = base64.b64encode(f.read()).decode("ascii")
+            rules.append(
+                f"@font-face{{font-family:'{family}';font-style:normal;font-weight:{weight};"
+                f"font-display:swap;src:url(data:font/woff2;base64,{data}) format('woff2')}}"
+            )
+    return "".join(rules)
+
+
+def minify_css(css: str) -> str:
+    """Strip comments and whitespace that the browser does not need"""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    # Only declaration colons lose their spaces; in a selector "a :hover" differs from "a:hover"
+    css = re.sub(r"(\{|;)\s*([-\w]+)\s*:\s*", r"\1\2:", css)
+    return css.replace(";}", "}").strip()
+
+
+class ThemeBundle:
+    """The CSS sources plus the font rules, merged and minified into one stylesheet.
+
+    The bundle is held in memory with a hash of its content and rebuilt
+    only when a source file or font file changes. A session compares the
+    hash with the one it injected to tell whether the page is current.
+    """
+
+    def __init__(self, static_dir: str = STATIC_DIR):
+        self.static_dir = static_dir
+        self._built: Optional[Tuple[tuple, str, str]] = None
+        self._lock = threading.Lock()
+
+    def css(self) -> Tuple[str, str]:
+        """(content hash, minified stylesheet) for the current sources"""
+        stamps = self._stamps()
+        built = self._built
+        if built is not None and built[0] == stamps:
+            return built[1], built[2]
+
+        with self._lock:
+            if self._built is None or self._built[0] != stamps:
+                self._built = (stamps, *self._build())
+            return self._built[1], self._built[2]
+
+    def _stamps(self) -> tuple:
+        paths = [os.path.join(self.static_dir, source) for source in CSS_SOURCES]
+        paths += sorted(glob.glob(os.path.join(self.static_dir, "fonts", "*.woff2")))
+        return tuple((path, file_stamp(path)) for path in paths)
+
+    def _build(self) -> Tuple[str, str]:
+        parts = [font_faces(self.static_dir)]
+        for source in CSS_SOURCES:
+            with open(os.path.join(self.static_dir, source), "r", encoding="utf-8") as f:
+                parts.append(f.read())
+        css = minify_css("\n".join(parts))
+        digest = hashlib.sha256(css.encode("utf-8")).hexdigest()[:12]
+        logger.info(f"Built theme {digest} ({len(css)} bytes)")
+        return digest, css
+
+
+# Shared by every session in the process
+theme_bundle = ThemeBundle()
+
+
+def inject_theme():
+    """Add the theme bundle to the page once per browser session.
+
+    The first run of a session renders a zero-height component that puts
+    the stylesheet in a <style> element in the page head; the element
+    outlives the component, so later reruns send nothing at all. The CSS
+    travels inline rather than as a linked file, so it does not depend on
+    the content type Streamlit's static file handler sends.
+    """
+    import streamlit as st
+    import streamlit.components.v1 as components
+
+    digest, css = theme_bundle.css()
+    if st.session_state.get("_theme_digest") == digest:
+        return
+
+    # "</" is escaped so the stylesheet cannot close the script element
+    payload = json.dumps(css).replace("</", "<\\/")
+    components.html(
+        f"""<script>
+        const doc = window.parent.document;
+        let style = doc.getElementById("superapp-theme");
+        if (!style) {{
+            style = doc.createElement("style");
+            style.id = "superapp-theme";
+            doc.head.appendChild(style);
+        }}
+        style.textContent = {payload};
+        </script>""",
+        height=0,
+    )
+    st.session_state["_theme_digest"] = digest
+
+
+def fetch_fonts(overwrite: bool = False) -> List[str]:
+    """Download the font files into static/fonts (run once when setting up a deployment)"""
+    from urllib.request import urlopen
+
+    fetched = []
+    os.makedirs(os.path.join(STATIC_DIR, "fonts"), exist_ok=True)
+    for family, slug in FONT_FAMILIES.items():
+        for weight in FONT_WEIGHTS:
+            path = os.path.join(STATIC_DIR, font_file(family, weight))
+            if os.path.exists(path) and not overwrite:
+                continue
+            with urlopen(FONT_SOURCE_URL.format(slug=slug, weight=weight), timeout=30) as response:
+                atomic_write(path, response.read())
+            fetched.append(path)
+            logger.info(f"Fetched {family} {weight} to {path}")
+    return fetched
+
+
+if __name__ == "__main__":
+    # python -m utils.theme  -> fetch fonts and build the bundle
+    logging.basicConfig(level=logging.INFO)
+    fetch_fonts()
+    digest, css = theme_bundle.css()
+    print(f"theme {digest}: {len(css)} bytes")
@@ -0,0 +1,158 @@
+# utils/thumbnails.py - Background thumbnails and previews for image attachments
+import io
+import os
+import threading
+import time
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
+from typing import Dict, Optional, Set
+
+from utils import config
+from utils.metrics import metrics
+from utils.storage import atomic_write
+
+# Pillow is optional; without it attachments are shown as download buttons only
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+# Longest edge in pixels of each rendition
+SIZES = {"thumb": 320, "preview": 1280}
+
+# Attachments that get renditions
+IMAGE_TYPES = {"image/jpeg", "image/png"}
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png")
+
+
+def is_image(attachment: Dict) -> bool:
+    """Whether an attachment is a jpg or png the pipeline renders"""
+    return (attachment.get("content_type") in IMAGE_TYPES
+            or attachment.get("name", "").lower().endswith(IMAGE_EXTENSIONS))
+
+
+class ThumbnailPipeline:
+    """Downscaled, recompressed renditions of image attachments, cached on disk by content hash.
+
+    ``submit`` queues an attachment on a small worker pool right after
+    upload; each worker decodes the original once and writes every size in
+    ``SIZES`` to ``previews/<ab>/<sha256>-<size>.<format>``. Renditions are
+    named by content, so an image shared in many rooms is rendered once, and
+    a rendition on disk never goes stale. The page only ever sends these
+    files to the browser, never the original. A caller can pass a change
+    topic that is published once the image is done (or has failed), so the
+    page showing it reruns instead of waiting for it.
+    """
+
+    def __init__(self, attachments, workers: int = config.THUMBNAIL_WORKERS,
+                 image_format: str = config.THUMBNAIL_FORMAT, quality: int = config.THUMBNAIL_QUALITY,
+                 changes=None):
+        self.attachments = attachments
+        self.changes = changes
+        self.root = os.path.join(attachments.root, "previews")
+        self.format = "WEBP" if image_format.lower() == "webp" else "JPEG"
+        self.quality = quality
+        self.workers = workers
+        self._pool = None
+        self._pending: Dict[str, Future] = {}
+        # Images that could not be decoded; not retried until the process restarts
+        self._failed: Set[str] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def available(self) -> bool:
+        return Image is not None
+
+    def path(self, sha256: str, size: str) -> str:
+        """Where a rendition of an attachment is cached"""
+        extension = "webp" if self.format == "WEBP" else "jpg"
+        return os.path.join(self.root, sha256[:2], f"{sha256}-{size}.{extension}")
+
+    def failed(self, attachment: Dict) -> bool:
+        """Whether an image attachment will get no renditions (undecodable, or Pillow missing)"""
+        return not self.available or attachment["sha256"] in self._failed
+
+    def rendition(self, attachment: Dict, size: str, wait: float = 0,
+                  topic: Optional[str] = None) -> Optional[str]:
+        """Path of a rendition, or None if it is not ready.
+
+        A missing rendition is queued (again, e.g. after a restart) and
+        waited for up to `wait` seconds.
+        """
+        if not self.available or not is_image(attachment):
+            return None
+        path = self.path(attachment["sha256"], size)
+        if os.path.exists(path):
+            return path
+        future = self.submit(attachment, topic)
+        if future is None or not wait:
+            return None
+        try:
+            future.result(timeout=wait)
+        except TimeoutError:
+            return None
+        return path if os.path.exists(path) else None
+
+    def submit(self, attachment: Dict, topic: Optional[str] = None) -> Optional[Future]:
+        """Queue every rendition of an image attachment (other attachments are ignored), publishing topic when done"""
+        if not self.available or not is_image(attachment):
+            return None
+        sha256 = attachment["sha256"]
+        with self._lock:
+            if sha256 in self._failed:
+                return None
+            future = self._pending.get(sha256)
+            if future is None:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="thumbnails")
+                future = self._pool.submit(self._render, sha256)
+                self._pending[sha256] = future
+                future.add_done_callback(lambda done: self._done(sha256, done))
+        if topic and self.changes is not None:
+            future.add_done_callback(lambda done: self.changes.publish(topic))
+        return future
+
+    def _done(self, sha256: str, future: Future):
+        with self._lock:
+            self._pending.pop(sha256, None)
+            if not future.result():
+                self._failed.add(sha256)
+
+    def _render(self, sha256: str) -> bool:
+        """Write every missing rendition of one image"""
+        missing = {size: edge for size, edge in SIZES.items() if not os.path.exists(self.path(sha256, size))}
+        if not missing:
+            return True
+
+        start = time.perf_counter()
+        error = False
+        try:
+            with Image.open(self.attachments.object_path(sha256)) as original:
+                # JPEGs can be decoded straight at a reduced scale
+                original.draft("RGB", (max(missing.values()),) * 2)
+                image = ImageOps.exif_transpose(original)
+                # WebP keeps transparency; JPEG has none
+                has_alpha = "A" in image.getbands() or "transparency" in image.info
+                mode = "RGBA" if has_alpha and self.format == "WEBP" else "RGB"
+                if image.mode != mode:
+                    image = image.convert(mode)
+
+                # Largest first, so each smaller size is resampled from the one before
+                for size, edge in sorted(missing.items(), key=lambda item: item[1], reverse=True):
+                    image.thumbnail((edge, edge), Image.LANCZOS)
+                    buffer = io.BytesIO()
+                    image.save(buffer, self.format, quality=self.quality, optimize=True)
+                    os.makedirs(os.path.dirname(self.path(sha256, size)), exist_ok=True)
+                    atomic_write(self.path(sha256, size), buffer.getvalue(), durable=False)
+            return True
+
+        except Exception as e:
+            # Corrupt or oversized images simply get no preview
+            error = True
+            logger.warning(f"Could not render previews of attachment {sha256[:12]}: {e}")
+            return False
+
+        finally:
+            metrics.observe("render_thumbnails", "attachments", time.perf_counter() - start, len(missing), error)